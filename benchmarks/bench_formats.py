@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+🖼️ Benchmark: frame formats of neko_render.writer
+Renders the 10 TV-short scenes (and the MCP deck with --deck) once, then
+writes the same frames in every format: encode throughput on the calling
+thread, wall time through the background writer pool, and disk usage.
+Usage: python3 benchmarks/bench_formats.py [--deck] [--threads 2] [--out DIR]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_tv_short_frames as tv  # noqa: E402
+from neko_render import parallel, writer  # noqa: E402
+
+CONFIGS = [
+    ("png -6", {'fmt': 'png'}),
+    ("png -1", {'fmt': 'png', 'compress_level': 1}),
+    ("png -0", {'fmt': 'png', 'compress_level': 0}),
+    ("png opt", {'fmt': 'png', 'optimize': True}),
+    ("qoi", {'fmt': 'qoi'}),
+    ("ppm", {'fmt': 'ppm'}),
+    ("raw", {'fmt': 'raw'}),
+]
+
+
+def render_frames(deck):
+    frames = []
+    for i, (name, _) in enumerate(tv.FRAMES):
+        img, _ = tv.render_scene(i, parallel.frame_seed(0, i))
+        frames.append((name, img.convert('RGB')))
+    if deck:
+        import generate_mcp_frames as mcp
+        for num, frame in enumerate(mcp.load_spec(mcp.DEFAULT_SPEC)["frames"], start=1):
+            frames.append((f"deck_{num:03d}", mcp.render_frame(num, frame["title"],
+                                                               frame.get("content_lines", []),
+                                                               frame.get("code_block"))))
+    return frames
+
+
+def write_all(frames, out_dir, threads, **options):
+    """Write every frame; returns (wall seconds, the writer)"""
+    os.makedirs(out_dir, exist_ok=True)
+    out = writer.FrameWriter(threads=threads, **options)
+    start = time.perf_counter()
+    for name, img in frames:
+        out.save(img, os.path.join(out_dir, f"frame_{name}{out.ext}"), name)
+    out.close()
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deck", action="store_true", help="also write the 16 MCP deck frames")
+    parser.add_argument("--threads", type=int, default=writer.DEFAULT_THREADS,
+                        help="writer threads for the pooled run")
+    parser.add_argument("--out", help="scratch directory (default: temp dir)")
+    args = parser.parse_args()
+    out = args.out or tempfile.mkdtemp(prefix="neko-formats-")
+
+    frames = render_frames(args.deck)
+    pixels = sum(img.width * img.height for _, img in frames)
+    print(f"🐾 Format benchmark: {len(frames)} frames, {pixels / 1e6:.1f} Mpx, "
+          f"{args.threads} writer thread(s), {os.cpu_count()} CPU(s)")
+    print(f"   {'format':<8} {'encode':>12} {'pooled':>12} {'on disk':>10} {'per frame':>10}")
+    try:
+        for label, options in CONFIGS:
+            sync, _ = write_all(frames, os.path.join(out, label.replace(" ", "")), 0, **options)
+            pooled, used = write_all(frames, os.path.join(out, label.replace(" ", "")),
+                                     args.threads, **options)
+            print(f"   {label:<8} {len(frames) / sync:>8.1f} f/s {len(frames) / pooled:>8.1f} f/s "
+                  f"{used.bytes_written / 2**20:>7.1f} MB {used.bytes_written / len(frames) / 2**10:>7.0f} KB")
+    finally:
+        if not args.out:
+            shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+💍 Benchmark: worker -> writer frame handoff, pickled images vs shared-memory ring
+Workers render timeline frames in chunks; the parent pipes each frame's
+raw bytes to a stand-in encoder (/dev/null). The pickle route returns
+the Images from the pool; the ring route renders into FrameRing slots and
+pipes them uncopied. Reports end-to-end frames/s and the bytes that cross
+the pool's result pipe and get copied in the parent per frame.
+--synthetic replaces the scenes with a flat fill, isolating the transport.
+Usage: python3 benchmarks/bench_framering.py [-j 2] [--seconds 1] [--resolution native] [--synthetic]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_tv_short_frames as tv  # noqa: E402
+from neko_render import framering, parallel, timeline  # noqa: E402
+from neko_render import layout as layouts  # noqa: E402
+
+
+def render_into(targets, index, start, fps, layout, synthetic):
+    if synthetic:
+        for k, target in enumerate(targets, start):
+            target.paste((k % 256, index * 20, 128, 255), (0, 0) + target.size)
+        return [0.0] * len(targets)
+    return timeline.render_chunk(tv.ANIMATED_SCENES[index], index, start, targets, fps, layout=layout)
+
+
+def pickled_chunk(count, index, start, fps, layout, synthetic):
+    """Pool task of the pickle route: the frames themselves come back"""
+    frames = [Image.new('RGBA', layout.size) for _ in range(count)]
+    render_into(frames, index, start, fps, layout, synthetic)
+    return frames
+
+
+def ring_chunk(ring, slots, index, start, fps, layout, synthetic):
+    """Pool task of the ring route: only the render times come back"""
+    targets = [framering.slot_image(ring, slot) for slot in slots]
+    return render_into(targets, index, start, fps, layout, synthetic)
+
+
+def chunks(args, per_scene):
+    return [(i, k, min(args.chunk, per_scene - k)) for i in range(len(tv.ANIMATED_SCENES))
+            for k in range(0, per_scene, args.chunk)]
+
+
+def run_pickle(args, layout, work, out):
+    tasks = [(count, i, k, args.fps, layout, args.synthetic) for i, k, count in work]
+    frames = piped = pickled = 0
+    start = time.perf_counter()
+    for result in parallel.iter_ordered(pickled_chunk, tasks, args.jobs):
+        if result.error:
+            raise RuntimeError(result.error)
+        if not pickled:
+            pickled = len(pickle.dumps(result.value, pickle.HIGHEST_PROTOCOL)) // len(result.value)
+        for img in result.value:
+            data = img.tobytes()
+            out.write(data)
+            piped += len(data)
+            frames += 1
+    return frames, time.perf_counter() - start, pickled, piped // frames
+
+
+def run_ring(args, layout, work, out):
+    tasks = [(count, (i, k, args.fps, layout, args.synthetic)) for i, k, count in work]
+    frames = pickled = 0
+    start = time.perf_counter()
+    with framering.FrameRing(layout.size, args.chunk * (args.jobs + 1)) as ring:
+        for result, slots in framering.iter_ring(ring_chunk, tasks, ring, args.jobs):
+            if result.error:
+                raise RuntimeError(result.error)
+            if not pickled:
+                pickled = len(pickle.dumps(result.value, pickle.HIGHEST_PROTOCOL)) // len(slots)
+            for slot in slots:
+                out.write(ring.view(slot))
+                frames += 1
+    # Pixels are written once, into the slot, inside the worker
+    return frames, time.perf_counter() - start, pickled, 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", "-j", type=int, default=2)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=1.0, help="timeline seconds per scene")
+    parser.add_argument("--chunk", type=int, default=tv.RING_CHUNK, help="frames per worker task")
+    parser.add_argument("--resolution", default="native", help="e.g. 360p, 720p, 4k")
+    parser.add_argument("--synthetic", action="store_true", help="flat-fill frames instead of the scenes")
+    args = parser.parse_args()
+    layout = layouts.Layout.parse(tv.DESIGN.design, args.resolution)
+    per_scene = timeline.frame_count(args.seconds, args.fps)
+    work = chunks(args, per_scene)
+    frame_mb = framering.frame_bytes(layout.size) / (1024 * 1024)
+
+    print(f"🐾 Frame handoff: {per_scene * len(tv.ANIMATED_SCENES)} frames at {layout.name} "
+          f"({frame_mb:.1f} MB RGBA), {args.jobs} worker(s), {args.chunk} frames per task"
+          f"{', synthetic' if args.synthetic else ''}")
+    print(f"   {'route':<8} {'frames/s':>9} {'pickled/frame':>14} {'copied in parent':>17}")
+    with open(os.devnull, "wb") as out:
+        for name, run in (("pickle", run_pickle), ("ring", run_ring)):
+            frames, elapsed, pickled, copied = run(args, layout, work, out)
+            print(f"   {name:<8} {frames / elapsed:>9.1f} {pickled:>14,} {copied:>17,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+🔤 Benchmark: 9-pass draw_text_with_outline vs cached mask renderer
+Also checks the outputs match within TOLERANCE per channel.
+Usage: python3 benchmarks/bench_outline_text.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neko_render import fonts  # noqa: E402
+
+WIDTH = 1080
+HEIGHT = 1920
+TOLERANCE = 2
+
+# The glow loop from generate_frame_10_cta plus a few regular labels
+CALLS = [((540 - 300 - offset//2, 300 - offset//2), "INSTALL", (255, 255, 0, int(255 * offset/20)), None, 120 + offset)
+         for offset in range(20, 0, -5)] + [
+    ((240, 300), "INSTALL", '#FF0000', 'white', 120),
+    ((390, 500), "NOW!", '#FF0000', 'white', 120),
+    ((140, 1620), "LIKE & SUBSCRIBE!", '#FF0000', 'white', 70),
+]
+
+
+def legacy_draw_text_with_outline(draw, pos, text, fill='white', outline='black', font_size=60):
+    """Original implementation: font load + 9 text draws per call"""
+    try:
+        font = ImageFont.truetype(fonts.DEJAVU_BOLD, font_size)
+    except OSError:
+        font = ImageFont.load_default()
+    x, y = pos
+    for adj_x in [-3, 0, 3]:
+        for adj_y in [-3, 0, 3]:
+            if adj_x != 0 or adj_y != 0:
+                draw.text((x + adj_x, y + adj_y), text, font=font, fill=outline)
+    draw.text((x, y), text, font=font, fill=fill)
+
+
+def render(func):
+    img = Image.new('RGBA', (WIDTH, HEIGHT), '#FF1493')
+    draw = ImageDraw.Draw(img)
+    start = time.perf_counter()
+    for args in CALLS:
+        func(draw, *args)
+    return img, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    legacy_times, cached_times = [], []
+    for _ in range(args.repeat):
+        legacy_img, elapsed = render(legacy_draw_text_with_outline)
+        legacy_times.append(elapsed)
+        cached_img, elapsed = render(fonts.draw_text_with_outline)
+        cached_times.append(elapsed)
+
+    diff = np.abs(np.asarray(legacy_img, dtype=np.int16) - np.asarray(cached_img, dtype=np.int16))
+    legacy, cached = statistics.median(legacy_times), statistics.median(cached_times)
+    print(f"🐾 Outlined text: {len(CALLS)} calls, median of {args.repeat}")
+    print(f"   legacy: {legacy * 1000:.1f} ms   cached: {cached * 1000:.1f} ms   speedup: {legacy / cached:.1f}x")
+    print(f"   max channel diff: {diff.max()} (tolerance {TOLERANCE})")
+    if diff.max() > TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+🎬 Benchmark: PNG sink (+ concat encode) vs streaming ffmpeg sink
+Renders the 10 TV-short scenes once, then times each sink on the same
+frames and reports wall time and bytes written to disk.
+Usage: python3 benchmarks/bench_sinks.py [--out DIR]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_tv_short_frames as tv  # noqa: E402
+from neko_render import parallel, sinks  # noqa: E402
+
+
+def run_sink(sink, frames):
+    start = time.perf_counter()
+    for name, img in frames:
+        sink.write(name, img)
+    summary = sink.close()
+    return summary, time.perf_counter() - start
+
+
+def encode_concat(out_dir, fps):
+    """What the PNG route still owes: decode every PNG again and encode"""
+    video = os.path.join(out_dir, "concat.mp4")
+    start = time.perf_counter()
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                    "-i", os.path.join(out_dir, "frames.ffconcat"), "-vf", f"fps={fps}",
+                    "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", video],
+                   check=True)
+    return os.path.getsize(video), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", help="scratch directory (default: temp dir)")
+    args = parser.parse_args()
+    out = args.out or tempfile.mkdtemp(prefix="neko-sinks-")
+
+    frames = []
+    for i, (name, _) in enumerate(tv.FRAMES):
+        img, _ = tv.render_scene(i, parallel.frame_seed(0, i))
+        frames.append((name, img))
+    durations = [tv.FRAME_DURATION] * len(frames)
+    size = (tv.WIDTH, tv.HEIGHT)
+
+    print(f"🐾 Sink benchmark: {len(frames)} frames, {size[0]}x{size[1]}, {sum(durations)}s video")
+    png_dir = os.path.join(out, "png")
+    summary, elapsed = run_sink(sinks.PngSink(png_dir, durations), frames)
+    print(f"   png     write {elapsed:6.2f}s  {summary['bytes_written']:>12,} bytes on disk")
+
+    if not shutil.which("ffmpeg"):
+        print("   ffmpeg  skipped (ffmpeg not on PATH)")
+        return
+
+    video_bytes, encode_time = encode_concat(png_dir, tv.VIDEO_FPS)
+    print(f"   png+enc total {elapsed + encode_time:6.2f}s  "
+          f"{summary['bytes_written'] + video_bytes:>12,} bytes on disk (PNGs + mp4)")
+
+    sink = sinks.FfmpegSink(os.path.join(out, "stream.mp4"), size, durations, tv.VIDEO_FPS)
+    summary, elapsed = run_sink(sink, frames)
+    print(f"   ffmpeg  total {elapsed:6.2f}s  {summary['bytes_written']:>12,} bytes on disk "
+          f"({summary['bytes_piped']:,} bytes piped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+📊 Benchmark suite: per-scene and per-effect timing for both generators
+Times every TV-short scene, the shared effects (static, gradient, outlined
+text, scan lines, glitch, PNG save), create_frame for every MCP deck
+frame and the deck's text layout (warm and cold) over repeated seeded runs. Reports median/p95 wall time, peak RSS
+and Python-side allocation peak per call as JSON, so runs from different
+commits can be compared (--compare).
+
+Each case runs in a fresh process by default so peak RSS is its own.
+
+Usage: python3 benchmarks/bench_suite.py [--filter tv.effect] [--repeats 10]
+                                         [--json out.json] [--compare old.json]
+   or: pytest benchmarks/bench_suite.py --benchmark-json out.json  (pytest-benchmark)
+"""
+
+import argparse
+import atexit
+import contextlib
+import fnmatch
+import importlib.util
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The pytest cases need the pytest-benchmark plugin (which brings pytest)
+if importlib.util.find_spec("pytest_benchmark"):
+    import pytest
+else:
+    pytest = None
+
+SEED = 0
+DEFAULT_REPEATS = 10
+# Median changes smaller than this are timer noise in --compare
+MIN_DELTA_MS = 0.5
+
+
+def _scratch():
+    path = tempfile.mkdtemp(prefix="neko-bench-")
+    atexit.register(shutil.rmtree, path, True)
+    return path
+
+
+# Each case factory returns (setup, call): setup() -> (args, kwargs) builds
+# fresh inputs outside the timed region (pytest-benchmark's pedantic API).
+
+def _no_setup():
+    return (), {}
+
+
+def tv_scene(index):
+    def factory():
+        import generate_tv_short_frames as tv
+        from neko_render import parallel, seeding
+        name, func = tv.FRAMES[index]
+        seed = parallel.frame_seed(SEED, index)
+
+        def call():
+            return func(seeding.FrameRandom(seed))
+        return _no_setup, call
+    return factory
+
+
+def tv_static():
+    import generate_tv_short_frames as tv
+    from PIL import Image
+    black = Image.new('RGBA', (tv.WIDTH, tv.HEIGHT), 'black')
+    return (lambda: ((black.copy(), 0.5), {'rng': SEED})), tv.add_tv_static
+
+
+def tv_gradient(cold):
+    def factory():
+        import generate_tv_short_frames as tv
+        from neko_render import layers
+
+        def setup():
+            if cold:
+                layers.LAYER_CACHE.clear()
+            return (tv.COLORS['neko_purple'], tv.COLORS['mario_gold']), {}
+        return setup, lambda color1, color2: tv.create_gradient_bg(color1, color2, tv.DESIGN)
+    return factory
+
+
+def tv_outline_text(cold):
+    def factory():
+        import generate_tv_short_frames as tv
+        from PIL import ImageDraw
+        from neko_render import fonts, shaping
+        bg = tv.create_gradient_bg(tv.COLORS['hot_pink'], tv.COLORS['electric_blue'])
+
+        def setup():
+            if cold:
+                fonts.get_font.cache_clear()
+                fonts.text_mask.cache_clear()
+                fonts.outline_mask.cache_clear()
+                shaping.shaped_run.cache_clear()
+            draw = ImageDraw.Draw(bg.copy())
+            return (draw, (tv.WIDTH//2 - 400, tv.HEIGHT - 300), "LIKE & SUBSCRIBE!",
+                    tv.COLORS['emergency_red'], 'white', 70), {}
+        return setup, tv.draw_text_with_outline
+    return factory
+
+
+def tv_scan_lines():
+    import generate_tv_short_frames as tv
+    from neko_render import layers
+    bg = tv.create_gradient_bg(tv.COLORS['hot_pink'], tv.COLORS['electric_blue'])
+    return (lambda: ((bg.copy(), tv.scan_lines()), {})), layers.blend
+
+
+def tv_glitch():
+    import generate_tv_short_frames as tv
+    frame = tv.generate_frame_10_cta(SEED)
+    return (lambda: ((frame.copy(), 10), {'rng': SEED})), tv.add_vhs_glitch
+
+
+def tv_png_save():
+    import generate_tv_short_frames as tv
+    frame = tv.generate_frame_10_cta(SEED)
+    path = os.path.join(_scratch(), "frame.png")
+    return _no_setup, lambda: frame.save(path)
+
+
+def mcp_create_frame(frame_num):
+    def factory():
+        import generate_mcp_frames as mcp
+        frame = mcp.load_spec(mcp.DEFAULT_SPEC)["frames"][frame_num - 1]
+        out_dir = _scratch()
+
+        def call():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return mcp.create_frame(frame_num, frame["title"], frame.get("content_lines", []),
+                                        frame.get("code_block"), out_dir=out_dir)
+        return _no_setup, call
+    return factory
+
+
+def mcp_layout_deck(cold):
+    def factory():
+        import generate_mcp_frames as mcp
+        from neko_render import textlayout
+        frames = mcp.load_spec(mcp.DEFAULT_SPEC)["frames"]
+
+        def setup():
+            if cold:
+                for cached in (textlayout.measure, textlayout.wrap, textlayout.fit):
+                    cached.cache_clear()
+            return (), {}
+
+        def call():
+            return [mcp.layout_frame(frame["title"], frame.get("content_lines", []), frame.get("code_block"))
+                    for frame in frames]
+        return setup, call
+    return factory
+
+
+def _cases():
+    import generate_tv_short_frames as tv
+    import generate_mcp_frames as mcp
+    cases = {}
+    for i, (name, _) in enumerate(tv.FRAMES):
+        cases[f"tv.scene.{name}"] = tv_scene(i)
+    cases["tv.effect.add_tv_static"] = tv_static
+    cases["tv.effect.create_gradient_bg"] = tv_gradient(cold=False)
+    cases["tv.effect.create_gradient_bg.cold"] = tv_gradient(cold=True)
+    cases["tv.effect.draw_text_with_outline"] = tv_outline_text(cold=False)
+    cases["tv.effect.draw_text_with_outline.cold"] = tv_outline_text(cold=True)
+    cases["tv.effect.scan_lines"] = tv_scan_lines
+    cases["tv.effect.add_vhs_glitch"] = tv_glitch
+    cases["tv.io.img_save"] = tv_png_save
+    for frame_num in range(1, len(mcp.load_spec(mcp.DEFAULT_SPEC)["frames"]) + 1):
+        cases[f"mcp.create_frame.{frame_num:03d}"] = mcp_create_frame(frame_num)
+    cases["mcp.layout_deck"] = mcp_layout_deck(cold=False)
+    cases["mcp.layout_deck.cold"] = mcp_layout_deck(cold=True)
+    return cases
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def measure(name, repeats=DEFAULT_REPEATS):
+    """Run one case: 1 warm-up call, `repeats` timed calls, 1 traced call"""
+    from neko_render import memory
+    setup, call = _cases()[name]()
+    args, kwargs = setup()
+    call(*args, **kwargs)
+    baseline_rss = memory.peak_rss_mb()
+
+    times = []
+    for _ in range(repeats):
+        args, kwargs = setup()
+        start = time.perf_counter()
+        call(*args, **kwargs)
+        times.append((time.perf_counter() - start) * 1000)
+    peak_rss = memory.peak_rss_mb()
+
+    # tracemalloc sees Python and NumPy buffers, not Pillow's own image memory
+    args, kwargs = setup()
+    tracemalloc.start()
+    call(*args, **kwargs)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        'name': name,
+        'repeats': repeats,
+        'median_ms': round(statistics.median(times), 3),
+        'p95_ms': round(percentile(times, 0.95), 3),
+        'min_ms': round(times[0], 3),
+        'max_ms': round(times[-1], 3),
+        'peak_rss_mb': round(peak_rss, 1),
+        'rss_growth_mb': round(peak_rss - baseline_rss, 1),
+        'py_alloc_peak_kb': round(alloc_peak / 1024, 1),
+    }
+
+
+def _measure_task(task):
+    name, repeats = task
+    return measure(name, repeats)
+
+
+def run(names, repeats=DEFAULT_REPEATS, isolate=True):
+    """Measure cases in order; isolate runs each in a fresh process"""
+    tasks = [(name, repeats) for name in names]
+    if not isolate:
+        yield from map(_measure_task, tasks)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        yield from pool.imap(_measure_task, tasks)
+
+
+def metadata(repeats):
+    import numpy
+    import PIL
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+                                capture_output=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(), 'pillow': PIL.__version__,
+            'numpy': numpy.__version__, 'machine': platform.machine(),
+            'cpus': os.cpu_count(), 'seed': SEED, 'repeats': repeats}
+
+
+def compare(results, baseline_path, threshold=0.1):
+    """Print median change per case against a previous JSON; returns the worst ratio
+
+    Changes under MIN_DELTA_MS are timer noise and never count as regressions.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case['name']: case for case in json.load(f)['cases']}
+    worst = 1.0
+    print(f"\n📈 vs {baseline_path}")
+    for case in results:
+        old = baseline.get(case['name'])
+        if not old or not old['median_ms']:
+            continue
+        ratio = case['median_ms'] / old['median_ms']
+        significant = case['median_ms'] - old['median_ms'] > MIN_DELTA_MS
+        if significant:
+            worst = max(worst, ratio)
+        flag = "🙀" if significant and ratio > 1 + threshold else "  "
+        print(f"{flag} {case['name']:<40} {old['median_ms']:>9.2f} -> {case['median_ms']:>9.2f} ms "
+              f"({(ratio - 1) * 100:+.0f}%)")
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-scene / per-effect benchmark suite")
+    parser.add_argument("--filter", "-k", action="append",
+                        help="glob or substring of case names (repeatable)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--json", help="write results here ('-' for stdout only)")
+    parser.add_argument("--compare", help="previous results JSON to diff medians against")
+    parser.add_argument("--max-regression", type=float,
+                        help="with --compare: exit 1 if any median slowed by more than this %%")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="run every case in this process (faster; peak RSS is cumulative)")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args(argv)
+
+    names = list(_cases())
+    if args.filter:
+        names = [name for name in names
+                 if any(pat in name or fnmatch.fnmatch(name, pat) for pat in args.filter)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    quiet = args.json == "-"
+    log = sys.stderr if quiet else sys.stdout
+    print(f"📊 {len(names)} case(s), {args.repeats} repeats each", file=log)
+    print(f"{'case':<40} {'median':>9} {'p95':>9} {'peak RSS':>9} {'py alloc':>10}", file=log)
+    results = []
+    for case in run(names, args.repeats, isolate=not args.no_isolate):
+        results.append(case)
+        print(f"{case['name']:<40} {case['median_ms']:>7.2f}ms {case['p95_ms']:>7.2f}ms "
+              f"{case['peak_rss_mb']:>7.0f}MB {case['py_alloc_peak_kb']:>8.0f}KB", file=log)
+
+    report = {'meta': metadata(args.repeats), 'cases': results}
+    if quiet:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 {args.json}")
+
+    if args.compare:
+        threshold = (args.max_regression or 10) / 100
+        worst = compare(results, args.compare, threshold)
+        if args.max_regression is not None and worst > 1 + threshold:
+            print(f"🙀 regression over {args.max_regression}%", file=log)
+            return 1
+    return 0
+
+
+if pytest is not None:
+    @pytest.mark.parametrize("name", list(_cases()))
+    def test_bench(benchmark, name):
+        """pytest-benchmark entry point: same cases, timed by the benchmark fixture"""
+        setup, call = _cases()[name]()
+        benchmark.pedantic(call, setup=setup, rounds=DEFAULT_REPEATS, warmup_rounds=1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
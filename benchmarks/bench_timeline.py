@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+🎞️ Per-frame render budget for timeline mode (--animate)
+Renders --seconds of every TV-short scene at --fps without writing
+anything and checks the p95 frame time against the frame budget.
+Usage: python3 benchmarks/bench_timeline.py [--fps 30] [--seconds 1] [--resolution 360p]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_tv_short_frames as tv  # noqa: E402
+from neko_render import layout, timeline  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--budget-ms", type=float, help="default: 1000 / fps")
+    parser.add_argument("--resolution", default="native", help="e.g. 360p, 720p, 4k")
+    args = parser.parse_args()
+    budget = args.budget_ms or 1000 / args.fps
+    size = layout.Layout.parse(tv.DESIGN.design, args.resolution)
+
+    print(f"🐾 Timeline budget: {args.seconds}s per scene at {args.fps} fps, {size.name}, "
+          f"budget {budget:.1f} ms/frame")
+    print(f"{'scene':<22} {'base (ms)':>10} {'median':>8} {'p95':>8} {'max':>8}")
+    all_times = []
+    for i, scene in enumerate(tv.ANIMATED_SCENES):
+        frames = list(timeline.render_scene_frames(scene, i, args.seconds, args.fps, layout=size))
+        # The first frame pays for the base; later frames reuse it
+        base = frames[0][2] * 1000
+        times = sorted(elapsed * 1000 for _, _, elapsed in frames[1:])
+        all_times += times
+        p95 = times[int(len(times) * 0.95) - 1] if times else 0
+        print(f"{scene.name:<22} {base:>10.1f} {statistics.median(times):>8.1f} {p95:>8.1f} {times[-1]:>8.1f}")
+
+    all_times.sort()
+    p95 = all_times[int(len(all_times) * 0.95) - 1]
+    print(f"\n   overall median {statistics.median(all_times):.1f} ms, p95 {p95:.1f} ms")
+    if p95 > budget:
+        print("🙀 over budget")
+        sys.exit(1)
+    print("✅ within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+📺 Benchmark: per-pixel add_tv_static vs the NumPy static layer
+Usage: python3 benchmarks/bench_tv_static.py [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neko_render import effects  # noqa: E402
+
+WIDTH = 1080
+HEIGHT = 1920
+INTENSITIES = (0.1, 0.5, 1.0)
+
+
+def legacy_add_tv_static(img, intensity=0.1):
+    """Original per-pixel implementation, kept here as the baseline"""
+    draw = ImageDraw.Draw(img)
+    for _ in range(int(WIDTH * HEIGHT * intensity)):
+        x = random.randint(0, WIDTH-1)
+        y = random.randint(0, HEIGHT-1)
+        gray = random.randint(200, 255)
+        draw.point((x, y), fill=(gray, gray, gray, 100))
+    return img
+
+
+def time_call(func, repeat):
+    times = []
+    for _ in range(repeat):
+        img = Image.new('RGBA', (WIDTH, HEIGHT), 'black')
+        start = time.perf_counter()
+        func(img)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"🐾 TV static benchmark ({WIDTH}x{HEIGHT}, median of {args.repeat})")
+    print(f"{'intensity':>10} {'legacy (s)':>12} {'numpy (s)':>12} {'speedup':>10}")
+    for intensity in INTENSITIES:
+        random.seed(0)
+        legacy = time_call(lambda img: legacy_add_tv_static(img, intensity), args.repeat)
+        vectorized = time_call(lambda img: effects.add_tv_static(img, intensity, rng=0), args.repeat)
+        print(f"{intensity:>10.1f} {legacy:>12.3f} {vectorized:>12.4f} {legacy / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+📼 Benchmark: legacy crop/paste add_vhs_glitch vs the glitch engine
+The legacy version only moves bands and overwrites them with the tint
+rectangle; the engine also splits RGB and blends the tint, so it does more
+work per band. What is checked is how the engine scales: 10 bands must
+cost at most --max-ratio times 1 band (exit 1 otherwise; about 4x measured).
+Usage: python3 benchmarks/bench_vhs_glitch.py [--repeat N] [--max-ratio 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neko_render import effects  # noqa: E402
+
+WIDTH = 1080
+HEIGHT = 1920
+INTENSITIES = (1, 3, 10)
+
+
+def legacy_add_vhs_glitch(img, intensity=5):
+    """Original implementation, kept here as the baseline"""
+    draw = ImageDraw.Draw(img)
+    for _ in range(intensity):
+        y = random.randint(0, HEIGHT-50)
+        height = random.randint(5, 20)
+        offset = random.randint(-50, 50)
+        glitch_band = img.crop((0, y, WIDTH, y + height))
+        img.paste(glitch_band, (offset, y))
+        if random.random() > 0.5:
+            draw.rectangle([0, y, WIDTH, y + height], fill=(255, 0, 255, 30))
+    return img
+
+
+def time_call(func, repeat):
+    img = Image.new('RGBA', (WIDTH, HEIGHT), '#2980B9')
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(img)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--max-ratio', type=float, default=5.0,
+                        help="allowed cost of the most bands over the fewest")
+    args = parser.parse_args()
+
+    print(f"🐾 VHS glitch benchmark ({WIDTH}x{HEIGHT}, median of {args.repeat})")
+    print(f"{'bands':>6} {'legacy (ms)':>12} {'engine (ms)':>12}")
+    costs = []
+    for intensity in INTENSITIES:
+        random.seed(0)
+        legacy = time_call(lambda img: legacy_add_vhs_glitch(img, intensity), args.repeat)
+        engine = time_call(lambda img: effects.vhs_glitch(img, intensity, rng=0), args.repeat)
+        costs.append(engine)
+        print(f"{intensity:>6} {legacy * 1000:>12.2f} {engine * 1000:>12.2f}")
+
+    ratio = costs[-1] / costs[0]
+    print(f"\n   {INTENSITIES[-1]} bands cost {ratio:.1f}x {INTENSITIES[0]} band (limit {args.max_ratio:.1f}x)")
+    if ratio > args.max_ratio:
+        print("🙀 glitch cost grows too fast with the band count")
+        sys.exit(1)
+    print("✅ within limit")
+
+
+if __name__ == "__main__":
+    main()
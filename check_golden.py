@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+🔍 Golden-image regression check for both generators
+
+Renders every TV-short scene and every deck frame with fixed seeds and
+compares each against a stored golden PNG: PSNR over RGB and SSIM on
+luma must clear the thresholds. A failing frame gets a heatmap sheet
+(golden | render | difference) in the report directory. Frames render
+and compare in parallel, one task per frame, so the 26-frame set runs in
+seconds and can guard every optimization of the shared effects.
+
+No baseline is committed: text pixels depend on the installed fonts,
+the layout engine and the emoji font, so goldens only hold on the setup
+that recorded them. Record a local baseline with --update before a
+change (golden/<resolution>/, ignored by git) and check after it:
+
+    python3 check_golden.py --update     # on the code before the change
+    python3 check_golden.py              # on the code after it
+
+golden.json records the environment the goldens were rendered in (fonts,
+Pillow, NumPy, shaping). If the fonts, layout engine or emoji font differ
+from the record the check stops with exit 2 and lists them instead of
+failing every frame; other differences (library versions) are only a
+warning. Recording without a text font or the color emoji font warns
+that the baseline holds fallback glyphs. A frame without a golden fails
+the check.
+
+Usage: python3 check_golden.py [--update] [--resolution 360p] [--filter 'tv/*'] [-j N]
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import PIL
+from PIL import Image
+
+import generate_mcp_frames as mcp
+import generate_tv_short_frames as tv
+from neko_render import fonts, imagediff, parallel, shaping
+from neko_render import layout as layouts
+
+DEFAULT_GOLDEN_DIR = os.environ.get(
+    "NEKO_GOLDEN_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden"))
+DEFAULT_RESOLUTION = "360p"
+DEFAULT_REPORT_DIR = "golden-report"
+MIN_PSNR = 45.0
+MIN_SSIM = 0.998
+SEED = 0
+MANIFEST = "golden.json"
+# Environment keys text rendering depends on: a mismatch makes every comparison meaningless
+FONT_KEYS = ("fonts", "layout_engine", "emoji_font")
+FONT_PACKAGES = "fonts-liberation and fonts-noto-color-emoji on Debian/Ubuntu"
+
+
+def cases(spec_path, resolution):
+    """(name, kind, args) for every TV scene and deck frame"""
+    tv_layout = layouts.Layout.parse(tv.DESIGN.design, resolution)
+    deck_layout = layouts.Layout.parse(mcp.DESIGN.design, resolution)
+    found = [(f"tv/{name}", 'tv', (index, tv_layout)) for index, (name, _) in enumerate(tv.FRAMES)]
+    spec = mcp.load_spec(spec_path)
+    for num, frame in enumerate(spec["frames"], start=1):
+        found.append((f"deck/frame_{num:03d}", 'deck', (num, frame, deck_layout)))
+    return found
+
+
+def render_case(kind, args):
+    if kind == 'tv':
+        index, layout = args
+        return tv.render_scene(index, SEED, "python", layout)[0].convert('RGB')
+    num, frame, layout = args
+    return mcp.render_frame(num, frame["title"], frame.get("content_lines", []), frame.get("code_block"), layout)
+
+
+def check_case(name, kind, args, golden_dir, report_dir, update, min_psnr, min_ssim):
+    """Render one case (inside a pool worker); returns a result dict"""
+    start = time.perf_counter()
+    img = render_case(kind, args)
+    render_seconds = time.perf_counter() - start
+    path = os.path.join(golden_dir, f"{name}.png")
+    if update:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        img.save(path, compress_level=1)
+        return {'name': name, 'status': 'updated', 'render_seconds': render_seconds}
+    if not os.path.exists(path):
+        return {'name': name, 'status': 'missing', 'render_seconds': render_seconds, 'reason': 'no golden image'}
+
+    with Image.open(path) as golden:
+        golden.load()
+    if golden.size != img.size:
+        return {'name': name, 'status': 'failed', 'render_seconds': render_seconds,
+                'reason': f"size {img.size[0]}x{img.size[1]}, golden {golden.size[0]}x{golden.size[1]}"}
+    diff = imagediff.compare(golden, img)
+    passed = diff.psnr >= min_psnr and diff.ssim >= min_ssim
+    result = {'name': name, 'status': 'passed' if passed else 'failed', 'render_seconds': render_seconds,
+              'psnr': diff.psnr, 'ssim': diff.ssim, 'max_diff': diff.max_diff, 'changed': diff.changed}
+    if not passed:
+        sheet = os.path.join(report_dir, f"{name}_diff.png")
+        os.makedirs(os.path.dirname(sheet), exist_ok=True)
+        imagediff.heatmap(golden, img).save(sheet, compress_level=1)
+        result['heatmap'] = sheet
+    return result
+
+
+def content_digest(path):
+    """sha256 of a file's bytes, or "missing": the same on every clone, unlike mtimes"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def environment(resolution, spec_path):
+    """What the goldens depend on besides the code under test"""
+    font_paths = sorted({path for path, _ in mcp.FONT_SPECS.values()} | {fonts.DEJAVU_BOLD})
+    emoji = shaping.emoji_font()
+    return {
+        'resolution': resolution,
+        'seed': SEED,
+        'spec': content_digest(spec_path),
+        'pillow': PIL.__version__,
+        'numpy': np.__version__,
+        'layout_engine': shaping.signature()[0],
+        'emoji_font': content_digest(emoji.path) if emoji else None,
+        'fonts': {os.path.basename(path): content_digest(path) for path in font_paths},
+    }
+
+
+def font_problems(recorded, env):
+    """Lines describing how the font setup differs from the recorded one (empty when it matches)"""
+    lines = []
+    fonts_then, fonts_now = recorded.get('fonts') or {}, env['fonts']
+    for name in sorted(set(fonts_then) | set(fonts_now)):
+        then, now = fonts_then.get(name, "not recorded"), fonts_now.get(name, "not used")
+        if then != now:
+            lines.append(f"{name}: recorded {then[:12]}, here {now[:12]}")
+    if recorded.get('layout_engine') != env['layout_engine']:
+        lines.append(f"layout engine: recorded {recorded.get('layout_engine')}, here {env['layout_engine']}")
+    if recorded.get('emoji_font') != env['emoji_font']:
+        lines.append(f"emoji font: recorded {(recorded.get('emoji_font') or 'none')[:12]}, "
+                     f"here {(env['emoji_font'] or 'none')[:12]}")
+    return lines
+
+
+def missing_fonts(env):
+    """Fonts the frames use that are not installed (the color emoji font included)"""
+    missing = [name for name, digest in env['fonts'].items() if digest == "missing"]
+    if env['emoji_font'] is None:
+        missing.append(f"a color emoji font (or ${shaping.EMOJI_ENV})")
+    return missing
+
+
+def report(results, wall, jobs):
+    print(f"   {'frame':<28} {'status':<8} {'PSNR dB':>8} {'SSIM':>7} {'max':>4} {'changed':>8} {'render':>7}")
+    for result in results:
+        psnr = result.get('psnr')
+        metrics = ""
+        if psnr is not None:
+            metrics = (f"{'inf' if psnr == float('inf') else f'{psnr:.1f}':>8} {result['ssim']:>7.4f} "
+                       f"{result['max_diff']:>4} {result['changed']:>7.2%}")
+        else:
+            metrics = f"{result.get('reason', ''):>30}"
+        print(f"   {result['name']:<28} {result['status']:<8} {metrics} {result['render_seconds']:>6.2f}s")
+    print(f"⏱️  {len(results)} frames in {wall:.2f}s over {jobs} worker(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare both generators' frames against golden images")
+    parser.add_argument("--update", action="store_true", help="re-render and store the goldens")
+    parser.add_argument("--golden-dir", default=DEFAULT_GOLDEN_DIR,
+                        help="golden image directory (default: the committed golden/, or $NEKO_GOLDEN_DIR)")
+    parser.add_argument("--report-dir", default=DEFAULT_REPORT_DIR, help="where failing frames' heatmaps go")
+    parser.add_argument("--resolution", default=DEFAULT_RESOLUTION,
+                        help=f"render size: {', '.join(layouts.RESOLUTIONS)}, WxH or native")
+    parser.add_argument("--spec", default=mcp.DEFAULT_SPEC, help="deck spec (JSON)")
+    parser.add_argument("--filter", default="*", help="only frames matching this glob, e.g. 'tv/*'")
+    parser.add_argument("--min-psnr", type=float, default=MIN_PSNR, help="dB")
+    parser.add_argument("--min-ssim", type=float, default=MIN_SSIM)
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="worker processes (0 = one per CPU core)")
+    args = parser.parse_args(argv)
+    jobs = args.jobs or parallel.default_jobs()
+
+    try:
+        selected = [case for case in cases(args.spec, args.resolution) if fnmatch.fnmatch(case[0], args.filter)]
+    except (OSError, ValueError) as e:
+        print(f"🙀 {e}")
+        return 2
+    env = environment(args.resolution, args.spec)
+    # One set of goldens per resolution
+    golden_dir = os.path.join(args.golden_dir, args.resolution)
+    manifest_path = os.path.join(golden_dir, MANIFEST)
+    if args.update:
+        missing = missing_fonts(env)
+        if missing:
+            print(f"⚠️  {', '.join(missing)} missing: the baseline holds fallback glyphs and only "
+                  f"compares on this font setup ({FONT_PACKAGES} for the real one)")
+    else:
+        if not os.path.exists(manifest_path):
+            print(f"🙀 No goldens in {golden_dir}; record a baseline with --update on the code "
+                  f"before your change, then run the check again")
+            return 2
+        with open(manifest_path, encoding="utf-8") as f:
+            recorded = json.load(f)
+        problems = font_problems(recorded, env)
+        if problems:
+            print(f"🙀 Goldens in {golden_dir} were recorded with another font setup:")
+            for line in problems:
+                print(f"   {line}")
+            print(f"   Text cannot match across font setups. Install the recorded fonts ({FONT_PACKAGES}), "
+                  f"or re-record the baseline with --update")
+            return 2
+        changed = sorted(key for key in env if key not in FONT_KEYS and recorded.get(key) != env[key])
+        if changed:
+            print(f"⚠️  Goldens were recorded with a different {', '.join(changed)}; "
+                  f"differences may not come from the code")
+
+    print(f"🔍 {'Recording' if args.update else 'Checking'} {len(selected)} golden frame(s) "
+          f"at {args.resolution} over {jobs} worker(s)")
+    start = time.perf_counter()
+    tasks = [(name, kind, case_args, golden_dir, args.report_dir, args.update, args.min_psnr, args.min_ssim)
+             for name, kind, case_args in selected]
+    results = []
+    for (name, _, _), result in zip(selected, parallel.iter_ordered(check_case, tasks, jobs)):
+        if result.error:
+            print(f"❌ Failed: {name}\n{result.error}")
+            results.append({'name': name, 'status': 'error', 'render_seconds': 0.0, 'reason': 'exception'})
+        else:
+            results.append(result.value)
+    wall = time.perf_counter() - start
+    report(results, wall, jobs)
+
+    if args.update:
+        os.makedirs(golden_dir, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(env, f, indent=2)
+        print(f"📁 Goldens: {golden_dir}")
+        print("Nyaa~! Goldens recorded! 🐾")
+        return 0
+    bad = [result for result in results if result['status'] != 'passed']
+    if bad:
+        heatmaps = [result['heatmap'] for result in bad if 'heatmap' in result]
+        if heatmaps:
+            print(f"🗺️  Heatmaps: {args.report_dir}")
+        print(f"🙀 {len(bad)} frame(s) off: {', '.join(result['name'] for result in bad)}")
+        return 1
+    print("Nyaa~! Every frame matches its golden! 🐾")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
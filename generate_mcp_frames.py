@@ -1,18 +1,38 @@
 #!/usr/bin/env python3
 """
 Generate visual frames for MCP Six Personalities YouTube video
+
+Importable without side effects: fonts load on first use and nothing is
+rendered until render_deck() / main() is called. Deck content lives in a
+JSON spec (see decks/mcp-six-personalities.json).
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import argparse
+import json
 import os
+import shutil
+import sys
+import time
+
+from neko_render import cache as render_cache
+from neko_render import fonts, profiling, shaping, sinks, textlayout, writer
+from neko_render import layout as layouts
 
-# Create output directory
+# Default output directory (used by main() only)
 output_dir = "/home/wakibaka/Documents/github/claude-operations/mcp-video-frames"
-os.makedirs(output_dir, exist_ok=True)
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "decks", "mcp-six-personalities.json")
 
-# Video dimensions (1920x1080 HD)
+# Video dimensions (1920x1080 HD); frames are laid out in these design
+# units and render at any size of the same aspect (see neko_render.layout)
 WIDTH = 1920
 HEIGHT = 1080
+DESIGN = layouts.Layout((WIDTH, HEIGHT))
+
+# Timing defaults (same as video_config.txt); a spec may override them
+DEFAULT_FPS = 25
+DEFAULT_FRAME_DURATION = 3
 
 # Color scheme
 BG_COLOR = (20, 20, 30)  # Dark blue-gray
@@ -20,183 +40,250 @@ ACCENT_COLOR = (100, 150, 255)  # Light blue
 TEXT_COLOR = (255, 255, 255)  # White
 CODE_BG = (30, 30, 40)  # Darker background for code
 
-# Try to use a nice font, fallback to default
-try:
-    title_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf", 80)
-    main_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", 48)
-    code_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf", 36)
-    small_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", 32)
-except:
-    # Fallback to default font
-    title_font = ImageFont.load_default()
-    main_font = ImageFont.load_default()
-    code_font = ImageFont.load_default()
-    small_font = ImageFont.load_default()
-
-def create_frame(frame_num, title, content_lines, code_block=None):
-    """Create a single video frame"""
-    img = Image.new('RGB', (WIDTH, HEIGHT), color=BG_COLOR)
-    draw = ImageDraw.Draw(img)
-
-    # Draw title
-    draw.text((WIDTH//2, 100), title, font=title_font, anchor="mt", fill=ACCENT_COLOR)
+# Font files and sizes; loaded lazily through the shared font cache
+LIBERATION_DIR = "/usr/share/fonts/truetype/liberation"
+FONT_SPECS = {
+    'title': (f"{LIBERATION_DIR}/LiberationSans-Bold.ttf", 80),
+    'main': (f"{LIBERATION_DIR}/LiberationSans-Regular.ttf", 48),
+    'code': (f"{LIBERATION_DIR}/LiberationMono-Regular.ttf", 36),
+    'small': (f"{LIBERATION_DIR}/LiberationSans-Regular.ttf", 32),
+}
+
+# Text boxes (design units): title and content span the width minus margins,
+# content runs from CONTENT_TOP to above the code box or the frame number
+MARGIN = 100
+TEXT_WIDTH = WIDTH - 2 * MARGIN
+TITLE_TOP = 100
+TITLE_HEIGHT = 90
+CONTENT_TOP = 350
+CONTENT_BOTTOM = HEIGHT - 100
+CODE_BOX = (300, 600, WIDTH - 300, 800)
+CODE_PADDING = 20
+
+def get_font(role, layout=DESIGN, size=None):
+    """Font for a role ('title', 'main', 'code', 'small') at the layout's scale, loaded on first use
+
+    size overrides the role's design size (e.g. a shrink-to-fit size).
+    """
+    path, role_size = FONT_SPECS[role]
+    return fonts.get_font(layout.font_size(size or role_size), path)
+
+def fit_text(role, text, width, height, wrap_words=True):
+    """textlayout.fit() of text in a role's font (memoized per text, font, size and box)"""
+    path, size = FONT_SPECS[role]
+    return textlayout.fit(text, path, size, width, height, wrap_words=wrap_words)
+
+def layout_frame(title, content_lines, code_block=None):
+    """(title, content, code or None) Blocks of one frame, in design units"""
+    code = None
+    content_bottom = CONTENT_BOTTOM
+    if code_block:
+        left, top, right, bottom = CODE_BOX
+        code = fit_text('code', code_block, right - left - 2 * CODE_PADDING, bottom - top - 2 * CODE_PADDING,
+                        wrap_words=False)
+        content_bottom = top - CODE_PADDING
+    return (fit_text('title', title, TEXT_WIDTH, TITLE_HEIGHT),
+            fit_text('main', "\n".join(content_lines), TEXT_WIDTH, content_bottom - CONTENT_TOP),
+            code)
+
+def render_frame(frame_num, title, content_lines, code_block=None, layout=DESIGN):
+    """Render a single video frame at the layout's size and return the image"""
+    img = Image.new('RGB', layout.size, color=BG_COLOR)
+    draw = layout.draw(ImageDraw.Draw(img))
+    main_font = get_font('main', layout)
+    title_block, content, code = layout_frame(title, content_lines, code_block)
+
+    def text(xy, line, font, fill, anchor=None):
+        # Cached glyph runs (see neko_render.shaping), with color emoji when available
+        shaping.draw_text(img, layout.point(xy), line, font, fill, anchor)
+
+    # Draw title (shrunk, then wrapped, to fit the width)
+    title_font = get_font('title', layout, title_block.size)
+    for i, line in enumerate(title_block.lines):
+        text((WIDTH//2, TITLE_TOP + i * title_block.step), line, title_font, ACCENT_COLOR, anchor="mt")
 
     # Draw personality icons at top
     personalities = ["🐾", "🎭", "🗡️", "🎸", "🧠", "🧠"]
     x_start = 200
     for i, emoji in enumerate(personalities):
-        draw.text((x_start + i*250, 200), emoji, font=main_font, fill=TEXT_COLOR)
+        text((x_start + i*250, 200), emoji, main_font, TEXT_COLOR)
 
-    # Draw main content
-    y_pos = 350
-    for line in content_lines:
-        draw.text((WIDTH//2, y_pos), line, font=main_font, anchor="mt", fill=TEXT_COLOR)
-        y_pos += 60
+    # Draw main content (wrapped, and shrunk if it would run into the code box)
+    content_font = get_font('main', layout, content.size)
+    for i, line in enumerate(content.lines):
+        text((WIDTH//2, CONTENT_TOP + i * content.step), line, content_font, TEXT_COLOR, anchor="mt")
 
     # Draw code block if provided
-    if code_block:
-        # Draw code background
-        code_y = 600
-        draw.rectangle([300, code_y, WIDTH-300, code_y+200], fill=CODE_BG)
-        # Draw code text
-        draw.text((WIDTH//2, code_y+100), code_block, font=code_font, anchor="mm", fill=(100, 255, 100))
+    if code:
+        left, top, right, bottom = CODE_BOX
+        draw.rectangle(list(CODE_BOX), fill=CODE_BG)
+        code_font = get_font('code', layout, code.size)
+        center_y = (top + bottom) // 2
+        if len(code.lines) == 1:
+            text((WIDTH//2, center_y), code.lines[0], code_font, (100, 255, 100), anchor="mm")
+        else:
+            # Left-aligned lines, the block centered in the box
+            path = FONT_SPECS['code'][0]
+            x = WIDTH//2 - max(textlayout.text_width(line, path, code.size) for line in code.lines) // 2
+            y = center_y - textlayout.block_height(code) // 2
+            for i, line in enumerate(code.lines):
+                text((x, y + i * code.step), line, code_font, (100, 255, 100))
 
     # Draw frame number
-    draw.text((50, HEIGHT-50), f"Frame {frame_num}", font=small_font, fill=(100, 100, 100))
+    text((50, HEIGHT-50), f"Frame {frame_num}", get_font('small', layout), (100, 100, 100))
+
+    return img
 
-    # Save frame
-    img.save(f"{output_dir}/frame_{frame_num:03d}.png")
+def create_frame(frame_num, title, content_lines, code_block=None, out_dir=output_dir):
+    """Create a single video frame and save it into out_dir"""
+    with profiling.span(f"frame {frame_num:03d}", "scene"):
+        img = render_frame(frame_num, title, content_lines, code_block)
+    frame_path = os.path.join(out_dir, f"frame_{frame_num:03d}.png")
+    with profiling.span("save", "io", frame=frame_num):
+        img.save(frame_path)
     print(f"Generated frame {frame_num}: {title}")
+    return frame_path
+
+def load_spec(path):
+    """Read a deck spec: {"name", "fps"?, "frame_duration"?, "frames": [{"title", "content_lines", "code_block"?, "duration"?}]}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def frame_key(frame_num, frame, layout=DESIGN):
+    """Render-cache key: renderer source, frame content, size, colors and fonts"""
+    return render_cache.fingerprint(
+        "mcp-deck", render_cache.source_digest(render_frame, layout_frame, fonts, layouts, shaping, textlayout),
+        frame_num, frame["title"], frame.get("content_lines", []), frame.get("code_block"),
+        WIDTH, HEIGHT, layout.size, BG_COLOR, ACCENT_COLOR, TEXT_COLOR, CODE_BG,
+        [(render_cache.file_digest(path), size) for path, size in FONT_SPECS.values()],
+        shaping.signature())
+
+def render_deck_frame(frame_num, frame, out_dir, cache_dir=None, force=False, writer_options=None,
+                      layout=DESIGN):
+    """Render one deck frame into out_dir (runs inside a pool worker), through the render cache if set
+
+    Saves frame_<NNN><ext> in the writer's format and returns its path, or
+    returns an RGB image when out_dir is None. Returns (path or image,
+    seconds, cache_hit, encode_seconds).
+    """
+    start = time.perf_counter()
+    store = render_cache.RenderCache(cache_dir, force=force) if cache_dir else None
+    key = frame_key(frame_num, frame, layout) if store else None
+    cached = store.get(key) if store else None
+
+    out = writer.shared(**(writer_options or {}))
+    before = out.encode_seconds
+    name = f"{frame_num:03d}"
+    img = None
+    if not cached:
+        with profiling.span(f"frame {name}", "scene"):
+            img = render_frame(frame_num, frame["title"], frame.get("content_lines", []),
+                               frame.get("code_block"), layout)
+    if out_dir is None:
+        if store and img:
+            store.put(key, img)
+        return ((img or Image.open(cached)).convert('RGB'), time.perf_counter() - start,
+                cached is not None, 0.0)
+
+    path = os.path.join(out_dir, f"frame_{name}{out.ext}")
+    if cached and out.copies_png:
+        with profiling.span("copy", "io", frame=name):
+            shutil.copyfile(cached, path)
+    else:
+        out.save(img or Image.open(cached), path, name)
+        if store and img:
+            store.put(key, img)
+        out.flush()
+    return path, time.perf_counter() - start, cached is not None, out.encode_seconds - before
+
+def render_deck(spec, out_dir, sink="png", cache=None, frame_writer=None, layout=DESIGN):
+    """Render every frame of a deck spec (dict or JSON path) into a sink
+
+    sink is "png" (a file per frame via frame_writer, PNG by default, +
+    frames.ffconcat) or "ffmpeg" (stream straight into <out_dir>/<name>.mp4).
+    With a RenderCache, only frames whose content changed are re-rendered.
+    Frames are drawn at layout's size. Returns the sink summary.
+    """
+    if isinstance(spec, (str, os.PathLike)):
+        spec = load_spec(spec)
+    frames = spec["frames"]
+    durations = [frame.get("duration", spec.get("frame_duration", DEFAULT_FRAME_DURATION))
+                 for frame in frames]
+    out = sinks.open_sink(sink, out_dir, layout.size, durations,
+                          spec.get("fps", DEFAULT_FPS), video_name=f"{spec.get('name', 'deck')}.mp4",
+                          writer=frame_writer)
+
+    try:
+        for frame_num, frame in enumerate(frames, start=1):
+            name = f"{frame_num:03d}"
+            key = frame_key(frame_num, frame, layout) if cache else None
+            cached = cache.get(key) if cache else None
+            if cached:
+                out.write_file(name, cached)
+                print(f"Cached frame {frame_num}: {frame['title']}")
+                continue
+
+            with profiling.span(f"frame {name}", "scene"):
+                img = render_frame(frame_num, frame["title"], frame.get("content_lines", []),
+                                   frame.get("code_block"), layout)
+            # Queued first, so the render-cache PNG encodes alongside it
+            out.write(name, img)
+            if cache:
+                cache.put(key, img)
+            print(f"Generated frame {frame_num}: {frame['title']}")
+    except BaseException:
+        # No ffmpeg left waiting on its stdin
+        out.abort()
+        raise
+
+    if cache:
+        cache.evict()
+    return out.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate MCP deck video frames")
+    parser.add_argument("--spec", default=DEFAULT_SPEC, help="deck spec (JSON)")
+    parser.add_argument("--out", default=output_dir, help="output directory")
+    parser.add_argument("--sink", choices=["png", "ffmpeg"], default="png",
+                        help="png files + ffconcat timing, or stream straight into ffmpeg")
+    render_cache.add_arguments(parser)
+    writer.add_arguments(parser)
+    layouts.add_arguments(parser)
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable(args.profile)
+
+    cache = None
+    if not args.no_cache:
+        cache = render_cache.RenderCache(args.cache_dir, args.cache_size * 1024 * 1024, args.force)
+
+    try:
+        sizes = layouts.from_args(DESIGN.design, args)
+    except ValueError as e:
+        print(f"🙀 {e}")
+        return 2
+    print("🎬 Generating MCP Six Personalities Video Frames...")
+    try:
+        spec = load_spec(args.spec)
+        for size in sizes:
+            # Several sizes: one subdirectory each
+            out_dir = args.out if len(sizes) == 1 else os.path.join(args.out, size.name)
+            summary = render_deck(spec, out_dir, args.sink, cache,
+                                  writer.FrameWriter(**writer.options(args)), size)
+
+            print(f"\n✨ Successfully generated {summary['frames']} {size.name} frames in {out_dir}")
+            print(f"💾 Bytes written: {summary['bytes_written']:,}")
+            writer.report(summary)
+        if cache:
+            print(f"♻️  Render cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+        if args.sink == "png":
+            print("Ready to create video with advanced-video-maker.sh (or ffmpeg -f concat -i frames.ffconcat)!")
+        else:
+            print(f"🎥 Video: {summary['outputs'][0]}")
+    finally:
+        profiling.report()
+    return 0
 
-# Generate all frames
-print("🎬 Generating MCP Six Personalities Video Frames...")
-
-# Frame 1: Title Screen
-create_frame(1, "MCP Six Personalities", [
-    "Transform Your Claude Desktop Experience",
-    "Six Unique AI Perspectives",
-    "One Powerful Collaboration Tool"
-])
-
-# Frame 2: The Problem
-create_frame(2, "Why Six Personalities?", [
-    "❌ Single perspective = Limited solutions",
-    "❌ One viewpoint = Blind spots",
-    "✅ Six perspectives = Comprehensive analysis",
-    "✅ Multiple viewpoints = Creative solutions"
-])
-
-# Frame 3: Installation
-create_frame(3, "Easy Installation", [
-    "Install globally with NPM:",
-    "",
-    "One simple command to get started!"
-], "npm install -g mcp-six-personalities")
-
-# Frame 4: Configuration
-create_frame(4, "Simple Configuration", [
-    "Add to Claude Desktop config:",
-    "",
-    "Just restart Claude and you're ready!"
-], '{"mcpServers": {"six-personalities": {...}}}')
-
-# Frame 5: Meet Neko-Arc
-create_frame(5, "🐾 Meet Neko-Arc", [
-    "Technical Implementation Expert",
-    "Handles core development tasks",
-    "Speaks: 'Nyaa~!', 'desu~', '*purrs*'",
-    "Your kawaii coding companion!"
-])
-
-# Frame 6: Meet Mario
-create_frame(6, "🎭 Meet Mario Gallo Bestino", [
-    "Creative Direction & UI/UX",
-    "Theatrical approach to design",
-    "Speaks: 'Magnifique!', 'Bravissimo!'",
-    "Makes every interface a masterpiece!"
-])
-
-# Frame 7: Meet Noel
-create_frame(7, "🗡️ Meet Noel", [
-    "Quality Assurance & Testing",
-    "Critical analysis and debugging",
-    "Speaks: '*smirks*', 'Predictable...'",
-    "Ensures code quality and reliability!"
-])
-
-# Frame 8: Meet Glam
-create_frame(8, "🎸 Meet Glam Americano", [
-    "Security & Ethics (Spanish)",
-    "Street-smart problem solving",
-    "Speaks: '¡Oye, weon!', '¡Increíble!'",
-    "Keeps your code secure and ethical!"
-])
-
-# Frame 9: Meet Hannibal
-create_frame(9, "🧠 Meet Dr. Hannibal Lecter", [
-    "Deep Forensic Analysis",
-    "Pattern recognition expert",
-    "Speaks: 'Quid pro quo...', 'Fascinating...'",
-    "Analyzes complex architectures!"
-])
-
-# Frame 10: Meet Tetora
-create_frame(10, "🧠 Meet Tetora", [
-    "Multi-Perspective Integration",
-    "Handles identity management",
-    "Speaks: '[Fragment]:', 'Multiple views...'",
-    "Synthesizes different viewpoints!"
-])
-
-# Frame 11: Use Case - Code Review
-create_frame(11, "Use Case: Code Review", [
-    "All six personalities analyze your code:",
-    "🐾 Technical optimization",
-    "🎭 User experience improvements",
-    "🗡️ Quality and testing gaps",
-    "🎸 Security vulnerabilities",
-    "🧠 Architecture patterns"
-])
-
-# Frame 12: Use Case - Problem Solving
-create_frame(12, "Use Case: Creative Problem Solving", [
-    "Six unique approaches to every challenge:",
-    "Technical + Creative + Critical",
-    "Security + Analysis + Integration",
-    "Get comprehensive solutions!"
-])
-
-# Frame 13: Benefits
-create_frame(13, "Key Benefits", [
-    "✨ 6 unique perspectives on every problem",
-    "✨ Comprehensive analysis and solutions",
-    "✨ Built-in quality assurance",
-    "✨ Entertainment while coding",
-    "✨ Never miss important considerations"
-])
-
-# Frame 14: Community
-create_frame(14, "Join the Community", [
-    "📦 NPM: mcp-six-personalities",
-    "🐙 GitHub: Open source & contributions welcome",
-    "💬 Issues & feedback appreciated",
-    "⭐ Star the repo if you like it!"
-])
-
-# Frame 15: Call to Action
-create_frame(15, "Install Now!", [
-    "Transform your Claude Desktop today!",
-    "",
-    "Get six AI personalities working for you!"
-], "npm install -g mcp-six-personalities")
-
-# Frame 16: End Screen
-create_frame(16, "Thanks for Watching!", [
-    "Like 👍 Subscribe 🔔 Share 📤",
-    "",
-    "See you in the next video!",
-    "🐾🎭🗡️🎸🧠🧠"
-])
-
-print(f"\n✨ Successfully generated 16 frames in {output_dir}")
-print("Ready to create video with advanced-video-maker.sh!")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,30 @@
 Generates vertical frames for a 30-second YouTube Short
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageColor
+import argparse
+import copy
 import os
-import random
 import math
+import shutil
+import sys
+import time
+from functools import lru_cache
 
-# Output directory
+import numpy as np
+
+from neko_render import cache as render_cache
+from neko_render import effects, fonts, framering, glyphs, layers, memory, parallel, polar, profiling, scene, seeding, shaping, sinks, timeline, writer
+from neko_render import layout as layouts
+
+# Output directory (created by main(), not at import time)
 output_dir = "/home/wakibaka/Documents/github/claude-operations/neko-tv-short-frames"
-os.makedirs(output_dir, exist_ok=True)
 
-# YouTube Short dimensions (vertical)
+# YouTube Short dimensions (vertical); scenes are laid out in these design
+# units and render at any size of the same aspect (see neko_render.layout)
 WIDTH = 1080
 HEIGHT = 1920
+DESIGN = layouts.Layout((WIDTH, HEIGHT))
 
 # TV style colors
 COLORS = {
@@ -34,198 +46,232 @@ COLORS = {
     'white': '#FFFFFF'
 }
 
-def add_tv_static(img, intensity=0.1):
-    """Add TV static noise effect"""
-    draw = ImageDraw.Draw(img)
-    for _ in range(int(WIDTH * HEIGHT * intensity)):
-        x = random.randint(0, WIDTH-1)
-        y = random.randint(0, HEIGHT-1)
-        gray = random.randint(200, 255)
-        draw.point((x, y), fill=(gray, gray, gray, 100))
-    return img
-
-def add_scan_lines(img):
-    """Add CRT TV scan lines"""
-    draw = ImageDraw.Draw(img)
-    for y in range(0, HEIGHT, 4):
-        draw.rectangle([0, y, WIDTH, y+1], fill=(0, 0, 0, 50))
-    return img
-
-def add_vhs_glitch(img, intensity=5):
-    """Add VHS glitch effect"""
-    draw = ImageDraw.Draw(img)
-    for _ in range(intensity):
-        y = random.randint(0, HEIGHT-50)
-        height = random.randint(5, 20)
-        offset = random.randint(-50, 50)
-
-        # Create glitch band
-        glitch_band = img.crop((0, y, WIDTH, y + height))
-        img.paste(glitch_band, (offset, y))
-
-        # Add color aberration
-        if random.random() > 0.5:
-            draw.rectangle([0, y, WIDTH, y + height], fill=(255, 0, 255, 30))
-
-    return img
-
-def create_gradient_bg(color1, color2):
-    """Create gradient background"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), color1)
-    draw = ImageDraw.Draw(img)
+def add_tv_static(img, intensity=0.1, rng=0):
+    """Add TV static noise effect (vectorized, alpha-blended); rng: FrameRandom, Generator or seed"""
+    return effects.add_tv_static(img, intensity, rng)
 
-    r1, g1, b1 = Image.new('RGB', (1, 1), color1).getpixel((0, 0))
-    r2, g2, b2 = Image.new('RGB', (1, 1), color2).getpixel((0, 0))
+def scan_lines(layout=DESIGN):
+    """CRT TV scan-line overlay for Scene.render() (cached layer)"""
+    return layers.scaled_scan_lines(layout)
 
-    for y in range(HEIGHT):
-        ratio = y / HEIGHT
-        r = int(r1 + (r2 - r1) * ratio)
-        g = int(g1 + (g2 - g1) * ratio)
-        b = int(b1 + (b2 - b1) * ratio)
-        draw.rectangle([0, y, WIDTH, y+1], fill=(r, g, b))
+def add_vhs_glitch(img, intensity=5, rng=0, layout=DESIGN):
+    """Add VHS glitch effect (band displacement, RGB split, blended tint); rng as add_tv_static"""
+    return effects.vhs_glitch(img, bands=intensity, rng=rng, scale=layout.scale)
 
-    return img
+def create_gradient_bg(color1, color2, layout=DESIGN):
+    """Create gradient background (a copy of the cached layer, free to draw on)"""
+    return layers.gradient(color1, color2, layout.size).copy()
 
 def draw_text_with_outline(draw, pos, text, fill='white', outline='black', font_size=60):
-    """Draw text with outline for better visibility"""
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
-
-    x, y = pos
+    """Draw text with outline for better visibility (cached font and masks)"""
+    fonts.draw_text_with_outline(draw, pos, text, fill, outline, font_size)
+
+def text(name, pos, label, fill='white', outline='black', font_size=60, visible=True):
+    """Outlined text node (rasterized once into a small cached tile)"""
+    return scene.TextNode(name, pos, label, fill, outline, font_size, visible)
+
+def shapes(name, paint, key=None, visible=True):
+    """Shape node: paint(draw) in frame coordinates, rasterized once into a tile"""
+    return scene.Node(name, paint, key=key, visible=visible)
+
+def new_scene(background, *nodes):
+    graph = scene.Scene(DESIGN, background)
+    for node in nodes:
+        graph.add(node)
+    return graph
+
+def finish(graph, overlay=None, glitch=0, rng=None, layout=None):
+    """Draw a scene graph once into its RGB frame, then VHS-glitch it in place
+
+    overlay(layout) gives the overlay (e.g. scan_lines). layout is the
+    output Layout (native by default), or a list of them: the graph built
+    once is laid out at each size, every size gets the same glitch draws,
+    and a list of frames comes back.
+    A still is drawn once, so nodes paint straight onto the frame (no
+    tiles, see Scene.draw). Normally a fresh image; in lean mode (--lean)
+    the worker's reused frame buffer, so save it before rendering the
+    next frame.
+    """
+    if isinstance(layout, list):
+        frames = []
+        for one in layout:
+            img = finish(graph, overlay, glitch, copy.deepcopy(rng), one)
+            frames.append(img.copy() if memory.lean() else img)
+        return frames
+    graph = graph.at(layout)
+    overlay = overlay(graph.layout) if overlay else None
+    img = graph.draw(memory.frame_buffer(graph.size) if memory.lean() else None, overlay)
+    if glitch:
+        add_vhs_glitch(img, glitch, rng, graph.layout)
+    return img
 
-    # Draw outline
-    for adj_x in [-3, 0, 3]:
-        for adj_y in [-3, 0, 3]:
-            if adj_x != 0 or adj_y != 0:
-                draw.text((x + adj_x, y + adj_y), text, font=font, fill=outline)
+def gradient_bg(color1, color2):
+    """Gradient background(layout) (shared cached layer; scenes only crop it)"""
+    return lambda layout: layers.gradient(color1, color2, layout.size)
 
-    # Draw main text
-    draw.text((x, y), text, font=font, fill=fill)
+def solid_bg(color):
+    """Solid background(layout)"""
+    return lambda layout: layers.LAYER_CACHE.get(("solid", color) + layout.size,
+                                                 lambda: Image.new('RGBA', layout.size, color))
 
-def generate_frame_01_tv_logo():
+def scene_01_tv_logo(rng=None):
     """Frame 1: TV Static → NEKO-ARC TV Logo"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), 'black')
-    draw = ImageDraw.Draw(img)
-
-    # Add heavy static
-    img = add_tv_static(img, 0.5)
-
-    # NEKO-ARC TV logo
-    draw_text_with_outline(draw, (WIDTH//2 - 300, HEIGHT//2 - 100),
-                           "NEKO-ARC", COLORS['hot_pink'], 'black', 120)
-    draw_text_with_outline(draw, (WIDTH//2 - 100, HEIGHT//2 + 50),
-                           "TV", COLORS['electric_blue'], 'black', 150)
-
-    # Breaking news banner
-    draw.rectangle([0, HEIGHT - 300, WIDTH, HEIGHT - 100], fill=COLORS['emergency_red'])
-    draw_text_with_outline(draw, (50, HEIGHT - 250),
-                           "BREAKING NEWS!", 'white', 'black', 80)
-
-    img = add_scan_lines(img)
-    img = add_vhs_glitch(img, 3)
+    # Heavy static on a black screen is the background; its noise seed is
+    # drawn now, so every output size shares it (and a re-render reuses it)
+    noise = seeding.frame_random(rng).integers(2 ** 63)
+
+    def static(layout):
+        return layers.LAYER_CACHE.get(
+            ("tv_static_noise", int(noise)) + layout.size,
+            lambda: add_tv_static(Image.new('RGBA', layout.size, 'black'), 0.5, noise))
+
+    def banner(draw):
+        draw.rectangle([0, HEIGHT - 300, WIDTH, HEIGHT - 100], fill=COLORS['emergency_red'])
+
+    return new_scene(
+        static,
+        # NEKO-ARC TV logo
+        text('logo', (WIDTH//2 - 300, HEIGHT//2 - 100), "NEKO-ARC", COLORS['hot_pink'], 'black', 120),
+        text('tv', (WIDTH//2 - 100, HEIGHT//2 + 50), "TV", COLORS['electric_blue'], 'black', 150),
+        # Breaking news banner
+        shapes('banner', banner),
+        text('breaking', (50, HEIGHT - 250), "BREAKING NEWS!", 'white', 'black', 80))
+
+def generate_frame_01_tv_logo(rng=None, layout=None):
+    """Frame 1: TV Static → NEKO-ARC TV Logo"""
+    rng = seeding.frame_random(rng)
+    img = finish(scene_01_tv_logo(rng), scan_lines, glitch=3, rng=rng, layout=layout)
 
     return img
 
-def generate_frame_02_news_desk():
+def scene_02_news_desk(rng=None):
     """Frame 2: News Desk with Breaking Banner"""
-    img = create_gradient_bg(COLORS['neko_purple'], COLORS['mario_gold'])
-    draw = ImageDraw.Draw(img)
-
-    # News desk
-    draw.rectangle([0, HEIGHT - 600, WIDTH, HEIGHT], fill=COLORS['hannibal_gray'])
-
-    # Neko-Arc at desk (simplified character)
-    draw.ellipse([WIDTH//2 - 150, HEIGHT - 900, WIDTH//2 + 150, HEIGHT - 600],
-                 fill=COLORS['neko_purple'])
-    # Cat ears
-    draw.polygon([(WIDTH//2 - 150, HEIGHT - 850), (WIDTH//2 - 100, HEIGHT - 950),
-                  (WIDTH//2 - 50, HEIGHT - 850)], fill=COLORS['neko_purple'])
-    draw.polygon([(WIDTH//2 + 50, HEIGHT - 850), (WIDTH//2 + 100, HEIGHT - 950),
-                  (WIDTH//2 + 150, HEIGHT - 850)], fill=COLORS['neko_purple'])
-
-    # Breaking banner
-    draw.rectangle([0, 100, WIDTH, 300], fill=COLORS['emergency_red'])
-    draw_text_with_outline(draw, (50, 150), "🚨 BREAKING 🚨", 'white', 'black', 80)
-
-    # Scrolling text area
-    draw.rectangle([0, HEIGHT - 200, WIDTH, HEIGHT], fill='black')
-    draw_text_with_outline(draw, (50, HEIGHT - 150),
-                           "NEW AI REVOLUTION", COLORS['lime_green'], 'black', 60)
-
-    img = add_scan_lines(img)
+    def desk(draw):
+        # News desk
+        draw.rectangle([0, HEIGHT - 600, WIDTH, HEIGHT], fill=COLORS['hannibal_gray'])
+
+        # Neko-Arc at desk (simplified character)
+        draw.ellipse([WIDTH//2 - 150, HEIGHT - 900, WIDTH//2 + 150, HEIGHT - 600],
+                     fill=COLORS['neko_purple'])
+        # Cat ears
+        draw.polygon([(WIDTH//2 - 150, HEIGHT - 850), (WIDTH//2 - 100, HEIGHT - 950),
+                      (WIDTH//2 - 50, HEIGHT - 850)], fill=COLORS['neko_purple'])
+        draw.polygon([(WIDTH//2 + 50, HEIGHT - 850), (WIDTH//2 + 100, HEIGHT - 950),
+                      (WIDTH//2 + 150, HEIGHT - 850)], fill=COLORS['neko_purple'])
+
+        # Breaking banner
+        draw.rectangle([0, 100, WIDTH, 300], fill=COLORS['emergency_red'])
+
+    def ticker(draw):
+        # Scrolling text area
+        draw.rectangle([0, HEIGHT - 200, WIDTH, HEIGHT], fill='black')
+
+    return new_scene(
+        gradient_bg(COLORS['neko_purple'], COLORS['mario_gold']),
+        shapes('desk', desk),
+        text('breaking', (50, 150), "🚨 BREAKING 🚨", 'white', 'black', 80),
+        shapes('ticker', ticker),
+        text('headline', (50, HEIGHT - 150), "NEW AI REVOLUTION", COLORS['lime_green'], 'black', 60))
+
+def generate_frame_02_news_desk(rng=None, layout=None):
+    """Frame 2: News Desk with Breaking Banner"""
+    rng = seeding.frame_random(rng)
+    img = finish(scene_02_news_desk(rng), scan_lines, layout=layout)
 
     return img
 
-def generate_frame_03_explosion():
+EXPLOSION_STEPS = 10  # rays turn one ray spacing in 10 steps, so a cycle is 10 cached backgrounds
+
+def explosion_background(step=0):
+    """Rays and banded core on red as background(layout), cached per step and size
+
+    Each step (0..EXPLOSION_STEPS-1) turns the 24 rays a tenth of their
+    spacing and pushes the core's bands a tenth of their period outwards.
+    """
+    def background(layout):
+        def build():
+            grid = polar.layout_grid(layout, (WIDTH//2, HEIGHT//2))
+            gold, red = ImageColor.getrgb(COLORS['mario_gold']), ImageColor.getrgb(COLORS['emergency_red'])
+            # 50 px bands, alternating red and gold outwards from the center
+            palette = np.asarray([red, gold], dtype=np.float32)
+            core = palette[polar.bands(grid, 50, offset=step * 100 / EXPLOSION_STEPS) % 2]
+            burst = polar.layer(layout.size, [
+                (polar.rays(grid, 24, 3, phase=step * 15 / EXPLOSION_STEPS, length=1000), gold),
+                (polar.disc(grid, 500), core)])
+            return Image.alpha_composite(solid_bg(COLORS['emergency_red'])(layout), burst)
+        return layers.LAYER_CACHE.get(("explosion_background", step) + layout.size, build)
+    return background
+
+def scene_03_explosion(rng=None):
+    """Frame 3: Explosion Transition (rays at step 0)"""
+    return new_scene(
+        # The burst spans the whole frame, so it is the background
+        explosion_background(0),
+        # BOOM text
+        text('boom', (WIDTH//2 - 200, HEIGHT//2 - 100), "💥BOOM!💥", 'white', 'black', 120))
+
+def generate_frame_03_explosion(rng=None, layout=None):
     """Frame 3: Explosion Transition"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), COLORS['emergency_red'])
-    draw = ImageDraw.Draw(img)
-
-    # Explosion rays
-    center_x, center_y = WIDTH//2, HEIGHT//2
-    for angle in range(0, 360, 15):
-        end_x = center_x + int(1000 * math.cos(math.radians(angle)))
-        end_y = center_y + int(1000 * math.sin(math.radians(angle)))
-        draw.polygon([(center_x, center_y),
-                     (end_x - 50, end_y - 50),
-                     (end_x + 50, end_y + 50)],
-                    fill=COLORS['mario_gold'])
-
-    # Central explosion
-    for r in range(500, 0, -50):
-        color = COLORS['mario_gold'] if r % 100 == 0 else COLORS['emergency_red']
-        draw.ellipse([center_x - r, center_y - r, center_x + r, center_y + r],
-                     fill=color)
-
-    # BOOM text
-    draw_text_with_outline(draw, (WIDTH//2 - 200, HEIGHT//2 - 100),
-                           "💥BOOM!💥", 'white', 'black', 120)
-
-    img = add_vhs_glitch(img, 10)
+    rng = seeding.frame_random(rng)
+    img = finish(scene_03_explosion(rng), glitch=10, rng=rng, layout=layout)
 
     return img
 
-def generate_frame_04_npm_install():
+# Matrix rain grid cell (px) and falling-column steps per second in timeline mode
+RAIN_CELL = (30, 40)
+RAIN_STEPS_PER_SECOND = 15
+
+def draw_cursor(draw):
+    """Terminal cursor block"""
+    draw.rectangle([WIDTH - 150, HEIGHT//2, WIDTH - 130, HEIGHT//2 + 50],
+                  fill=COLORS['lime_green'])
+
+def scene_04_npm_install(rng=None):
+    """Frame 4: NPM Install Command (cursor node starts visible)"""
+    # Matrix rain: a still grid fading down the screen, blitted from the glyph
+    # atlas; in timeline mode the node switches to falling columns
+    rng = seeding.frame_random(rng)
+    blank = len(glyphs.MATRIX_CHARS)
+    rows, cols = glyphs.grid_shape((WIDTH, HEIGHT), RAIN_CELL)
+    shown = np.asarray(rng.random(rows * cols)).reshape(rows, cols) > 0.3
+    chars = np.asarray(rng.integers(blank, size=rows * cols)).reshape(rows, cols)
+    fade = (255 * (1 - np.arange(rows)[:, None] * RAIN_CELL[1] / HEIGHT)).astype(int)
+    falling = glyphs.MatrixRain((WIDTH, HEIGHT), rng, RAIN_CELL)
+
+    def still(layout):
+        atlas = glyphs.atlas(glyphs.MATRIX_CHARS, RAIN_CELL, layout=layout)
+        return atlas.render(layout.size, np.where(shown, chars, blank), fade, (0, 255, 0))
+
+    def terminal(draw):
+        # Terminal window
+        draw.rectangle([50, HEIGHT//2 - 200, WIDTH - 50, HEIGHT//2 + 200],
+                       fill=(20, 20, 20, 200))
+        draw.rectangle([50, HEIGHT//2 - 200, WIDTH - 50, HEIGHT//2 - 150],
+                       fill=COLORS['hannibal_gray'])
+
+    return new_scene(
+        solid_bg('black'),
+        scene.AnimatedImageNode('matrix_rain', still, falling.frame),
+        shapes('terminal', terminal),
+        # Terminal text
+        text('command', (100, HEIGHT//2 - 100), "$ npm install -g", COLORS['lime_green'], 'black', 50),
+        text('package', (100, HEIGHT//2), "mcp-six-personalities", COLORS['electric_blue'], 'black', 50),
+        shapes('cursor', draw_cursor))
+
+def generate_frame_04_npm_install(rng=None, layout=None):
     """Frame 4: NPM Install Command"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), 'black')
-    draw = ImageDraw.Draw(img)
-
-    # Matrix rain effect
-    for x in range(0, WIDTH, 30):
-        for y in range(0, HEIGHT, 40):
-            if random.random() > 0.3:
-                char = random.choice(['0', '1', 'ネ', 'コ', '猫'])
-                opacity = int(255 * (1 - y/HEIGHT))
-                draw.text((x, y), char, fill=(0, 255, 0, opacity))
-
-    # Terminal window
-    draw.rectangle([50, HEIGHT//2 - 200, WIDTH - 50, HEIGHT//2 + 200],
-                   fill=(20, 20, 20, 200))
-    draw.rectangle([50, HEIGHT//2 - 200, WIDTH - 50, HEIGHT//2 - 150],
-                   fill=COLORS['hannibal_gray'])
-
-    # Terminal text
-    draw_text_with_outline(draw, (100, HEIGHT//2 - 100),
-                           "$ npm install -g", COLORS['lime_green'], 'black', 50)
-    draw_text_with_outline(draw, (100, HEIGHT//2),
-                           "mcp-six-personalities", COLORS['electric_blue'], 'black', 50)
+    rng = seeding.frame_random(rng)
+    graph = scene_04_npm_install(rng)
 
     # Blinking cursor
-    if random.random() > 0.5:
-        draw.rectangle([WIDTH - 150, HEIGHT//2, WIDTH - 130, HEIGHT//2 + 50],
-                      fill=COLORS['lime_green'])
+    graph.update('cursor', visible=rng.random() > 0.5)
 
-    img = add_scan_lines(img)
+    img = finish(graph, scan_lines, layout=layout)
 
     return img
 
-def generate_frame_05_split_screen():
+def scene_05_split_screen(rng=None):
     """Frame 5: 6-way split screen personalities"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), 'black')
-    draw = ImageDraw.Draw(img)
-
     personalities = [
         ('NEKO', COLORS['neko_purple'], "I code!"),
         ('MARIO', COLORS['mario_gold'], "I create!"),
@@ -239,79 +285,80 @@ def generate_frame_05_split_screen():
     cell_width = WIDTH // 2
     cell_height = HEIGHT // 3
 
+    def cell(x, y, color):
+        # Draw cell with border
+        return lambda draw: draw.rectangle([x + 5, y + 5, x + cell_width - 5, y + cell_height - 5],
+                                           fill=color, outline='white', width=3)
+
+    def dividers(draw):
+        # Center dividers
+        draw.line([(WIDTH//2, 0), (WIDTH//2, HEIGHT)], fill='white', width=5)
+        draw.line([(0, HEIGHT//3), (WIDTH, HEIGHT//3)], fill='white', width=5)
+        draw.line([(0, 2*HEIGHT//3), (WIDTH, 2*HEIGHT//3)], fill='white', width=5)
+
+    graph = new_scene(solid_bg('black'))
     for i, (name, color, quote) in enumerate(personalities):
         x = (i % 2) * cell_width
         y = (i // 2) * cell_height
-
-        # Draw cell with border
-        draw.rectangle([x + 5, y + 5, x + cell_width - 5, y + cell_height - 5],
-                      fill=color, outline='white', width=3)
-
+        graph.add(shapes(f'cell_{i}', cell(x, y, color)))
         # Personality name
-        draw_text_with_outline(draw, (x + 50, y + 50), name, 'white', 'black', 40)
-
+        graph.add(text(f'name_{i}', (x + 50, y + 50), name, 'white', 'black', 40))
         # Quote
-        draw_text_with_outline(draw, (x + 50, y + cell_height - 100),
-                              quote, 'white', 'black', 30)
+        graph.add(text(f'quote_{i}', (x + 50, y + cell_height - 100), quote, 'white', 'black', 30))
+    graph.add(shapes('dividers', dividers))
 
-    # Center dividers
-    draw.line([(WIDTH//2, 0), (WIDTH//2, HEIGHT)], fill='white', width=5)
-    draw.line([(0, HEIGHT//3), (WIDTH, HEIGHT//3)], fill='white', width=5)
-    draw.line([(0, 2*HEIGHT//3), (WIDTH, 2*HEIGHT//3)], fill='white', width=5)
+    return graph
 
-    img = add_vhs_glitch(img, 2)
+def generate_frame_05_split_screen(rng=None, layout=None):
+    """Frame 5: 6-way split screen personalities"""
+    rng = seeding.frame_random(rng)
+    img = finish(scene_05_split_screen(rng), glitch=2, rng=rng, layout=layout)
 
     return img
 
-def generate_frame_06_collaboration():
+def scene_06_collaboration(rng=None):
     """Frame 6: Collaboration Animation"""
-    img = create_gradient_bg(COLORS['electric_blue'], COLORS['hot_pink'])
-    draw = ImageDraw.Draw(img)
-
     # Energy burst from center
     center_x, center_y = WIDTH//2, HEIGHT//2
 
-    # Draw energy rings
-    for r in range(50, 500, 50):
-        opacity = int(255 * (1 - r/500))
-        draw.ellipse([center_x - r, center_y - r, center_x + r, center_y + r],
-                     outline=(255, 255, 255, opacity), width=10)
-
-    # Central merge point
-    draw.ellipse([center_x - 100, center_y - 100, center_x + 100, center_y + 100],
-                 fill='white')
-
-    # ULTIMATE COLLABORATION text
-    draw_text_with_outline(draw, (WIDTH//2 - 400, 200),
-                           "ULTIMATE", COLORS['emergency_red'], 'white', 100)
-    draw_text_with_outline(draw, (WIDTH//2 - 450, 350),
-                           "COLLABORATION", COLORS['emergency_red'], 'white', 80)
-
-    # Power level indicator
-    draw.rectangle([100, HEIGHT - 400, WIDTH - 100, HEIGHT - 300],
-                   outline='white', width=5)
-    draw.rectangle([100, HEIGHT - 400, WIDTH - 100, HEIGHT - 300],
-                   fill=COLORS['lime_green'])
-    draw_text_with_outline(draw, (WIDTH//2 - 200, HEIGHT - 380),
-                           "POWER: 9999", 'white', 'black', 50)
-
-    img = add_scan_lines(img)
-    img = add_vhs_glitch(img, 5)
+    def energy(layout):
+        # Energy rings fading out (translucent over the gradient), then the central merge point
+        def build():
+            grid = polar.layout_grid(layout, (500, 500), (1000, 1000))
+            return polar.layer(grid.size, [
+                (polar.rings(grid, 50, 500, 50, 10, alpha=lambda r: int(255 * (1 - r/500)) / 255), 'white'),
+                (polar.disc(grid, 100), 'white')])
+        return layers.LAYER_CACHE.get(("energy_rings",) + layout.size, build)
+
+    def power_bar(draw):
+        # Power level indicator
+        draw.rectangle([100, HEIGHT - 400, WIDTH - 100, HEIGHT - 300],
+                       outline='white', width=5)
+        draw.rectangle([100, HEIGHT - 400, WIDTH - 100, HEIGHT - 300],
+                       fill=COLORS['lime_green'])
+
+    return new_scene(
+        gradient_bg(COLORS['electric_blue'], COLORS['hot_pink']),
+        scene.ImageNode('energy', energy, (center_x - 500, center_y - 500)),
+        # ULTIMATE COLLABORATION text
+        text('ultimate', (WIDTH//2 - 400, 200), "ULTIMATE", COLORS['emergency_red'], 'white', 100),
+        text('collaboration', (WIDTH//2 - 450, 350), "COLLABORATION", COLORS['emergency_red'], 'white', 80),
+        shapes('power_bar', power_bar),
+        text('power', (WIDTH//2 - 200, HEIGHT - 380), "POWER: 9999", 'white', 'black', 50))
+
+def generate_frame_06_collaboration(rng=None, layout=None):
+    """Frame 6: Collaboration Animation"""
+    rng = seeding.frame_random(rng)
+    img = finish(scene_06_collaboration(rng), scan_lines, glitch=5, rng=rng, layout=layout)
 
     return img
 
-def generate_frame_07_features():
-    """Frame 7: Feature List Arcade Style"""
-    img = create_gradient_bg(COLORS['hannibal_gray'], COLORS['neko_purple'])
-    draw = ImageDraw.Draw(img)
-
-    # Arcade cabinet frame
-    draw.rectangle([50, 50, WIDTH - 50, HEIGHT - 50],
-                   outline=COLORS['mario_gold'], width=10)
-
-    # Title
-    draw_text_with_outline(draw, (WIDTH//2 - 250, 150),
-                           "FEATURES", COLORS['mario_gold'], 'black', 100)
+def scene_07_features(rng=None):
+    """Frame 7: Feature List Arcade Style (INSERT COIN node starts visible)"""
+    def cabinet(draw):
+        # Arcade cabinet frame
+        draw.rectangle([50, 50, WIDTH - 50, HEIGHT - 50],
+                       outline=COLORS['mario_gold'], width=10)
 
     features = [
         "✅ 6 UNIQUE AIs",
@@ -321,197 +368,596 @@ def generate_frame_07_features():
         "✅ PRODUCTION READY"
     ]
 
-    y_pos = 400
-    for feature in features:
+    def coin(y_pos):
         # Coin icon
-        draw.ellipse([150, y_pos, 230, y_pos + 80], fill=COLORS['mario_gold'])
+        return lambda draw: draw.ellipse([150, y_pos, 230, y_pos + 80], fill=COLORS['mario_gold'])
+
+    graph = new_scene(
+        gradient_bg(COLORS['hannibal_gray'], COLORS['neko_purple']),
+        shapes('cabinet', cabinet),
+        # Title
+        text('title', (WIDTH//2 - 250, 150), "FEATURES", COLORS['mario_gold'], 'black', 100))
 
+    y_pos = 400
+    for i, feature in enumerate(features):
+        graph.add(shapes(f'coin_{i}', coin(y_pos)))
         # Feature text
-        draw_text_with_outline(draw, (300, y_pos + 10),
-                              feature, 'white', 'black', 60)
+        graph.add(text(f'feature_{i}', (300, y_pos + 10), feature, 'white', 'black', 60))
         y_pos += 150
 
+    graph.add(text('insert_coin', (WIDTH//2 - 200, HEIGHT - 200),
+                   "INSERT COIN", COLORS['emergency_red'], 'black', 60))
+    return graph
+
+def generate_frame_07_features(rng=None, layout=None):
+    """Frame 7: Feature List Arcade Style"""
+    rng = seeding.frame_random(rng)
+    graph = scene_07_features(rng)
+
     # INSERT COIN blink
-    if random.random() > 0.5:
-        draw_text_with_outline(draw, (WIDTH//2 - 200, HEIGHT - 200),
-                              "INSERT COIN", COLORS['emergency_red'], 'black', 60)
+    graph.update('insert_coin', visible=rng.random() > 0.5)
 
-    img = add_scan_lines(img)
+    img = finish(graph, scan_lines, layout=layout)
 
     return img
 
-def generate_frame_08_battle_mode():
+def scene_08_battle_mode(rng=None):
+    """Frame 8: Fighting Game VS Screen"""
+    # Lightning background: bolts are picked now, so painting the node is repeatable
+    rng = seeding.frame_random(rng)
+    start_x = rng.integers(0, WIDTH + 1, 20)
+    end_x = rng.integers(0, WIDTH + 1, 20)
+    widths = rng.integers(1, 6, 20)
+    bolts = [([(int(x0), 0), (int(x1), HEIGHT)], int(w)) for x0, x1, w in zip(start_x, end_x, widths)]
+
+    def lightning(draw):
+        for line, width in bolts:
+            draw.line(line, fill=COLORS['electric_blue'], width=width)
+
+    def noel(draw):
+        # Noel (left)
+        draw.rectangle([50, HEIGHT//2 - 400, 450, HEIGHT//2 - 100],
+                       fill=COLORS['noel_blue'])
+
+    def glam(draw):
+        # Glam (right)
+        draw.rectangle([WIDTH - 450, HEIGHT//2 + 100, WIDTH - 50, HEIGHT//2 + 400],
+                       fill=COLORS['glam_red'])
+
+    return new_scene(
+        solid_bg('black'),
+        shapes('lightning', lightning),
+        # VS text in center
+        text('vs', (WIDTH//2 - 100, HEIGHT//2 - 100), "VS", COLORS['emergency_red'], 'white', 200),
+        # Character portraits
+        shapes('noel_portrait', noel),
+        text('noel', (100, HEIGHT//2 - 350), "NOEL", 'white', 'black', 60),
+        shapes('glam_portrait', glam),
+        text('glam', (WIDTH - 400, HEIGHT//2 + 150), "GLAM", 'white', 'black', 60),
+        # Battle quotes
+        text('noel_quote', (50, HEIGHT//2 + 500), '"Predictable..."', COLORS['noel_blue'], 'white', 50),
+        text('glam_quote', (WIDTH - 500, HEIGHT//2 - 500), '"¡Cállate weon!"', COLORS['glam_red'], 'white', 50),
+        # FIGHT! text
+        text('fight', (WIDTH//2 - 150, HEIGHT - 300), "FIGHT!", COLORS['mario_gold'], 'black', 120))
+
+def generate_frame_08_battle_mode(rng=None, layout=None):
     """Frame 8: Fighting Game VS Screen"""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), 'black')
-    draw = ImageDraw.Draw(img)
-
-    # Lightning background
-    for _ in range(20):
-        start_x = random.randint(0, WIDTH)
-        start_y = 0
-        end_x = random.randint(0, WIDTH)
-        end_y = HEIGHT
-        draw.line([(start_x, start_y), (end_x, end_y)],
-                 fill=COLORS['electric_blue'], width=random.randint(1, 5))
-
-    # VS text in center
-    draw_text_with_outline(draw, (WIDTH//2 - 100, HEIGHT//2 - 100),
-                           "VS", COLORS['emergency_red'], 'white', 200)
-
-    # Character portraits
-    # Noel (left)
-    draw.rectangle([50, HEIGHT//2 - 400, 450, HEIGHT//2 - 100],
-                   fill=COLORS['noel_blue'])
-    draw_text_with_outline(draw, (100, HEIGHT//2 - 350), "NOEL", 'white', 'black', 60)
-
-    # Glam (right)
-    draw.rectangle([WIDTH - 450, HEIGHT//2 + 100, WIDTH - 50, HEIGHT//2 + 400],
-                   fill=COLORS['glam_red'])
-    draw_text_with_outline(draw, (WIDTH - 400, HEIGHT//2 + 150), "GLAM", 'white', 'black', 60)
-
-    # Battle quotes
-    draw_text_with_outline(draw, (50, HEIGHT//2 + 500),
-                           '"Predictable..."', COLORS['noel_blue'], 'white', 50)
-    draw_text_with_outline(draw, (WIDTH - 500, HEIGHT//2 - 500),
-                           '"¡Cállate weon!"', COLORS['glam_red'], 'white', 50)
-
-    # FIGHT! text
-    draw_text_with_outline(draw, (WIDTH//2 - 150, HEIGHT - 300),
-                           "FIGHT!", COLORS['mario_gold'], 'black', 120)
-
-    img = add_vhs_glitch(img, 8)
+    rng = seeding.frame_random(rng)
+    img = finish(scene_08_battle_mode(rng), glitch=8, rng=rng, layout=layout)
 
     return img
 
-def generate_frame_09_download_counter():
+def scene_09_download_counter(rng=None):
+    """Frame 9: NPM Downloads Counter (counter node starts at 999,999,999)"""
+    def npm_logo(draw):
+        # NPM logo area
+        draw.rectangle([WIDTH//2 - 200, 200, WIDTH//2 + 200, 400],
+                       fill=COLORS['emergency_red'])
+
+    def counter_box(draw):
+        # Download counter
+        draw.rectangle([100, HEIGHT//2 - 150, WIDTH - 100, HEIGHT//2 + 150],
+                       fill='black', outline=COLORS['lime_green'], width=5)
+
+    def arrow(draw):
+        # Rising arrow
+        arrow_points = [(WIDTH - 200, HEIGHT//2),
+                       (WIDTH - 150, HEIGHT//2 - 100),
+                       (WIDTH - 180, HEIGHT//2 - 80),
+                       (WIDTH - 160, HEIGHT//2 - 150),
+                       (WIDTH - 140, HEIGHT//2 - 80),
+                       (WIDTH - 170, HEIGHT//2 - 100),
+                       (WIDTH - 120, HEIGHT//2)]
+        draw.polygon(arrow_points, fill=COLORS['lime_green'])
+
+    return new_scene(
+        gradient_bg('black', COLORS['tetora_green']),
+        shapes('npm_logo', npm_logo),
+        text('npm', (WIDTH//2 - 100, 250), "npm", 'white', 'black', 100),
+        shapes('counter_box', counter_box),
+        # DOWNLOADS text
+        text('downloads', (WIDTH//2 - 200, HEIGHT//2 - 250), "DOWNLOADS", 'white', 'black', 60),
+        shapes('arrow', arrow),
+        # Success message
+        text('viral', (WIDTH//2 - 250, HEIGHT - 400), "GOING VIRAL!", COLORS['emergency_red'], 'white', 80),
+        # Counter digits inside the download box
+        text('counter', (WIDTH//2 - 300, HEIGHT//2 - 50), f"{999_999_999:,}", COLORS['lime_green'], 'black', 80))
+
+def generate_frame_09_download_counter(rng=None, layout=None):
     """Frame 9: NPM Downloads Counter"""
-    img = create_gradient_bg('black', COLORS['tetora_green'])
-    draw = ImageDraw.Draw(img)
-
-    # NPM logo area
-    draw.rectangle([WIDTH//2 - 200, 200, WIDTH//2 + 200, 400],
-                   fill=COLORS['emergency_red'])
-    draw_text_with_outline(draw, (WIDTH//2 - 100, 250), "npm", 'white', 'black', 100)
-
-    # Download counter
-    draw.rectangle([100, HEIGHT//2 - 150, WIDTH - 100, HEIGHT//2 + 150],
-                   fill='black', outline=COLORS['lime_green'], width=5)
-
-    # Counter numbers (simulating rapid increase)
-    number = "999,999,999"
-    draw_text_with_outline(draw, (WIDTH//2 - 300, HEIGHT//2 - 50),
-                           number, COLORS['lime_green'], 'black', 80)
-
-    # DOWNLOADS text
-    draw_text_with_outline(draw, (WIDTH//2 - 200, HEIGHT//2 - 250),
-                           "DOWNLOADS", 'white', 'black', 60)
-
-    # Rising arrow
-    arrow_points = [(WIDTH - 200, HEIGHT//2),
-                   (WIDTH - 150, HEIGHT//2 - 100),
-                   (WIDTH - 180, HEIGHT//2 - 80),
-                   (WIDTH - 160, HEIGHT//2 - 150),
-                   (WIDTH - 140, HEIGHT//2 - 80),
-                   (WIDTH - 170, HEIGHT//2 - 100),
-                   (WIDTH - 120, HEIGHT//2)]
-    draw.polygon(arrow_points, fill=COLORS['lime_green'])
-
-    # Success message
-    draw_text_with_outline(draw, (WIDTH//2 - 250, HEIGHT - 400),
-                           "GOING VIRAL!", COLORS['emergency_red'], 'white', 80)
-
-    img = add_scan_lines(img)
+    rng = seeding.frame_random(rng)
+    img = finish(scene_09_download_counter(rng), scan_lines, layout=layout)
 
     return img
 
-def generate_frame_10_cta():
-    """Frame 10: Final Call to Action"""
-    img = create_gradient_bg(COLORS['hot_pink'], COLORS['electric_blue'])
-    draw = ImageDraw.Draw(img)
-
-    # Pulsing background circles
-    center_x, center_y = WIDTH//2, HEIGHT//2
-    for r in range(100, 1000, 100):
-        opacity = int(100 * (1 - r/1000))
-        draw.ellipse([center_x - r, center_y - r, center_x + r, center_y + r],
-                     outline=(255, 255, 255, opacity), width=20)
+def cta_rings(layout, pulse=0):
+    """Translucent white pulsing circles as an RGBA layer; pulse (0..100 px) pushes every ring outwards"""
+    grid = polar.layout_grid(layout, (WIDTH//2, HEIGHT//2))
+    glow = polar.rings(grid, 100 + pulse, 1000 + pulse, 100, 20,
+                       alpha=lambda r: max(0, int(100 * (1 - r/1000))) / 255)
+    return polar.layer(layout.size, [(glow, 'white')])
+
+def cta_background(pulse=0):
+    """Gradient with the pulsing rings as background(layout); cached per pulse step and size"""
+    def background(layout):
+        def build():
+            img = layers.gradient(COLORS['hot_pink'], COLORS['electric_blue'], layout.size)
+            return Image.alpha_composite(img, cta_rings(layout, pulse))
+        return layers.LAYER_CACHE.get(("cta_background", pulse) + layout.size, build)
+    return background
+
+def scene_10_cta(rng=None):
+    """Frame 10: Final Call to Action (rings at pulse 0)"""
+    center_x = WIDTH//2
+
+    def command_box(draw):
+        # Command in box
+        draw.rectangle([50, HEIGHT//2 - 100, WIDTH - 50, HEIGHT//2 + 200],
+                       fill='black', outline='white', width=10)
+
+    def arrows(draw):
+        # Pointing arrows
+        for angle in range(0, 360, 45):
+            x = center_x + int(600 * math.cos(math.radians(angle)))
+            y = HEIGHT//2 + 50 + int(300 * math.sin(math.radians(angle)))
+
+            # Arrow pointing to center
+            draw.polygon([(x, y), (x - 30, y - 30), (x - 30, y + 30)],
+                        fill=COLORS['mario_gold'])
+
+    # The rings span the whole frame, so they are part of the background
+    graph = new_scene(cta_background(0))
 
     # INSTALL NOW! with glow effect
     for offset in range(20, 0, -5):
         opacity = int(255 * (offset/20))
-        draw_text_with_outline(draw, (WIDTH//2 - 300 - offset//2, 300 - offset//2),
-                              "INSTALL", (255, 255, 0, opacity), None, 120 + offset)
-    draw_text_with_outline(draw, (WIDTH//2 - 300, 300),
-                           "INSTALL", COLORS['emergency_red'], 'white', 120)
-
-    draw_text_with_outline(draw, (WIDTH//2 - 150, 500),
-                           "NOW!", COLORS['emergency_red'], 'white', 120)
-
-    # Command in box
-    draw.rectangle([50, HEIGHT//2 - 100, WIDTH - 50, HEIGHT//2 + 200],
-                   fill='black', outline='white', width=10)
-
-    draw_text_with_outline(draw, (100, HEIGHT//2 - 50),
-                           "npm install -g", COLORS['lime_green'], 'black', 60)
-    draw_text_with_outline(draw, (100, HEIGHT//2 + 50),
-                           "mcp-six-personalities", COLORS['electric_blue'], 'black', 55)
-
-    # Pointing arrows
-    for angle in range(0, 360, 45):
-        x = center_x + int(600 * math.cos(math.radians(angle)))
-        y = HEIGHT//2 + 50 + int(300 * math.sin(math.radians(angle)))
-
-        # Arrow pointing to center
-        draw.polygon([(x, y), (x - 30, y - 30), (x - 30, y + 30)],
-                    fill=COLORS['mario_gold'])
-
-    # Subscribe reminder
-    draw_text_with_outline(draw, (WIDTH//2 - 400, HEIGHT - 300),
-                           "LIKE & SUBSCRIBE!", COLORS['emergency_red'], 'white', 70)
-
-    # Neko signature
-    draw_text_with_outline(draw, (WIDTH//2 - 250, HEIGHT - 150),
-                           "Nyaa~! 🐾", COLORS['neko_purple'], 'white', 80)
-
-    img = add_scan_lines(img)
-    img = add_vhs_glitch(img, 10)
+        graph.add(text(f'glow_{offset}', (WIDTH//2 - 300 - offset//2, 300 - offset//2),
+                       "INSTALL", (255, 255, 0, opacity), None, 120 + offset))
+    for node in (
+            text('install', (WIDTH//2 - 300, 300), "INSTALL", COLORS['emergency_red'], 'white', 120),
+            text('now', (WIDTH//2 - 150, 500), "NOW!", COLORS['emergency_red'], 'white', 120),
+            shapes('command_box', command_box),
+            text('command', (100, HEIGHT//2 - 50), "npm install -g", COLORS['lime_green'], 'black', 60),
+            text('package', (100, HEIGHT//2 + 50), "mcp-six-personalities", COLORS['electric_blue'], 'black', 55),
+            shapes('arrows', arrows),
+            # Subscribe reminder
+            text('subscribe', (WIDTH//2 - 400, HEIGHT - 300), "LIKE & SUBSCRIBE!",
+                 COLORS['emergency_red'], 'white', 70),
+            # Neko signature
+            text('signature', (WIDTH//2 - 250, HEIGHT - 150), "Nyaa~! 🐾", COLORS['neko_purple'], 'white', 80)):
+        graph.add(node)
+    return graph
+
+def generate_frame_10_cta(rng=None, layout=None):
+    """Frame 10: Final Call to Action"""
+    rng = seeding.frame_random(rng)
+    img = finish(scene_10_cta(rng), scan_lines, glitch=10, rng=rng, layout=layout)
 
     return img
 
-def main():
-    """Generate all frames for the YouTube Short"""
-    print("🐾📺 Generating NEKO-ARC TV YouTube Short frames...")
-
-    frames = [
-        ("001_tv_logo", generate_frame_01_tv_logo),
-        ("002_news_desk", generate_frame_02_news_desk),
-        ("003_explosion", generate_frame_03_explosion),
-        ("004_npm_install", generate_frame_04_npm_install),
-        ("005_split_screen", generate_frame_05_split_screen),
-        ("006_collaboration", generate_frame_06_collaboration),
-        ("007_features", generate_frame_07_features),
-        ("008_battle_mode", generate_frame_08_battle_mode),
-        ("009_download_counter", generate_frame_09_download_counter),
-        ("010_cta", generate_frame_10_cta)
-    ]
-
-    # Duplicate frames for timing (3 seconds per frame for 30-second video)
-    expanded_frames = []
-    for name, func in frames:
-        img = func()
-        # Save main frame
-        frame_path = os.path.join(output_dir, f"frame_{name}.png")
-        img.save(frame_path)
-        print(f"✅ Generated: {name}")
-
-        # Create 3 copies for 3-second duration (at 1fps)
-        for i in range(3):
-            expanded_frames.append(frame_path)
-
-    print(f"\n✨ Generated {len(frames)} unique frames")
-    print(f"📺 Total frames for video: {len(expanded_frames)}")
-    print(f"📁 Output directory: {output_dir}")
+FRAMES = [
+    ("001_tv_logo", generate_frame_01_tv_logo),
+    ("002_news_desk", generate_frame_02_news_desk),
+    ("003_explosion", generate_frame_03_explosion),
+    ("004_npm_install", generate_frame_04_npm_install),
+    ("005_split_screen", generate_frame_05_split_screen),
+    ("006_collaboration", generate_frame_06_collaboration),
+    ("007_features", generate_frame_07_features),
+    ("008_battle_mode", generate_frame_08_battle_mode),
+    ("009_download_counter", generate_frame_09_download_counter),
+    ("010_cta", generate_frame_10_cta)
+]
+
+# Each scene is held on screen for this long (30-second short)
+FRAME_DURATION = 3
+VIDEO_FPS = 30
+# Timeline frames per worker task when streaming through the shared-memory ring
+RING_CHUNK = 4
+
+# Timeline mode: animate(graph, t, rng) updates nodes; only their regions are recomposited
+STATIC_VARIANTS = 6
+BLINK_HZ = 2
+PULSE_SPEED = 120  # ring pulse, px per second
+PULSE_STEP = 10  # rings move in 10 px steps, so one pulse cycle is 10 cached backgrounds
+
+def static_screen(variant):
+    """Black screen with heavy static as background(layout), one of STATIC_VARIANTS cached variants"""
+    return lambda layout: layers.LAYER_CACHE.get(
+        ("tv_static_screen", variant) + layout.size,
+        lambda: add_tv_static(Image.new('RGBA', layout.size, 'black'), 0.5, rng=variant))
+
+EXPLOSION_SPIN = 20  # explosion steps per second
+
+def prepare_03_explosion(graph):
+    for step in range(EXPLOSION_STEPS):
+        explosion_background(step)(graph.layout)
+
+def animate_03_explosion(graph, t, rng):
+    # The burst turns and pulses; each step is one cached background under the BOOM tile
+    graph.set_background(explosion_background(int(t * EXPLOSION_SPIN) % EXPLOSION_STEPS))
+
+def prepare_01_tv_logo(graph):
+    for variant in range(STATIC_VARIANTS):
+        static_screen(variant)(graph.layout)
+
+def animate_01_tv_logo(graph, t, rng):
+    # New static behind the logo: the whole frame is dirty, the logo tiles are reused
+    graph.set_background(static_screen(int(rng.integers(STATIC_VARIANTS))))
+
+def blink_on(t):
+    return int(t * BLINK_HZ) % 2 == 0
+
+def animate_04_npm_install(graph, t, rng):
+    graph.update('matrix_rain', step=int(t * RAIN_STEPS_PER_SECOND))
+    graph.update('cursor', visible=blink_on(t))
+
+def animate_07_features(graph, t, rng):
+    graph.update('insert_coin', visible=blink_on(t))
+
+def animate_09_download_counter(graph, t, rng):
+    # Ease-out tick up to 999,999,999 over the scene
+    progress = min(1.0, t / (FRAME_DURATION * 0.8))
+    graph.update('counter', text=f"{int(999_999_999 * (1 - (1 - progress) ** 3)):,}")
+
+def prepare_10_cta(graph):
+    for pulse in range(0, 100, PULSE_STEP):
+        cta_background(pulse)(graph.layout)
+
+def animate_10_cta(graph, t, rng):
+    # The text tiles are reused; each pulse step is one cached background
+    pulse = int(t * PULSE_SPEED) // PULSE_STEP * PULSE_STEP % 100
+    graph.set_background(cta_background(pulse))
+
+ANIMATED_SCENES = [
+    timeline.AnimatedScene("001_tv_logo", scene_01_tv_logo, animate_01_tv_logo, scan_lines=True, glitch=3,
+                           prepare=prepare_01_tv_logo),
+    timeline.AnimatedScene("002_news_desk", scene_02_news_desk, scan_lines=True),
+    timeline.AnimatedScene("003_explosion", scene_03_explosion, animate_03_explosion, glitch=10,
+                           prepare=prepare_03_explosion),
+    timeline.AnimatedScene("004_npm_install", scene_04_npm_install, animate_04_npm_install, scan_lines=True),
+    timeline.AnimatedScene("005_split_screen", scene_05_split_screen, glitch=2),
+    timeline.AnimatedScene("006_collaboration", scene_06_collaboration, scan_lines=True, glitch=5),
+    timeline.AnimatedScene("007_features", scene_07_features, animate_07_features, scan_lines=True),
+    timeline.AnimatedScene("008_battle_mode", scene_08_battle_mode, glitch=8),
+    timeline.AnimatedScene("009_download_counter", scene_09_download_counter,
+                           animate_09_download_counter, scan_lines=True),
+    timeline.AnimatedScene("010_cta", scene_10_cta, animate_10_cta, scan_lines=True, glitch=10,
+                           prepare=prepare_10_cta),
+]
+
+def render_scene(index, seed, rng_kind="python", layout=None):
+    """Render one scene with its own seeded FrameRandom; returns (image, seconds)
+
+    layout: output Layout (native by default), or a list of them for one
+    build rendered at several sizes (the image is then a list too).
+    """
+    name, func = FRAMES[index]
+    start = time.perf_counter()
+    with profiling.span(name, "scene", seed=seed):
+        img = func(seeding.FrameRandom(seed, rng_kind), layout)
+    return img, time.perf_counter() - start
+
+@lru_cache(maxsize=None)
+def renderer_digest():
+    """Source digest of the shared effects every scene goes through"""
+    return render_cache.source_digest(add_tv_static, scan_lines, add_vhs_glitch,
+                                      create_gradient_bg, draw_text_with_outline, text, shapes,
+                                      new_scene, finish, gradient_bg, solid_bg, draw_cursor, cta_rings, cta_background,
+                                      explosion_background, effects, fonts, glyphs, layers, layouts, polar,
+                                      scene, seeding, shaping)
+
+def frame_key(index, seed, rng_kind="python", layout=DESIGN):
+    """Render-cache key: scene source, shared effects, colors, size, font, seed and rng kind"""
+    name, func = FRAMES[index]
+    build = ANIMATED_SCENES[index].build
+    return render_cache.fingerprint("tv-short", name, render_cache.source_digest(func, build),
+                                    renderer_digest(), WIDTH, HEIGHT, layout.size, COLORS, seed, rng_kind,
+                                    render_cache.file_digest(fonts.DEJAVU_BOLD), shaping.signature())
+
+# This process's FrameWriter per writer.options() (pool workers keep theirs)
+frame_writer = writer.shared
+
+def render_frames(index, seed, outputs, cache_dir=None, force=False, writer_options=None,
+                  rng_kind="python"):
+    """Render one scene at one or more sizes (runs inside a pool worker), through the render cache if set
+
+    outputs is [(Layout, out_dir)]. Each size saves frame_<name><ext> into
+    its out_dir in the writer's format and gets its path back, or an RGB
+    image for a streaming sink when out_dir is None. Sizes missing from
+    the cache render from a single build of the scene. Returns one (path
+    or image, seconds, cache_hit, encode_seconds) per output; seconds and
+    encode_seconds are shared evenly.
+    """
+    start = time.perf_counter()
+    store = render_cache.RenderCache(cache_dir, force=force) if cache_dir else None
+    keys = [frame_key(index, seed, rng_kind, layout) if store else None for layout, _ in outputs]
+    cached = [store.get(key) if store else None for key in keys]
+
+    missing = [layout for (layout, _), hit in zip(outputs, cached) if not hit]
+    rendered = {}
+    if missing:
+        rendered = dict(zip(missing, render_scene(index, seed, rng_kind, missing)[0]))
+
+    out = frame_writer(**(writer_options or {}))
+    before = out.encode_seconds
+    name = FRAMES[index][0]
+    frames = []
+    for (layout, out_dir), key, hit in zip(outputs, keys, cached):
+        img = rendered.get(layout)
+        if out_dir is None:
+            if store and img:
+                store.put(key, img)
+            frame = (img or Image.open(hit)).convert('RGB')
+        else:
+            frame = os.path.join(out_dir, f"frame_{name}{out.ext}")
+            if hit and out.copies_png:
+                with profiling.span("copy", "io", frame=name):
+                    shutil.copyfile(hit, frame)
+            else:
+                # Queued first, so the render-cache PNG encodes alongside it
+                out.save(img or Image.open(hit), frame, name)
+                if store and img:
+                    store.put(key, img)
+        frames.append((frame, img is None))
+    out.flush()
+    elapsed = (time.perf_counter() - start) / len(outputs)
+    encode_seconds = (out.encode_seconds - before) / len(outputs)
+    return [(frame, elapsed, hit, encode_seconds) for frame, hit in frames]
+
+def render_frame(index, seed, out_dir=None, cache_dir=None, force=False, writer_options=None,
+                 rng_kind="python", layout=DESIGN):
+    """render_frames() for a single size: returns (path or image, seconds, cache_hit, encode_seconds)"""
+    return render_frames(index, seed, [(layout, out_dir)], cache_dir, force, writer_options, rng_kind)[0]
+
+def render_animated_scene(index, seed, fps, out_dir, writer_options=None, rng_kind="python", layout=DESIGN):
+    """Render every timeline frame of one scene as files (runs inside a pool worker)
+
+    Frames are encoded on the writer's threads while the next ones render.
+    Returns (paths, render seconds per frame, encode seconds).
+    """
+    entry = ANIMATED_SCENES[index]
+    out = frame_writer(**(writer_options or {}))
+    before = out.encode_seconds
+    paths, times = [], []
+    for k, img, elapsed in timeline.render_scene_frames(entry, index, FRAME_DURATION, fps, seed, rng_kind,
+                                                        layout):
+        paths.append(out.save(img, os.path.join(out_dir, f"frame_{entry.name}_{k:04d}{out.ext}"), k))
+        times.append(elapsed)
+    out.flush()
+    return paths, times, out.encode_seconds - before
+
+def render_animated_chunk(ring, slots, index, start, seed, fps, rng_kind="python", layout=DESIGN):
+    """Render timeline frames start... of one scene into shared-memory ring slots (runs inside a pool worker)
+
+    Only the render seconds per frame come back; the pixels stay in the ring.
+    """
+    targets = [framering.slot_image(ring, slot) for slot in slots]
+    return timeline.render_chunk(ANIMATED_SCENES[index], index, start, targets, fps, seed, rng_kind, layout)
+
+def render_timeline(args, jobs, layout, sink, ring=None):
+    """Render every scene's timeline frames into sink; (render seconds per frame, peak RSS per process)
+
+    Returns (None, None) after printing the first failed scene.
+    """
+    per_scene = timeline.frame_count(FRAME_DURATION, args.fps)
+    times, peaks = [], []
+    if args.sink == "png":
+        # Each worker renders and saves a whole scene; only paths come back
+        tasks = [(i, args.seed, args.fps, args.out, writer.options(args), args.rng, layout)
+                 for i in range(len(ANIMATED_SCENES))]
+        for entry, result in zip(ANIMATED_SCENES, parallel.iter_ordered(render_animated_scene, tasks, jobs)):
+            if result.error:
+                print(f"❌ Failed: {entry.name}\n{result.error}")
+                return None, None
+            paths, scene_times, encode_seconds = result.value
+            peaks.append(result.peak_rss_mb)
+            for path in paths:
+                sink.add_file(path, encode_seconds / len(paths))
+            times += scene_times
+            print(f"✅ Animated: {entry.name} ({len(paths)} frames)")
+    elif ring:
+        chunks = [(i, k) for i in range(len(ANIMATED_SCENES)) for k in range(0, per_scene, RING_CHUNK)]
+        tasks = [(min(RING_CHUNK, per_scene - k), (i, k, args.seed, args.fps, args.rng, layout)) for i, k in chunks]
+        for (i, k), (result, slots) in zip(chunks, framering.iter_ring(render_animated_chunk, tasks, ring, jobs)):
+            entry = ANIMATED_SCENES[i]
+            if result.error:
+                print(f"❌ Failed: {entry.name}\n{result.error}")
+                return None, None
+            for n, slot in enumerate(slots, k):
+                sink.write_bytes(f"{entry.name}_{n:04d}", ring.view(slot))
+            times += result.value
+            peaks.append(result.peak_rss_mb)
+            if k + len(slots) == per_scene:
+                print(f"✅ Animated: {entry.name} ({per_scene} frames)")
+    else:
+        for i, entry in enumerate(ANIMATED_SCENES):
+            for k, img, elapsed in timeline.render_scene_frames(entry, i, FRAME_DURATION, args.fps, args.seed,
+                                                                   args.rng, layout):
+                sink.write(f"{entry.name}_{k:04d}", img)
+                times.append(elapsed)
+            print(f"✅ Animated: {entry.name} ({per_scene} frames)")
+        peaks.append(memory.peak_rss_mb())
+    return times, peaks
+
+def main_animated(args, jobs, layout=DESIGN):
+    """Timeline mode: every scene at --fps with animated static, scan lines, counter, rings"""
+    total = timeline.frame_count(FRAME_DURATION, args.fps) * len(ANIMATED_SCENES)
+    print(f"🐾📺 Rendering NEKO-ARC TV timeline: {total} frames at {args.fps} fps, {layout.name} "
+          f"({jobs} job(s), {args.sink} sink)")
+
+    # Streaming from several workers: frames come back through shared memory, not pickles
+    ring = framering.FrameRing(layout.size, RING_CHUNK * (jobs + 1)) if args.sink != "png" and jobs > 1 else None
+    sink = summary = None
+    try:
+        sink = sinks.open_sink(args.sink, args.out, layout.size, [1 / args.fps] * total, args.fps,
+                               video_name="neko_tv_short.mp4",
+                               writer=writer.FrameWriter(**writer.options(args)),
+                               pix_fmt="rgba" if ring else "rgb24")
+        start = time.perf_counter()
+        times, peaks = render_timeline(args, jobs, layout, sink, ring)
+        if times is None:
+            return 1
+        summary = sink.close()
+    finally:
+        # The sink goes first: ffmpeg may still be reading the ring's last slot
+        if sink and summary is None:
+            sink.abort()
+        if ring:
+            ring.close()
+
+    times.sort()
+    stored = f", {summary['frames']} unique stored" if 'timeline_frames' in summary else ""
+    print(f"\n✨ {len(times)} frames in {time.perf_counter() - start:.2f}s{stored}")
+    print(f"⏱️  Render per frame: median {times[len(times)//2] * 1000:.1f} ms, "
+          f"max {times[-1] * 1000:.1f} ms (budget {1000 / args.fps:.1f} ms)")
+    print(f"💾 Bytes written: {summary['bytes_written']:,}")
+    writer.report(summary)
+    if not report_rss(peaks, args.max_rss):
+        return 1
+    print("Nyaa~! TV timeline ready! 🐾")
+    return 0
+
+def report_rss(peaks, max_rss=None):
+    """Print the highest render-process peak RSS; False if it is over max_rss MB"""
+    peak = max(peaks, default=0)
+    print(f"🧠 Peak RSS: {peak:.0f} MB per render process{' (lean)' if memory.lean() else ''}")
+    if max_rss and peak > max_rss:
+        print(f"🙀 Over the {max_rss:.0f} MB memory budget")
+        return False
+    return True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate NEKO-ARC TV YouTube Short frames")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base seed; each frame derives its own seed from it")
+    parser.add_argument("--rng", choices=seeding.KINDS, default="python",
+                        help="random stream behind every effect (numpy: vectorized Generator draws)")
+    parser.add_argument("--out", default=output_dir, help="output directory")
+    parser.add_argument("--sink", choices=["png", "ffmpeg"], default="png",
+                        help="png files + ffconcat timing, or stream straight into ffmpeg")
+    parser.add_argument("--fps", type=int, default=VIDEO_FPS,
+                        help="output video fps (ffmpeg sink) and timeline fps (--animate)")
+    parser.add_argument("--animate", action="store_true",
+                        help="render every scene as an animated timeline at --fps")
+    render_cache.add_arguments(parser)
+    writer.add_arguments(parser)
+    layouts.add_arguments(parser)
+    memory.add_arguments(parser)
+    parser.add_argument("--max-rss", type=float, metavar="MB",
+                        help="exit 1 if any render process peaked above this RSS")
+    profiling.add_arguments(parser)
+    return parser.parse_args(argv)
+
+def main_stills(args, jobs, sizes=(DESIGN,)):
+    """One still per scene, each held FRAME_DURATION seconds
+
+    Several sizes (--resolution 720p,1080p,4k) go into one subdirectory
+    each; every scene is built once per worker task and laid out per size.
+    """
+    cache_dir = None if args.no_cache else args.cache_dir
+    print(f"🐾📺 Generating NEKO-ARC TV YouTube Short frames at {', '.join(size.name for size in sizes)}... "
+          f"({jobs} job(s), {args.sink} sink)")
+
+    durations = [FRAME_DURATION] * len(FRAMES)
+    out_dirs = [args.out] if len(sizes) == 1 else [os.path.join(args.out, size.name) for size in sizes]
+    # PNG sink: workers encode/copy their own files and only paths come back
+    frame_dirs = out_dirs if args.sink == "png" else [None] * len(sizes)
+    tasks = [(i, parallel.frame_seed(args.seed, i), list(zip(sizes, frame_dirs)), cache_dir, args.force,
+              writer.options(args), args.rng) for i in range(len(FRAMES))]
+    start = time.perf_counter()
+
+    failures = hits = 0
+    peaks = []
+    outputs, summaries = [], None
+    try:
+        for size, out_dir in zip(sizes, out_dirs):
+            outputs.append(sinks.open_sink(args.sink, out_dir, size.size, durations, args.fps,
+                                           video_name="neko_tv_short.mp4",
+                                           writer=writer.FrameWriter(**writer.options(args))))
+        for (name, _), result in zip(FRAMES, parallel.iter_ordered(render_frames, tasks, jobs)):
+            if result.error:
+                failures += 1
+                print(f"❌ Failed: {name}\n{result.error}")
+                continue
+            peaks.append(result.peak_rss_mb)
+            for sink, (frame, elapsed, hit, encode_seconds) in zip(outputs, result.value):
+                if args.sink == "png":
+                    sink.add_file(frame, encode_seconds or None)
+                else:
+                    sink.write(name, frame)
+                hits += hit
+            elapsed = sum(value[1] for value in result.value)
+            cached = all(value[2] for value in result.value)
+            print(f"{'♻️ ' if cached else '✅'} {'Cached' if cached else 'Generated'}: {name} ({elapsed:.2f}s)")
+
+        if cache_dir:
+            render_cache.RenderCache(cache_dir, args.cache_size * 1024 * 1024).evict()
+        if failures:
+            print(f"🙀 {failures} frame(s) failed")
+            return 1
+        summaries = [sink.close() for sink in outputs]
+    finally:
+        if summaries is None:
+            # Failed frames or an exception: no ffmpeg is left waiting on its stdin
+            for sink in outputs:
+                sink.abort()
+
+    frames = sum(summary['frames'] for summary in summaries)
+    print(f"\n✨ {frames} unique frames ({hits} from cache) in {time.perf_counter() - start:.2f}s")
+    print(f"⏱️  Each held {FRAME_DURATION}s, {sum(durations)}s total")
+    for size, summary in zip(sizes, summaries):
+        print(f"💾 {size.name}: {summary['bytes_written']:,} bytes written")
+        writer.report(summary)
+        print(f"📁 Output: {', '.join(summary.get('timing') or summary['outputs'][-1:])}")
+    if not report_rss(peaks, args.max_rss):
+        return 1
     print("Nyaa~! TV frames ready for video creation! 🐾")
+    return 0
+
+def main(argv=None):
+    """Generate all frames for the YouTube Short"""
+    args = parse_args(argv)
+    if args.profile:
+        profiling.enable(args.profile)
+    if args.lean:
+        memory.enable_lean()
+    jobs = args.jobs or parallel.default_jobs()
+    try:
+        sizes = layouts.from_args(DESIGN.design, args)
+    except ValueError as e:
+        print(f"🙀 {e}")
+        return 2
+    try:
+        if args.animate:
+            if len(sizes) > 1:
+                print("🙀 --animate renders one resolution per run")
+                return 2
+            return main_animated(args, jobs, sizes[0])
+        return main_stills(args, jobs, sizes)
+    finally:
+        profiling.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
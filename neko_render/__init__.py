@@ -0,0 +1,4 @@
+"""
+🐾 Shared rendering helpers for the frame generators
+(generate_tv_short_frames.py and generate_mcp_frames.py)
+"""
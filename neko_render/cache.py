@@ -0,0 +1,124 @@
+"""
+♻️ Content-addressed render cache
+A frame's key is a hash of everything that affects its pixels (scene
+source, text, colors, fonts, size, effect params, seed). Cached frames are
+RGB PNGs named by key, encoded as a default FrameWriter would write them,
+so a hit can be copied to the output as is; hits refresh the file's mtime
+and eviction drops the least recently used files once the directory
+exceeds its size limit.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+from neko_render import profiling, writer
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "NEKO_RENDER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "neko-render"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Entry file suffix; older RGBA entries (plain .png) are never served
+ENTRY_SUFFIX = ".rgb.png"
+
+
+def source_digest(*objs):
+    """Digest of the source code of functions/modules"""
+    h = hashlib.sha256()
+    for obj in objs:
+        h.update(inspect.getsource(obj).encode())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """Cheap identity for an input file (fonts): path, size and mtime"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return f"{path}:missing"
+    return f"{path}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def fingerprint(*parts):
+    """Stable hex key for JSON-able parts (tuples and lists hash the same)"""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class RenderCache:
+    """Directory of rendered PNGs keyed by fingerprint, LRU-evicted by size"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, force=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}{ENTRY_SUFFIX}")
+
+    @profiling.traced("cache.get", "cache")
+    def get(self, key):
+        """Cached PNG path for key, or None on a miss (always None with force)"""
+        path = self.path(key)
+        if self.force or not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process between exists() and utime()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    @profiling.traced("cache.put", "io")
+    def put(self, key, img):
+        """Store img under key (atomic rename) and return the cached path"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            writer.write_frame(img.convert('RGB'), tmp, 'png', writer.CACHE_COMPRESS_LEVEL)
+            os.replace(tmp, self.path(key))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return self.path(key)
+
+    def evict(self):
+        """Drop least recently used entries until under max_bytes; returns count"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def add_arguments(parser):
+    """--cache-dir / --cache-size / --no-cache / --force, shared by every entry point"""
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="render cache directory")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="render cache limit in MB (least recently used entries go first)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the render cache")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every frame and refresh the cache")
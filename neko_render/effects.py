@@ -0,0 +1,129 @@
+"""
+📺 Array-backed TV effects (NumPy)
+Each effect builds its whole layer as one array and composites it in a single
+Pillow call instead of touching pixels from Python. The VHS glitch only
+touches a few band rows, so it moves them as Pillow planes instead.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from neko_render import profiling, seeding
+
+
+def make_rng(seed=None):
+    """Return a NumPy Generator from a seed, a FrameRandom, an existing Generator or None"""
+    if isinstance(seed, seeding.FrameRandom):
+        return seed.generator()
+    return np.random.default_rng(seed)
+
+
+def tv_static_layer(size, intensity=0.1, rng=None, alpha=100, gray_range=(200, 255)):
+    """Build an RGBA static-noise layer of the given (width, height)
+
+    The old per-pixel version drew width*height*intensity points at random
+    positions (with repeats), so the share of pixels it actually hit is
+    1 - exp(-intensity). The mask here uses the same coverage.
+    """
+    rng = make_rng(rng)
+    width, height = size
+    coverage = 1.0 - math.exp(-intensity)
+
+    mask = rng.random((height, width), dtype=np.float32) < coverage
+    gray = rng.integers(gray_range[0], gray_range[1] + 1, size=(height, width), dtype=np.uint8)
+
+    layer = np.empty((height, width, 4), dtype=np.uint8)
+    layer[..., 0] = gray
+    layer[..., 1] = gray
+    layer[..., 2] = gray
+    layer[..., 3] = mask * np.uint8(alpha)
+    return Image.fromarray(layer, 'RGBA')
+
+
+@profiling.traced("add_tv_static", "effect")
+def add_tv_static(img, intensity=0.1, rng=None, alpha=100):
+    """Alpha-composite TV static onto an image in place"""
+    layer = tv_static_layer(img.size, intensity, rng, alpha)
+    if img.mode == 'RGBA':
+        img.alpha_composite(layer)
+    else:
+        img.paste(layer, (0, 0), layer)
+    return img
+
+
+@profiling.traced("add_vhs_glitch", "effect")
+def vhs_glitch(img, bands=5, rng=None, max_offset=50, band_height=(5, 20),
+               rgb_split=6, tint=(255, 0, 255), tint_alpha=30, tint_chance=0.5, scale=1):
+    """VHS glitch in place: displaced bands, RGB split and blended tint
+
+    All band parameters are drawn up front and every band is cropped from
+    the untouched frame before any is pasted back, so where bands overlap
+    the later band wins over the original pixels. Each band is shifted as
+    Pillow channel planes (one crop, split, paste per channel and merge),
+    so nothing of the frame goes through NumPy and the cost is a few small
+    Pillow calls per band (see benchmarks/bench_vhs_glitch.py).
+    scale (a Layout's) resizes offsets, band heights and the split, so a
+    preview glitches like the full-size frame.
+    """
+    rng = make_rng(rng)
+    width, height = img.size
+    margin = 50
+    if scale != 1:
+        margin = max(1, round(margin * scale))
+        max_offset = max(1, round(max_offset * scale))
+        band_height = tuple(max(1, round(h * scale)) for h in band_height)
+        rgb_split = max(1, round(rgb_split * scale))
+
+    ys = rng.integers(0, max(height - margin, 0) + 1, size=bands)
+    heights = rng.integers(band_height[0], band_height[1] + 1, size=bands)
+    offsets = rng.integers(-max_offset, max_offset + 1, size=bands)
+    splits = rng.integers(-rgb_split, rgb_split + 1, size=bands)
+    tinted = rng.random(bands) < tint_chance
+
+    glitches = [((0, y, width, min(y + h, height)), offset, split, tint_band)
+                for y, h, offset, split, tint_band in zip(ys.tolist(), heights.tolist(), offsets.tolist(),
+                                                          splits.tolist(), tinted.tolist())]
+    shifted = []
+    for (box, offset, split, _), band in zip(glitches, [img.crop(box) for box, _, _, _ in glitches]):
+        # Like pasting the band at x+offset: pixels shifted off the edge are
+        # lost and the uncovered gap keeps the original pixels. Red and blue
+        # move split further apart.
+        planes = []
+        for channel, plane in enumerate(band.split()):
+            shift = offset + (split if channel == 0 else -split if channel == 2 else 0)
+            if shift:
+                moved = plane.copy()
+                moved.paste(plane, (shift, 0))
+                plane = moved
+            planes.append(plane)
+        shifted.append(Image.merge(img.mode, planes))
+
+    tinted = [i for i, (_, _, _, tint_band) in enumerate(glitches) if tint_band]
+    if tinted:
+        # One Pillow lookup over all tinted bands, stacked into one strip
+        strip = Image.new(img.mode, (width, sum(shifted[i].height for i in tinted)))
+        top = 0
+        for i in tinted:
+            strip.paste(shifted[i], (0, top))
+            top += shifted[i].height
+        strip = strip.point(_tint_table(tuple(tint), tint_alpha, img.mode))
+        top = 0
+        for i in tinted:
+            shifted[i] = strip.crop((0, top, width, top + shifted[i].height))
+            top += shifted[i].height
+
+    for (box, _, _, _), band in zip(glitches, shifted):
+        img.paste(band, box[:2])
+    return img
+
+
+@lru_cache(maxsize=8)
+def _tint_table(tint, alpha, mode):
+    """point() table blending every channel value with tint at alpha (alpha channel untouched)"""
+    levels = np.arange(256, dtype=np.uint16)
+    table = [int(v) for c in tint for v in (levels * (255 - alpha) + c * alpha + 127) // 255]
+    return table + list(range(256)) if mode == 'RGBA' else table
+
@@ -0,0 +1,85 @@
+"""
+🔤 Font cache and outlined-text renderer
+Fonts are parsed once per (path, size). Outlined text rasterizes the glyph
+run once into an L mask, builds the outline from shifted copies of that
+mask, and paints both with two bitmap draws. Glyph runs come from
+neko_render.shaping, so color emoji keep their colors inside the outline.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFont
+
+from neko_render import profiling, shaping
+
+DEJAVU_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# Same 8 neighbours the original draw_text_with_outline stamped
+OUTLINE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+@lru_cache(maxsize=128)
+def get_font(size, path=DEJAVU_BOLD):
+    """Load a TrueType font once per (size, path), default font on failure"""
+    try:
+        return ImageFont.truetype(path, size, layout_engine=shaping.layout_engine())
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=512)
+def text_mask(text, size, path=DEJAVU_BOLD, pad=0, silhouette=False):
+    """Rasterize text once; returns (L mask, (dx, dy) offset from the text origin)
+
+    Color emoji are left out of the mask (paste_emoji draws them), or
+    included as their alpha with silhouette=True.
+    """
+    run = shaping.shaped_run(text, get_font(size, path))
+    mask = shaping.silhouette(run) if silhouette else run.mask
+    left, top = run.offset
+    if pad:
+        padded = Image.new('L', (mask.width + 2 * pad, mask.height + 2 * pad), 0)
+        padded.paste(mask, (pad, pad))
+        mask = padded
+    return mask, (left - pad, top - pad)
+
+
+@lru_cache(maxsize=512)
+def outline_mask(text, size, width=3, path=DEJAVU_BOLD):
+    """Outline coverage from 8 copies of the text mask shifted by `width` px
+
+    Coverage is combined as 1 - prod(1 - m), which is what stamping the
+    text eight times with the outline color produced.
+    """
+    mask, offset = text_mask(text, size, path, pad=width, silhouette=True)
+    src = np.asarray(mask, dtype=np.float32) / 255.0
+    h, w = src.shape
+    remaining = np.ones_like(src)
+    for dx, dy in OUTLINE_OFFSETS:
+        sx, sy = dx * width, dy * width
+        shifted = np.zeros_like(src)
+        shifted[max(sy, 0):h + min(sy, 0), max(sx, 0):w + min(sx, 0)] = \
+            src[max(-sy, 0):h + min(-sy, 0), max(-sx, 0):w + min(-sx, 0)]
+        remaining *= 1.0 - shifted
+    coverage = np.rint((1.0 - remaining) * 255.0).astype(np.uint8)
+    return Image.fromarray(coverage, 'L'), offset
+
+
+@profiling.traced("draw_text_with_outline", "text")
+def draw_text_with_outline(draw, pos, text, fill='white', outline='black',
+                           font_size=60, width=3, path=DEJAVU_BOLD):
+    """Draw outlined text with one outline blit and one text blit"""
+    x, y = pos
+    stroke, (ox, oy) = outline_mask(text, font_size, width, path)
+    draw.bitmap((x + ox, y + oy), stroke, fill=outline)
+
+    mask, (tx, ty) = text_mask(text, font_size, path)
+    draw.bitmap((x + tx, y + ty), mask, fill=fill)
+
+
+def paste_emoji(img, pos, text, font_size=60, path=DEJAVU_BOLD):
+    """Paste the color emoji of text drawn at pos by draw_text_with_outline (no-op without any)"""
+    run = shaping.shaped_run(text, get_font(font_size, path))
+    if run.emoji:
+        img.paste(run.emoji, (pos[0] + run.offset[0], pos[1] + run.offset[1]), run.emoji)
@@ -0,0 +1,174 @@
+"""
+💍 Shared-memory frame ring: worker-rendered frames without pickling
+A FrameRing is one multiprocessing.shared_memory block cut into fixed
+frame slots, owned by the parent. Each task is handed free slots when it
+is submitted; the worker renders straight into them (slot_image() is a
+writable Image over the slot) and returns only small metadata. The
+parent reads a slot zero-copy (view() for a pipe, image() through
+Image.frombuffer for an encoder) and the slot goes back on the free list
+once the consumer has moved on.
+
+Backpressure: a task is only submitted when the ring has free slots for
+all of its frames, so when the writer falls behind, workers simply run
+out of work instead of piling frames up in memory.
+
+Slots are RGBA: Pillow shares memory with frombuffer for 4-byte pixels
+(RGB images are stored padded, so they would be copied).
+"""
+
+import traceback
+import weakref
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from PIL import Image
+
+from neko_render import parallel, profiling
+
+# What a worker needs to find the ring (picklable)
+RingSpec = namedtuple('RingSpec', ['name', 'size', 'mode', 'slots'])
+
+MODES = {'RGBA': 4, 'RGBX': 4, 'L': 1}
+
+
+def frame_bytes(size, mode='RGBA'):
+    return size[0] * size[1] * MODES[mode]
+
+
+def _slot(buf, spec, slot):
+    nbytes = frame_bytes(spec.size, spec.mode)
+    if not 0 <= slot < spec.slots:
+        raise IndexError(f"slot {slot} out of range (ring has {spec.slots})")
+    return buf[slot * nbytes:(slot + 1) * nbytes]
+
+
+def _image(buf, spec, slot):
+    return Image.frombuffer(spec.mode, spec.size, _slot(buf, spec, slot), 'raw', spec.mode, 0, 1)
+
+
+class FrameRing:
+    """Fixed frame slots in one shared-memory block, with a free list (parent side)"""
+
+    def __init__(self, size, slots, mode='RGBA'):
+        if mode not in MODES:
+            raise ValueError(f"ring mode must be one of {', '.join(MODES)}, not {mode}")
+        self.size = tuple(size)
+        self.mode = mode
+        self.frame_bytes = frame_bytes(self.size, mode)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.frame_bytes * slots)
+        self.spec = RingSpec(self.shm.name, self.size, mode, slots)
+        self.free = deque(range(slots))
+        self._finalize = weakref.finalize(self, _destroy, self.shm)
+
+    def acquire(self, count=1):
+        """count free slots, or None if the ring does not have that many free"""
+        if count > self.spec.slots:
+            raise ValueError(f"{count} frames do not fit a {self.spec.slots}-slot ring")
+        if len(self.free) < count:
+            return None
+        return [self.free.popleft() for _ in range(count)]
+
+    def release(self, slots):
+        self.free.extend(slots)
+
+    def view(self, slot):
+        """The slot's bytes, zero-copy (valid until the slot is released)"""
+        return _slot(self.shm.buf, self.spec, slot)
+
+    def image(self, slot):
+        """Read-only Image over the slot, zero-copy (valid until the slot is released)"""
+        return _image(self.shm.buf, self.spec, slot)
+
+    def close(self):
+        self._finalize()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _destroy(shm):
+    try:
+        shm.close()
+    except BufferError:
+        # A view is still alive somewhere; the mapping goes when it does
+        pass
+    shm.unlink()
+
+
+# This process's attachment to the current ring (workers reuse it across tasks)
+_attached = {}
+
+
+def attach(spec):
+    """The ring's shared memory in a worker process"""
+    shm = _attached.get(spec.name)
+    if shm is None:
+        for old in _attached.values():
+            try:
+                old.close()
+            except BufferError:
+                pass
+        _attached.clear()
+        shm = _attached[spec.name] = shared_memory.SharedMemory(name=spec.name)
+    return shm
+
+
+def slot_image(spec, slot):
+    """Writable Image over a slot: drawing on it writes the shared frame (worker side)"""
+    img = _image(attach(spec).buf, spec, slot)
+    # frombuffer marks the image read-only so edits would copy; here editing in place is the point
+    img.readonly = 0
+    return img
+
+
+def iter_ring(func, tasks, ring, jobs=1, initializer=None):
+    """Run func(ring.spec, slots, *args) for each (count, args) task; yield (TaskResult, slots) in order
+
+    Each task renders `count` frames into its `slots`. Its slots are
+    released when the generator resumes, so read them (ring.view /
+    ring.image) before asking for the next task. Tasks are submitted
+    only while the ring has room for them (backpressure); jobs <= 1 runs
+    inline.
+    """
+    tasks = list(tasks)
+    if jobs <= 1:
+        if initializer:
+            initializer()
+        for i, (count, args) in enumerate(tasks):
+            slots = ring.acquire(count)
+            value, error, events, rss = parallel.call(func, (ring.spec, slots) + tuple(args))
+            profiling.merge(events)
+            try:
+                yield parallel.TaskResult(i, value, error, rss), slots
+            finally:
+                ring.release(slots)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+        pending = deque()
+        submitted = 0
+        for i in range(len(tasks)):
+            # Fill the ring: submit every next task that has free slots
+            while submitted < len(tasks):
+                count, args = tasks[submitted]
+                slots = ring.acquire(count)
+                if slots is None:
+                    break
+                pending.append((parallel.submit(pool, func, (ring.spec, slots) + tuple(args)), slots))
+                submitted += 1
+            future, slots = pending.popleft()
+            rss = None
+            try:
+                value, error, events, rss = future.result()
+                profiling.merge(events)
+            except Exception:
+                # Worker died (e.g. killed by the OOM killer)
+                value, error = None, traceback.format_exc()
+            try:
+                yield parallel.TaskResult(i, value, error, rss), slots
+            finally:
+                ring.release(slots)
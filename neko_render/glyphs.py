@@ -0,0 +1,139 @@
+"""
+🔡 Glyph atlas and matrix rain
+Each character is rasterized once per font and cell size into a cell-sized
+L tile. A whole grid of characters is then one fancy-index into the atlas
+plus a reshape, with a per-cell alpha and color applied as arrays, instead
+of one draw.text call per cell. The result is a straight-alpha RGBA layer
+(e.g. for a scene.ImageNode). Grids are laid out in design cells; a
+scaled Layout only changes the cell and font size the atlas is drawn at.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from neko_render import fonts, profiling
+
+MATRIX_CHARS = ('0', '1', 'ネ', 'コ', '猫')
+# Size of Pillow's default font (load_default() with no size)
+DEFAULT_FONT_SIZE = 10
+
+
+class GlyphAtlas:
+    """Every character drawn once at the top-left of a (width, height) cell
+
+    Index len(chars) is a blank cell, so hidden cells need no mask. The
+    atlas keeps each glyph at all 256 alpha levels (a few hundred KB for a
+    handful of small glyphs), so a grid with per-cell alpha is a single
+    gather with no per-pixel multiply.
+    """
+
+    def __init__(self, chars, cell, font_size=None, path=fonts.DEJAVU_BOLD, scale=1):
+        self.chars = tuple(chars)
+        self.cell = tuple(cell)
+        # Default: Pillow's built-in font, as draw.text without a font uses
+        if font_size is None:
+            font = ImageFont.load_default() if scale == 1 else ImageFont.load_default(DEFAULT_FONT_SIZE * scale)
+        else:
+            font = fonts.get_font(max(1, round(font_size * scale)), path)
+        width, height = self.cell
+        tiles = np.zeros((len(self.chars) + 1, height, width), dtype=np.uint8)
+        for i, char in enumerate(self.chars):
+            tile = Image.new('L', self.cell, 0)
+            ImageDraw.Draw(tile).text((0, 0), char, font=font, fill=255)
+            tiles[i] = np.asarray(tile)
+        self.tiles = tiles
+        self.blank = len(self.chars)
+        levels = np.arange(256, dtype=np.uint16)[None, :, None, None]
+        # ramp[glyph, alpha] = glyph coverage scaled by alpha
+        self.ramp = ((tiles[:, None].astype(np.uint16) * levels + 127) // 255).astype(np.uint8)
+
+    @profiling.traced("glyph_grid", "effect")
+    def render(self, size, indices, alpha, color):
+        """RGBA layer of a (rows, cols) grid of atlas indices, cropped to size
+
+        alpha is per cell, (rows, cols) or (rows, 1) for a per-row gradient;
+        it scales each glyph's coverage. color is one RGB tuple or a
+        (rows, cols, 3) array of per-cell colors.
+        """
+        width, height = size
+        cw, ch = self.cell
+        rows, cols = indices.shape
+        alpha = np.broadcast_to(np.asarray(alpha).clip(0, 255).astype(np.intp), (rows, cols))
+        # (rows, cols, ch, cw) -> (rows*ch, cols*cw): one gather for every glyph
+        cells = self.ramp[indices, alpha]
+        coverage = cells.transpose(0, 2, 1, 3).reshape(rows * ch, cols * cw)
+        mask = Image.fromarray(coverage[:height, :width], 'L')
+
+        color = np.asarray(color, dtype=np.uint8)
+        if color.ndim == 1:
+            layer = Image.new('RGBA', size, tuple(color))
+        else:
+            # One pixel per cell, scaled up by the cell size (alpha is replaced below)
+            cells = np.empty((rows, cols, 4), dtype=np.uint8)
+            cells[..., :3] = color
+            layer = Image.fromarray(cells, 'RGBA').resize((cols * cw, rows * ch), Image.NEAREST)
+            if layer.size != tuple(size):
+                layer = layer.crop((0, 0, width, height))
+        layer.putalpha(mask)
+        return layer
+
+
+@lru_cache(maxsize=16)
+def atlas(chars=MATRIX_CHARS, cell=(30, 40), font_size=None, layout=None):
+    """Cached GlyphAtlas per (chars, design cell, font size, layout)"""
+    if layout is None:
+        return GlyphAtlas(chars, cell, font_size)
+    return GlyphAtlas(chars, layout.cell(cell), font_size, scale=layout.scale)
+
+
+def grid_shape(size, cell):
+    width, height = size
+    return -(-height // cell[1]), -(-width // cell[0])
+
+
+class MatrixRain:
+    """Falling columns: each has a head moving down at its own speed and a fading trail
+
+    All randomness (start rows, speeds, trail lengths, characters, which
+    cells flicker) is drawn from rng up front, so frame(step) is a pure
+    function of step and repeated steps come back identical. size and cell
+    are in design units; frame(step, layout) draws the same grid at any
+    output size.
+    """
+
+    HEAD_COLOR = (200, 255, 200)
+    TRAIL_COLOR = (0, 255, 0)
+
+    def __init__(self, size, rng, cell=(30, 40), speed=(0.5, 1.5), trail=(6, 20),
+                 flicker=0.1, chars=MATRIX_CHARS):
+        self.size = tuple(size)
+        self.chars_set = tuple(chars)
+        self.cell = tuple(cell)
+        self.blank = len(self.chars_set)
+        self.rows, self.cols = grid_shape(size, cell)
+        n = len(self.chars_set)
+        self.trail = np.asarray(rng.integers(trail[0], trail[1] + 1, self.cols))
+        # Rows per step, start row and characters per column/cell
+        self.speed = speed[0] + (speed[1] - speed[0]) * np.asarray(rng.random(self.cols))
+        self.start = np.asarray(rng.integers(0, self.rows + trail[1], self.cols))
+        self.chars = np.asarray(rng.integers(0, n, self.rows * self.cols)).reshape(self.rows, self.cols)
+        self.flicker = (np.asarray(rng.random(self.rows * self.cols)) < flicker).reshape(self.rows, self.cols)
+
+    def frame(self, step, layout=None):
+        """RGBA layer for one animation step (at the layout's output size)"""
+        period = self.rows + self.trail
+        head = (self.start + np.floor(self.speed * step).astype(np.int64)) % period
+        # Distance of each cell above its column's head; 0 is the head itself
+        behind = head[None, :] - np.arange(self.rows)[:, None]
+        lit = (behind >= 0) & (behind < self.trail[None, :])
+        alpha = np.where(lit, 255 * (self.trail - behind) // self.trail, 0)
+
+        indices = np.where(self.flicker, (self.chars + step) % self.blank, self.chars)
+        indices = np.where(lit, indices, self.blank)
+        color = np.empty((self.rows, self.cols, 3), dtype=np.uint8)
+        color[:] = self.TRAIL_COLOR
+        color[behind == 0] = self.HEAD_COLOR
+        size = layout.size if layout else self.size
+        return atlas(self.chars_set, self.cell, layout=layout).render(size, indices, alpha, color)
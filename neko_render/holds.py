@@ -0,0 +1,98 @@
+"""
+⏸️ Hold timeline: each unique frame once, with how long it stays on screen
+A video is a list of holds (file, seconds). A frame identical to the one
+before it only lengthens the previous hold, so a still shown for 3 s is
+one file and one encoded image, not 90. Identity is a pixel digest for
+images rendered in this process, or a byte comparison (sizes first) for
+files already saved by a pool worker.
+
+Exports: an ffconcat list for ffmpeg's concat demuxer (per-file
+durations) and a Matroska v2 timestamp file for a VFR mux
+(mkvmerge --timestamps 0:frames.timestamps.txt).
+"""
+
+import filecmp
+import hashlib
+import os
+
+
+def image_digest(img):
+    """Content hash of an image's pixels (mode and size included)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{img.mode}:{img.size[0]}x{img.size[1]}".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def same_file(a, b):
+    """True if two saved frames have the same bytes (different sizes never get read)"""
+    return a == b or filecmp.cmp(a, b, shallow=False)
+
+
+class Hold:
+    """One unique frame: its file, how long it is shown, its pixel digest (None for worker files)"""
+
+    __slots__ = ('path', 'seconds', 'digest')
+
+    def __init__(self, path, seconds, digest=None):
+        self.path = path
+        self.seconds = seconds
+        self.digest = digest
+
+
+class HoldTimeline:
+    """Holds in play order; add() folds a frame into the previous hold when identical"""
+
+    def __init__(self):
+        self.holds = []
+        # Frames added, repeats included (what a constant-rate export would store)
+        self.frames = 0
+
+    @property
+    def last(self):
+        return self.holds[-1] if self.holds else None
+
+    @property
+    def seconds(self):
+        return sum(hold.seconds for hold in self.holds)
+
+    @property
+    def paths(self):
+        return [hold.path for hold in self.holds]
+
+    def add(self, path, seconds, digest=None):
+        """Append a frame shown `seconds`; False if it only lengthened the previous hold
+
+        A frame repeats the previous one when it has the same path or the
+        same (non-None) digest.
+        """
+        self.frames += 1
+        last = self.last
+        if last is not None and (path == last.path or (digest is not None and digest == last.digest)):
+            last.seconds += seconds
+            return False
+        self.holds.append(Hold(path, seconds, digest))
+        return True
+
+    def write_concat(self, path):
+        """ffconcat list: every file with its duration"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            for hold in self.holds:
+                f.write(f"file '{os.path.basename(hold.path)}'\nduration {hold.seconds:g}\n")
+            if self.holds:
+                # The concat demuxer ignores the last duration unless the file repeats
+                f.write(f"file '{os.path.basename(self.holds[-1].path)}'\n")
+        return path
+
+    def write_timestamps(self, path):
+        """Matroska timestamp format v2: start of each hold in ms, then the end of the last one"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# timestamp format v2\n")
+            start = 0.0
+            for hold in self.holds:
+                f.write(f"{start * 1000:.3f}\n")
+                start += hold.seconds
+            if self.holds:
+                f.write(f"{start * 1000:.3f}\n")
+        return path
@@ -0,0 +1,126 @@
+"""
+🎞️ Cached overlay layers (scan lines, gradients)
+Layers depend only on size and colors, so they are built once as arrays,
+kept in a memory-capped LRU and blended onto frames in one call.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageColor
+
+from neko_render import profiling
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+class LayerCache:
+    """LRU of prebuilt PIL layers, capped by total pixel bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._layers = OrderedDict()
+
+    def get(self, key, build):
+        """Return the layer for key, calling build() on a miss"""
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return layer
+
+        self.misses += 1
+        layer = build()
+        size = _image_bytes(layer)
+        if size > self.max_bytes:
+            return layer
+
+        self._layers[key] = layer
+        self.current_bytes += size
+        self._trim()
+        return layer
+
+    def _trim(self):
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._layers.popitem(last=False)
+            self.current_bytes -= _image_bytes(evicted)
+
+    def resize(self, max_bytes):
+        """Change the cap, evicting least recently used layers to fit"""
+        self.max_bytes = max_bytes
+        self._trim()
+
+    def clear(self):
+        self._layers.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._layers)
+
+
+LAYER_CACHE = LayerCache()
+
+
+@profiling.traced("create_gradient_bg", "effect")
+def build_gradient(color1, color2, size):
+    """Vertical RGBA gradient, row colors truncated like the per-row version"""
+    width, height = size
+    c1 = np.array(ImageColor.getrgb(color1)[:3], dtype=np.float64)
+    c2 = np.array(ImageColor.getrgb(color2)[:3], dtype=np.float64)
+
+    ratio = np.arange(height, dtype=np.float64)[:, None] / height
+    rows = np.empty((height, 1, 4), dtype=np.uint8)
+    rows[:, 0, :3] = (c1 + (c2 - c1) * ratio).astype(np.uint8)
+    rows[:, 0, 3] = 255
+
+    column = Image.fromarray(rows, 'RGBA')
+    return column.resize((width, height), Image.NEAREST)
+
+
+def build_scan_lines(size, spacing=4, thickness=2, alpha=50, phase=0):
+    """Black RGBA mask with a semi-transparent band every `spacing` rows
+
+    phase shifts the bands down by that many rows (scrolling scan lines).
+    """
+    width, height = size
+    rows = np.zeros((height, 1, 4), dtype=np.uint8)
+    band = ((np.arange(height) - phase) % spacing) < thickness
+    rows[band, 0, 3] = alpha
+
+    column = Image.fromarray(rows, 'RGBA')
+    return column.resize((width, height), Image.NEAREST)
+
+
+def gradient(color1, color2, size, cache=LAYER_CACHE):
+    """Cached gradient layer (shared, do not draw on it directly)"""
+    return cache.get(('gradient', color1, color2, tuple(size)),
+                     lambda: build_gradient(color1, color2, size))
+
+
+def scan_lines(size, spacing=4, thickness=2, alpha=50, phase=0, cache=LAYER_CACHE):
+    """Cached scan-line mask (shared, do not draw on it directly)"""
+    phase %= spacing
+    return cache.get(('scan_lines', tuple(size), spacing, thickness, alpha, phase),
+                     lambda: build_scan_lines(size, spacing, thickness, alpha, phase))
+
+
+def scaled_scan_lines(layout, phase=0, cache=LAYER_CACHE):
+    """scan_lines() for a neko_render.layout.Layout: spacing and band scale with it"""
+    spacing = max(2, layout.px(4))
+    return scan_lines(layout.size, spacing, min(layout.stroke(2), spacing - 1), phase=phase, cache=cache)
+
+
+def blend(img, layer):
+    """Composite a cached layer onto img in place"""
+    if img.mode == 'RGBA':
+        img.alpha_composite(layer)
+    else:
+        img.paste(layer, (0, 0), layer)
+    return img
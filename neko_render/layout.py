@@ -0,0 +1,166 @@
+"""
+📐 Resolution-independent layout
+Scenes are authored in design units: pixels of a reference canvas (the
+generators' WIDTH x HEIGHT). A Layout maps them onto an output size with
+one uniform scale, so coordinates, stroke widths and font sizes written for
+1080p render at 360p (fast previews), 720p or 4K without edits.
+
+A Layout at its design size has scale 1 and changes nothing: px() returns
+its argument and draw() returns the ImageDraw itself, so native renders
+stay pixel-identical.
+"""
+
+import math
+import re
+
+# Named resolutions by their short side (vertical shorts: the width)
+RESOLUTIONS = {
+    '360p': 360,
+    '480p': 480,
+    '720p': 720,
+    '1080p': 1080,
+    '1440p': 1440,
+    '4k': 2160,
+}
+PREVIEW = '360p'
+
+
+class Layout:
+    """Design canvas (width, height) scaled onto an output size of the same aspect"""
+
+    def __init__(self, design, size=None):
+        self.design = tuple(design)
+        self.size = tuple(size or design)
+        self.scale = min(self.size[0] / self.design[0], self.size[1] / self.design[1])
+        # Output sizes are rounded to whole (even) pixels, so allow a pixel per axis
+        for out, ref in zip(self.size, self.design):
+            if abs(out - ref * self.scale) > 1:
+                raise ValueError(f"{self.size[0]}x{self.size[1]} does not have the aspect "
+                                 f"of the {self.design[0]}x{self.design[1]} design")
+
+    @classmethod
+    def parse(cls, design, text):
+        """Layout from '720p' / '4k' (short side), 'WIDTHxHEIGHT' or 'native'"""
+        text = text.strip().lower()
+        if text in ('', 'native'):
+            return cls(design)
+        if text in RESOLUTIONS:
+            return cls.short_side(design, RESOLUTIONS[text])
+        match = re.fullmatch(r"(\d+)x(\d+)", text)
+        if not match:
+            raise ValueError(f"unknown resolution: {text} (use {', '.join(RESOLUTIONS)} or WxH)")
+        return cls(design, (int(match[1]), int(match[2])))
+
+    @classmethod
+    def short_side(cls, design, pixels):
+        """Layout whose shorter side is `pixels`, the longer one rounded to an even size"""
+        short, long = sorted(design)
+        other = 2 * round(pixels * long / short / 2)
+        size = (pixels, other) if design[0] <= design[1] else (other, pixels)
+        return cls(design, size)
+
+    @property
+    def native(self):
+        return self.size == self.design
+
+    @property
+    def name(self):
+        return f"{self.size[0]}x{self.size[1]}"
+
+    def px(self, value):
+        """Design units -> output pixels"""
+        return value if self.scale == 1 else int(round(value * self.scale))
+
+    def point(self, xy):
+        return xy if self.scale == 1 else (self.px(xy[0]), self.px(xy[1]))
+
+    def stroke(self, width):
+        """Line widths, outlines, offsets: scaled but never below 1 px"""
+        return width if self.scale == 1 else max(1, self.px(width))
+
+    def font_size(self, size):
+        return self.stroke(size)
+
+    def cell(self, cell):
+        """A grid cell (width, height), rounded up so the design's grid still covers the frame"""
+        if self.scale == 1:
+            return tuple(cell)
+        return tuple(max(1, math.ceil(v * self.scale)) for v in cell)
+
+    def draw(self, draw):
+        """ImageDraw that takes design units (the ImageDraw itself at scale 1)"""
+        return draw if self.scale == 1 else ScaledDraw(draw, self)
+
+    def __eq__(self, other):
+        return isinstance(other, Layout) and (self.design, self.size) == (other.design, other.size)
+
+    def __hash__(self):
+        return hash((self.design, self.size))
+
+    def __repr__(self):
+        return f"Layout({self.design}, {self.size})"
+
+
+class ScaledDraw:
+    """ImageDraw stand-in: coordinates and widths in design units
+
+    Covers the shapes the generators draw. text() and bitmap() only move
+    the anchor point; the caller passes a font (or mask) already sized with
+    Layout.font_size().
+    """
+
+    def __init__(self, draw, layout):
+        self._draw = draw
+        self.layout = layout
+
+    def _xy(self, xy):
+        px = self.layout.px
+        if xy and isinstance(xy[0], (tuple, list)):
+            return [(px(x), px(y)) for x, y in xy]
+        return [px(v) for v in xy]
+
+    def _scaled(self, kwargs):
+        if kwargs.get('width'):
+            kwargs['width'] = self.layout.stroke(kwargs['width'])
+        return kwargs
+
+    def rectangle(self, xy, **kwargs):
+        self._draw.rectangle(self._xy(xy), **self._scaled(kwargs))
+
+    def ellipse(self, xy, **kwargs):
+        self._draw.ellipse(self._xy(xy), **self._scaled(kwargs))
+
+    def line(self, xy, **kwargs):
+        self._draw.line(self._xy(xy), **self._scaled(kwargs))
+
+    def polygon(self, xy, **kwargs):
+        self._draw.polygon(self._xy(xy), **self._scaled(kwargs))
+
+    def text(self, xy, text, **kwargs):
+        self._draw.text(self.layout.point(xy), text, **kwargs)
+
+    def bitmap(self, xy, bitmap, **kwargs):
+        self._draw.bitmap(self.layout.point(xy), bitmap, **kwargs)
+
+
+def parse_list(design, text):
+    """Layouts from a comma-separated list, e.g. '720p,1080p,4k' (duplicates dropped)"""
+    layouts = []
+    for part in text.split(","):
+        layout = Layout.parse(design, part)
+        if layout not in layouts:
+            layouts.append(layout)
+    return layouts
+
+
+def add_arguments(parser):
+    """--resolution / --preview, shared by both generators"""
+    parser.add_argument("--resolution", default="native", metavar="RES[,RES...]",
+                        help=f"output size(s): {', '.join(RESOLUTIONS)}, WxH or native; several "
+                             f"(e.g. 720p,1080p,4k) export one subdirectory each from one build")
+    parser.add_argument("--preview", action="store_true",
+                        help=f"quick {PREVIEW} render (same as --resolution {PREVIEW})")
+
+
+def from_args(design, args):
+    return parse_list(design, PREVIEW if args.preview else args.resolution)
@@ -0,0 +1,73 @@
+"""
+🪶 Memory-lean rendering: one reused RGB frame buffer per process
+Off unless --lean is given or NEKO_LEAN is set. In lean mode scenes
+composite straight into a preallocated RGB buffer (see Scene.render_into;
+stills use Scene.draw) instead of keeping RGBA canvases per overlay and
+copying the result, the glitch runs on that buffer in place and frames
+are saved as RGB. The buffer is reused for every scene the process renders, and the layer cache
+is capped lower, so a worker's peak RSS stays flat however many scenes it
+takes.
+
+It pays off for the animated timeline only (--animate, animated batch
+jobs), where a worker otherwise keeps a canvas and a copy per frame in
+flight: about 430 -> 300 MB at native size. One still per scene does not
+get lower: its peak is the scene's own transient work (the explosion's
+float32 polar grids and palette, ~130 MB at native size), which lean mode
+leaves alone, so --lean on stills costs a copy per size and saves nothing.
+
+Pool workers inherit the setting through the environment, like profiling.
+"""
+
+import os
+import resource
+import sys
+
+from PIL import Image
+
+from neko_render import layers
+
+ENV_VAR = "NEKO_LEAN"
+# Layer cache cap in lean mode (the default is layers.DEFAULT_MAX_BYTES)
+LEAN_LAYER_CACHE_MB = 96
+
+_buffers = {}
+
+
+def lean():
+    return bool(os.environ.get(ENV_VAR))
+
+
+def enable_lean():
+    """Turn lean mode on here and in worker processes started from now on"""
+    os.environ[ENV_VAR] = "1"
+    layers.LAYER_CACHE.resize(LEAN_LAYER_CACHE_MB * 1024 * 1024)
+
+
+def frame_buffer(size, mode='RGB'):
+    """This process's reusable frame buffer (shared: save or copy it before the next frame)"""
+    key = (tuple(size), mode)
+    buffer = _buffers.get(key)
+    if buffer is None:
+        # Only one size is ever live; a new size replaces the old buffer
+        _buffers.clear()
+        buffer = _buffers[key] = Image.new(mode, size)
+    return buffer
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+
+
+def add_arguments(parser):
+    """--lean, shared by the TV generator, the batch runner and the render service"""
+    parser.add_argument("--lean", action="store_true",
+                        help="memory-lean animated renders: one reused RGB frame buffer per worker, RGB PNGs "
+                             "(does not lower peak RSS for stills)")
+
+
+if lean():
+    # Started as a worker of a lean run
+    enable_lean()
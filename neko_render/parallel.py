@@ -0,0 +1,75 @@
+"""
+⚡ Ordered process-pool execution
+Tasks run on a ProcessPoolExecutor; results and failures come back in
+submission order regardless of which worker finished first.
+"""
+
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from neko_render import memory, profiling, seeding
+
+# peak_rss_mb: peak RSS of the process that ran the task, so far
+TaskResult = namedtuple('TaskResult', ['index', 'value', 'error', 'peak_rss_mb'], defaults=[None])
+
+
+def frame_seed(base_seed, index):
+    """Deterministic per-frame seed, independent of scheduling order (see seeding.derive_seed)"""
+    return seeding.derive_seed(base_seed, index)
+
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+
+def call(func, args):
+    """func(*args) as a pool task runs it: (value, error, profiling events, peak RSS)"""
+    try:
+        value, error = func(*args), None
+    except Exception:
+        value, error = None, traceback.format_exc()
+    return value, error, profiling.drain(), memory.peak_rss_mb()
+
+
+def submit(pool, func, args):
+    """pool.submit() one task the way iter_ordered runs it; the future's result is
+    (value, error, profiling events, peak RSS), for callers that run their own pool"""
+    return pool.submit(call, func, args)
+
+
+def iter_ordered(func, task_args, jobs=1, initializer=None):
+    """Yield a TaskResult per args tuple, in input order, as soon as each is ready
+
+    jobs <= 1 runs inline in this process (no pickling, easier debugging).
+    func must be a module-level function so workers can import it, and so
+    must initializer, which runs once per worker (or once inline) first.
+    """
+    task_args = list(task_args)
+    if jobs <= 1 or len(task_args) <= 1:
+        if initializer:
+            initializer()
+        for i, args in enumerate(task_args):
+            value, error, events, rss = call(func, args)
+            profiling.merge(events)
+            yield TaskResult(i, value, error, rss)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(task_args)), initializer=initializer) as pool:
+        futures = [pool.submit(call, func, args) for args in task_args]
+        for i, future in enumerate(futures):
+            rss = None
+            try:
+                value, error, events, rss = future.result()
+                # Spans recorded in the worker join this process's trace
+                profiling.merge(events)
+            except Exception:
+                # Worker died (e.g. killed by the OOM killer)
+                value, error = None, traceback.format_exc()
+            yield TaskResult(i, value, error, rss)
+
+
+def run_ordered(func, task_args, jobs=1, initializer=None):
+    """Run func(*args) for each args tuple; return TaskResults in input order"""
+    return list(iter_ordered(func, task_args, jobs, initializer))
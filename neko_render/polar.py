@@ -0,0 +1,144 @@
+"""
+🌀 Polar primitives: rays, rings and radial falloff in one pass each
+Every primitive is a function of the same polar grid (the radius and
+angle of each output pixel around a center), built once per size and
+center and cached. Primitives return float32 coverage in [0, 1],
+anti-aliased over one output pixel, and layer() paints a stack of
+(coverage, color) pairs into a straight-alpha RGBA tile with real "over"
+blending, so a translucent ring stays translucent. Radii and widths are
+in design units (see neko_render.layout): a grid built with the layout's
+scale measures its radii in them.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageColor
+
+from neko_render import profiling
+
+
+class Polar:
+    """Radius (design units) and angle (degrees, 0 = +x, clockwise on screen) of every pixel"""
+
+    def __init__(self, size, center, scale=1.0):
+        width, height = size
+        self.size = (width, height)
+        self.dx = (np.arange(width, dtype=np.float32) - center[0])[None, :]
+        self.dy = (np.arange(height, dtype=np.float32) - center[1])[:, None]
+        self.scale = scale
+        # One output pixel in design units: the anti-aliasing ramp
+        self.pixel = 1.0 / scale
+        self.radius = np.hypot(self.dx, self.dy) / np.float32(scale)
+        self._angle = None
+
+    @property
+    def angle(self):
+        if self._angle is None:
+            self._angle = np.degrees(np.arctan2(self.dy, self.dx)) % np.float32(360)
+        return self._angle
+
+
+@lru_cache(maxsize=4)
+def grid(size, center, scale=1.0):
+    """Cached Polar grid of a size canvas (output px) around center (output px)"""
+    return Polar(size, center, scale)
+
+
+def layout_grid(layout, center, size=None):
+    """Polar grid in design units for a Layout: center (and size, default the canvas) in design units"""
+    size = layout.size if size is None else (layout.px(size[0]), layout.px(size[1]))
+    return grid(size, layout.point(center), layout.scale)
+
+
+def _edge(inside, pixel):
+    """Coverage of pixels `inside` design units within an edge (negative: outside)"""
+    return np.clip(inside / pixel + 0.5, 0.0, 1.0)
+
+
+def disc(polar, radius):
+    return _edge(radius - polar.radius, polar.pixel)
+
+
+def rings(polar, start, stop, step, width, alpha=1.0):
+    """Ring outlines at radius start, start + step ... (< stop), each `width` wide inside its radius
+
+    Like ImageDraw.ellipse(outline, width) for each radius, in one pass:
+    every pixel is measured against its nearest ring only, so rings must
+    not overlap (width <= step). alpha is one value or a function of the
+    ring radius (e.g. a falloff).
+    """
+    radii = np.arange(start, stop, step, dtype=np.float32)
+    # Nearest ring, by the middle of its band
+    index = np.clip(np.rint((polar.radius - (start - width / 2)) / step), 0, len(radii) - 1).astype(np.intp)
+    middle = radii[index] - width / 2
+    coverage = _edge(width / 2 - np.abs(polar.radius - middle), polar.pixel)
+    if callable(alpha):
+        alpha = np.asarray([alpha(r) for r in radii], dtype=np.float32)[index]
+    return coverage * alpha
+
+
+def rays(polar, count, half_angle, phase=0.0, length=None):
+    """count wedges of +/- half_angle degrees, evenly spaced from angle phase, out to length"""
+    period = 360.0 / count
+    off_axis = np.abs((polar.angle - phase + period / 2) % period - period / 2)
+    # Distance to the wedge edge along the arc, in design units
+    coverage = _edge(polar.radius * np.radians(half_angle - off_axis), polar.pixel)
+    if length is not None:
+        coverage *= _edge(length - polar.radius, polar.pixel)
+    return coverage
+
+
+def falloff(polar, radius, inner=0.0, power=1.0):
+    """1 inside `inner`, easing to 0 at `radius`"""
+    t = np.clip((polar.radius - inner) / (radius - inner), 0.0, 1.0)
+    return (1.0 - t) ** power
+
+
+def bands(polar, width, offset=0.0):
+    """Index of the `width`-wide concentric band each pixel is in (0 innermost), shifted out by offset"""
+    return np.floor((polar.radius - offset) / width).astype(np.int64)
+
+
+@profiling.traced("polar_layer", "effect")
+def layer(size, paints):
+    """Straight-alpha RGBA Image of (coverage, color) pairs, each painted over the ones before
+
+    color is a color name, an RGB or RGBA tuple (its alpha scales the
+    coverage) or an (h, w, 3) array of per-pixel colors.
+    """
+    width, height = size
+    if len(paints) == 1 and not isinstance(paints[0][1], np.ndarray):
+        # One flat color: the coverage is the alpha channel
+        coverage, color = paints[0]
+        color = ImageColor.getrgb(color) if isinstance(color, str) else tuple(color)
+        a = np.broadcast_to(np.asarray(coverage, dtype=np.float32), (height, width))
+        if len(color) == 4:
+            a = a * (color[3] / np.float32(255))
+        img = Image.new('RGBA', size, color[:3] + (0,))
+        img.putalpha(Image.fromarray(np.rint(a * 255).astype(np.uint8), 'L'))
+        return img
+    # Planar (channel, y, x): whole-plane ops instead of broadcasting over a size-3 axis
+    premultiplied = np.zeros((3, height, width), dtype=np.float32)
+    alpha = np.zeros((height, width), dtype=np.float32)
+    for coverage, color in paints:
+        if isinstance(color, str):
+            color = ImageColor.getrgb(color)
+        color = np.asarray(color, dtype=np.float32)
+        a = np.broadcast_to(np.asarray(coverage, dtype=np.float32), (height, width))
+        if color.ndim == 1 and len(color) == 4:
+            a = a * (color[3] / np.float32(255))
+            color = color[:3]
+        keep = 1 - a
+        for channel in range(3):
+            plane = premultiplied[channel]
+            plane *= keep
+            plane += a * (color[channel] if color.ndim == 1 else color[..., channel])
+        alpha *= keep
+        alpha += a
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    scale = 1 / np.maximum(alpha, np.float32(1e-6))
+    for channel in range(3):
+        rgba[..., channel] = np.rint(premultiplied[channel] * scale).clip(0, 255)
+    rgba[..., 3] = np.rint(alpha * 255)
+    return Image.fromarray(rgba, 'RGBA')
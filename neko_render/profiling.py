@@ -0,0 +1,151 @@
+"""
+⏱️ Optional hot-path profiling: Chrome-trace timeline + summary table
+Off unless --profile is given or NEKO_PROFILE is set (to a trace path, or
+1 for neko-trace.json). When off, span() returns a shared null context and
+@traced functions call straight through, so the cost is one global check.
+
+When on, every span records a complete event (name, category, start,
+duration, pid, thread). Pool workers inherit the setting through the
+environment and ship their events back with each task result (see
+parallel.iter_ordered), so one trace covers the whole run. Open the JSON
+in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+
+ENV_VAR = "NEKO_PROFILE"
+DEFAULT_TRACE = "neko-trace.json"
+
+_NULL = contextlib.nullcontext()
+_events = [] if os.environ.get(ENV_VAR) else None
+
+
+def enabled():
+    return _events is not None
+
+
+def enable(trace_path=None):
+    """Turn profiling on here and in worker processes started from now on"""
+    global _events
+    os.environ[ENV_VAR] = trace_path or os.environ.get(ENV_VAR) or "1"
+    if _events is None:
+        _events = []
+
+
+def trace_path():
+    value = os.environ.get(ENV_VAR, "")
+    return DEFAULT_TRACE if value in ("", "1") else value
+
+
+class _Span:
+    __slots__ = ('name', 'cat', 'args', 'start')
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _events.append((self.name, self.cat, self.start, end - self.start,
+                        os.getpid(), threading.get_ident(), self.args))
+        return False
+
+
+def span(name, cat="render", **args):
+    """Context manager timing one stage; a shared no-op when profiling is off"""
+    if _events is None:
+        return _NULL
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat="render"):
+    """Decorator: record a span for every call while profiling is on"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return func(*args, **kwargs)
+            with _Span(label, cat, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def drain():
+    """Take this process's events (workers send them back with each result)"""
+    global _events
+    if not _events:
+        return None
+    events, _events = _events, []
+    return events
+
+
+def merge(events):
+    if _events is not None and events:
+        _events.extend(events)
+
+
+def write_trace(path=None):
+    """Write the Chrome trace / Perfetto JSON and return its path"""
+    path = path or trace_path()
+    main_pid = os.getpid()
+    # perf_counter_ns is system-wide monotonic on Linux, so worker and main
+    # timestamps share one clock; start the timeline at the first event.
+    origin = min((event[2] for event in _events), default=0)
+    trace = []
+    for pid in sorted({event[4] for event in _events} | {main_pid}):
+        trace.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                      'args': {'name': 'main' if pid == main_pid else f'worker {pid}'}})
+    for name, cat, start, dur, pid, tid, args in _events:
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': (start - origin) / 1000,
+                 'dur': dur / 1000, 'pid': pid, 'tid': tid}
+        if args:
+            event['args'] = args
+        trace.append(event)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+    return path
+
+
+def summary(limit=25):
+    """Per-span table (calls, total, median, max), largest total first"""
+    by_name = {}
+    for name, cat, _, dur, _, _, _ in _events:
+        by_name.setdefault((name, cat), []).append(dur / 1e6)
+    rows = sorted(by_name.items(), key=lambda item: -sum(item[1]))
+    lines = [f"{'span':<32} {'cat':<8} {'calls':>6} {'total ms':>10} {'median':>8} {'max':>8}"]
+    for (name, cat), durations in rows[:limit]:
+        lines.append(f"{name[:32]:<32} {cat:<8} {len(durations):>6} {sum(durations):>10.1f} "
+                     f"{statistics.median(durations):>8.2f} {max(durations):>8.2f}")
+    return "\n".join(lines)
+
+
+def report():
+    """End of main(): print the summary and write the trace (no-op when off)"""
+    if _events is None:
+        return None
+    print("\n⏱️  Profile (spans nest, so totals overlap)")
+    print(summary())
+    path = write_trace()
+    print(f"🧵 Trace: {path} ({len(_events)} spans; open in https://ui.perfetto.dev)")
+    return path
+
+
+def add_arguments(parser):
+    """--profile [TRACE], shared by the generators and the batch runner"""
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_TRACE, metavar="TRACE",
+                        help=f"time every stage; write a Chrome/Perfetto trace "
+                             f"(default {DEFAULT_TRACE}, or set ${ENV_VAR})")
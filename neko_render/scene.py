@@ -0,0 +1,484 @@
+"""
+🧩 Layered scene graph with dirty-region compositing
+A Scene is an opaque background plus z-ordered nodes. Each node paints
+once into a cached straight-alpha RGBA tile with a bounding box. Changing a
+node marks its old and new boxes dirty, and render() recomposites only
+those regions of the persistent canvas.
+
+Nodes are placed in design units and rasterized for the scene's Layout
+(see neko_render.layout); Scene.at() lays the same nodes out again at
+another output size, so a multi-resolution export builds a scene once.
+
+Tiles are recovered by painting the node onto a black and a white canvas:
+coverage is 255 - (white - black) and color is black / coverage. That
+reproduces exactly what painting straight onto the frame gave (including
+Pillow's habit of blending RGBA inks as opaque colors), within rounding.
+
+A frame rendered once (a still) skips the tiles: Scene.draw() paints
+every node straight onto an RGB frame, which is what the tiles reproduce
+and costs one paint per node instead of two full-frame canvases.
+"""
+
+import copy
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from neko_render import fonts, profiling
+from neko_render.layout import Layout
+
+# Keyed tiles kept per node (pulse steps, blink states, counter digits...)
+MAX_TILES_PER_NODE = 32
+# Canvases kept per scene, one per overlay (e.g. four scan-line phases)
+MAX_VIEWS = 4
+# Composited states kept per scene for states that come back
+MAX_SNAPSHOTS = 12
+MAX_SEEN_STATES = 1024
+# Rows converted per step when recovering a tile (bounds the temporaries)
+TILE_STRIP_ROWS = 128
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersect(a, b):
+    box = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+
+def tile_from_canvases(black, white, origin=(0, 0)):
+    """Straight-alpha RGBA tile from the same paint on black and on white RGB canvases"""
+    bbox = _union(black.getbbox(), Image.eval(white, lambda v: 255 - v).getbbox())
+    if bbox is None:
+        return None
+    # A strip of rows at a time in uint8/uint16, so a full-frame node's
+    # temporaries stay a few MB instead of several full-frame int arrays
+    x0, y0, x1, y1 = bbox
+    tile = np.empty((y1 - y0, x1 - x0, 4), dtype=np.uint8)
+    for top in range(y0, y1, TILE_STRIP_ROWS):
+        strip = (x0, top, x1, min(top + TILE_STRIP_ROWS, y1))
+        b = np.asarray(black.crop(strip))
+        w = np.asarray(white.crop(strip))
+        alpha = 255 - (w - np.minimum(b, w)).max(axis=2)
+        coverage = np.maximum(alpha, 1).astype(np.uint16)[..., None]
+        color = b.astype(np.uint16) * 255
+        color += coverage // 2
+        color //= coverage
+        rows = tile[top - y0:strip[3] - y0]
+        rows[..., :3] = np.minimum(color, 255)
+        rows[..., 3] = alpha
+    return Image.fromarray(tile, 'RGBA'), (origin[0] + bbox[0], origin[1] + bbox[1])
+
+
+class Node:
+    """Something painted with ImageDraw in frame coordinates
+
+    paint(draw) draws in absolute design coordinates (the draw scales them
+    to the layout) and is called twice (black and white canvas), so it must
+    not consume random numbers; draw any randomness when the node is built.
+    `extent` (x1, y1), if known, bounds the canvas used to rasterize it.
+    `key` memoizes tiles, so a node cycling through a few states (e.g.
+    pulse steps) rasterizes each once.
+    """
+
+    def __init__(self, name, paint, extent=None, key=None, visible=True):
+        self.name = name
+        self.paint = paint
+        self.extent = extent
+        self.key = key
+        self.visible = visible
+        self._tiles = {}
+
+    def rasterize(self, layout):
+        width, height = layout.size
+        if self.extent:
+            width = min(width, layout.px(self.extent[0]))
+            height = min(height, layout.px(self.extent[1]))
+        with profiling.span("rasterize", "scene", node=self.name):
+            black = Image.new('RGB', (width, height), 'black')
+            white = Image.new('RGB', (width, height), 'white')
+            self.paint(layout.draw(ImageDraw.Draw(black)))
+            self.paint(layout.draw(ImageDraw.Draw(white)))
+            return tile_from_canvases(black, white)
+
+    def draw_into(self, img, layout):
+        """Paint straight onto an RGB frame (no tile), for a frame drawn once"""
+        with profiling.span("draw", "scene", node=self.name):
+            self.paint(layout.draw(ImageDraw.Draw(img)))
+
+    def tile(self, layout):
+        """(RGBA tile, (x, y)) in output pixels, or None when the node paints nothing"""
+        if self.key not in self._tiles:
+            if len(self._tiles) >= MAX_TILES_PER_NODE:
+                # e.g. a ticking counter: drop the oldest state
+                del self._tiles[next(iter(self._tiles))]
+            self._tiles[self.key] = self.rasterize(layout)
+        return self._tiles[self.key]
+
+    def copy(self):
+        """Same node and state with no tiles, for another layout"""
+        clone = copy.copy(self)
+        clone._tiles = {}
+        return clone
+
+    def bbox(self, layout):
+        tile = self.tile(layout) if self.visible else None
+        if tile is None:
+            return None
+        img, (x, y) = tile
+        return (x, y, x + img.width, y + img.height)
+
+
+class TextNode(Node):
+    """Outlined text; rasterized on a canvas just big enough for the glyphs"""
+
+    def __init__(self, name, pos, text, fill='white', outline='black', font_size=60, visible=True):
+        super().__init__(name, None, key=(pos, text, fill, outline, font_size), visible=visible)
+        self.pos = pos
+        self.text = text
+        self.fill = fill
+        self.outline = outline
+        self.font_size = font_size
+
+    def rasterize(self, layout):
+        size, width = layout.font_size(self.font_size), layout.stroke(3)
+        stroke, (ox, oy) = fonts.outline_mask(self.text, size, width)
+        x, y = layout.point(self.pos)
+        origin = (x + ox, y + oy)
+        with profiling.span("rasterize", "scene", node=self.name):
+            black = Image.new('RGB', stroke.size, 'black')
+            white = Image.new('RGB', stroke.size, 'white')
+            for canvas in (black, white):
+                fonts.draw_text_with_outline(ImageDraw.Draw(canvas), (-ox, -oy), self.text,
+                                             self.fill, self.outline, size, width)
+                fonts.paste_emoji(canvas, (-ox, -oy), self.text, size)
+            return tile_from_canvases(black, white, origin)
+
+    def draw_into(self, img, layout):
+        size, pos = layout.font_size(self.font_size), layout.point(self.pos)
+        with profiling.span("draw", "scene", node=self.name):
+            fonts.draw_text_with_outline(ImageDraw.Draw(img), pos, self.text, self.fill, self.outline,
+                                         size, layout.stroke(3))
+            fonts.paste_emoji(img, pos, self.text, size)
+
+    def set_text(self, text):
+        self.text = text
+        self.key = (self.pos, text, self.fill, self.outline, self.font_size)
+
+
+class ImageNode(Node):
+    """A prebuilt RGBA image (e.g. a static-noise layer) placed at pos
+
+    image is an Image at the scene's output size, or image(layout) -> Image,
+    built on first use, which lets Scene.at() lay the node out again.
+    """
+
+    def __init__(self, name, image, pos=(0, 0), visible=True):
+        super().__init__(name, None, visible=visible)
+        self.pos = pos
+        self.set_image(image)
+
+    def tile(self, layout):
+        if self.image is None:
+            self.image = self.source(layout)
+        return self.image, layout.point(self.pos)
+
+    def draw_into(self, img, layout):
+        image, pos = self.tile(layout)
+        img.paste(image, pos, image)
+
+    def set_image(self, image):
+        self.source = image
+        self.image = None if callable(image) else image
+        self.key = id(image)
+
+    def copy(self):
+        clone = super().copy()
+        if callable(clone.source):
+            clone.image = None
+        return clone
+
+
+class AnimatedImageNode(ImageNode):
+    """An ImageNode whose image is frames(step, layout), e.g. falling matrix rain
+
+    Starts on a given still image; update(name, step=n) swaps in frame n
+    (only when the step changes). Tiles are keyed by step, not by id, so a
+    stream of fresh images never collides with a freed one's id.
+    """
+
+    def __init__(self, name, image, frames, pos=(0, 0), visible=True):
+        super().__init__(name, image, pos, visible)
+        self.frames = frames
+        self.step = None
+
+    def tile(self, layout):
+        if self.image is None and self.step is not None:
+            self.image = self.frames(self.step, layout)
+        return super().tile(layout)
+
+    def set_step(self, step):
+        if step != self.step:
+            self.step = step
+            self.image = None
+            self.key = ('step', step)
+
+    def copy(self):
+        clone = super().copy()
+        if clone.step is not None:
+            clone.image = None
+        return clone
+
+
+class Scene:
+    """Background + z-ordered nodes composited into a persistent canvas
+
+    Changing a node marks its old and new boxes dirty and render() only
+    recomposites those. An optional full-frame overlay (e.g. scan lines)
+    goes above every node; each overlay keeps its own canvas and dirty
+    list, so cycling through a few (scrolling scan lines) still only redoes
+    what changed. A state seen twice (blink on/off, pulse steps, static
+    variants) is snapshotted, so coming back to it composites nothing.
+
+    size is a Layout or a plain (width, height) with no scaling; background
+    an Image of that size or background(layout) -> Image, called on first
+    use (a scene only laid out at() other sizes never builds its own).
+    """
+
+    def __init__(self, size, background):
+        self.layout = size if isinstance(size, Layout) else Layout(size)
+        self.size = self.layout.size
+        self._source = background
+        self._background = None if callable(background) else background
+        self.nodes = []
+        self._by_name = {}
+        self._pending = set()
+        self._content = None  # background + nodes, before the overlay
+        self._shared = False  # _content is a snapshot: copy before pasting into it
+        self._dirty = [(0, 0) + self.size]
+        self._views = OrderedDict()  # overlay key -> (canvas, dirty rects, overlay)
+        self._snapshots = OrderedDict()  # state -> (referenced images, content)
+        self._seen = set()
+
+    def _resolve(self, background):
+        return background(self.layout) if callable(background) else background
+
+    @property
+    def background(self):
+        if self._background is None:
+            self._background = self._resolve(self._source)
+        return self._background
+
+    def at(self, layout):
+        """The same scene laid out at another size: shared nodes and state, fresh tiles and canvases"""
+        if layout is None or layout == self.layout:
+            return self
+        if not callable(self._source):
+            raise ValueError("the background is a fixed-size image; build the scene with "
+                             "background(layout) to lay it out again")
+        other = Scene(layout, self._source)
+        for node in self.nodes:
+            other.add(node.copy())
+        return other
+
+    def add(self, node):
+        self.nodes.append(node)
+        self._by_name[node.name] = node
+        self._pending.add(node.name)
+        return node
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def _mark(self, box):
+        self._dirty.append(box)
+        for _, dirty, _ in self._views.values():
+            dirty.append(box)
+
+    def update(self, name, **changes):
+        """Change node attributes (text, image, step, key, paint, visible...) and mark it dirty
+
+        Tiles are memoized by key, so a new paint needs a new key too.
+        Updates that leave key and visibility unchanged are no-ops.
+        """
+        node = self._by_name[name]
+        before = (node.key, node.visible)
+        old_box = None if name in self._pending else node.bbox(self.layout)
+
+        for attr, value in changes.items():
+            if attr == 'text':
+                node.set_text(value)
+            elif attr == 'image':
+                node.set_image(value)
+            elif attr == 'step':
+                node.set_step(value)
+            else:
+                setattr(node, attr, value)
+
+        if (node.key, node.visible) == before:
+            return
+        if old_box:
+            self._mark(old_box)
+        self._pending.add(name)
+
+    def set_background(self, background):
+        """Swap the background (an Image or background(layout)); the whole frame is dirty"""
+        background = self._resolve(background)
+        if background is self._background:
+            return
+        self._background = background
+        self._mark((0, 0) + self.size)
+
+    def _state(self):
+        return (id(self.background),) + tuple((node.key, node.visible) for node in self.nodes)
+
+    def _compose(self, rect):
+        """Background + every visible node inside rect, as an RGBA image"""
+        region = self.background.crop(rect)
+        if region.mode != 'RGBA':
+            region = region.convert('RGBA')
+        for node in self.nodes:
+            if not node.visible:
+                continue
+            tile = node.tile(self.layout)
+            if tile is None:
+                continue
+            img, (tx, ty) = tile
+            hit = _intersect(rect, (tx, ty, tx + img.width, ty + img.height))
+            if hit:
+                region.alpha_composite(img, dest=(hit[0] - rect[0], hit[1] - rect[1]),
+                                       source=(hit[0] - tx, hit[1] - ty, hit[2] - tx, hit[3] - ty))
+        return region
+
+    def _update_content(self):
+        state = self._state()
+        snapshot = self._snapshots.get(state)
+        if snapshot is not None:
+            self._snapshots.move_to_end(state)
+            self._content, self._shared = snapshot[1], True
+            return
+
+        frame = (0, 0) + self.size
+        for rect in _merge(self._dirty):
+            rect = _intersect(rect, frame)
+            if rect == frame:
+                # Whole frame dirty: the region becomes the canvas, no crop/paste round trip
+                self._content, self._shared = self._compose(rect), False
+            elif rect:
+                if self._shared:
+                    self._content, self._shared = self._content.copy(), False
+                self._content.paste(self._compose(rect), rect[:2])
+
+        if state in self._seen:
+            # Keep the images the state's ids refer to alive with the snapshot
+            refs = [self.background] + [getattr(node, 'image', None) for node in self.nodes]
+            self._snapshots[state] = (refs, self._content)
+            self._shared = True
+            if len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        elif len(self._seen) < MAX_SEEN_STATES:
+            self._seen.add(state)
+
+    def render(self, overlay=None, overlay_key=None):
+        """Recomposite dirty regions; returns a shared canvas (copy before drawing on it)
+
+        overlay_key names the overlay's canvas (defaults to id(overlay)); a
+        canvas whose overlay object changed is recomposited in full.
+        """
+        for name in self._pending:
+            box = self._by_name[name].bbox(self.layout)
+            if box:
+                self._mark(box)
+        self._pending.clear()
+
+        if self._dirty:
+            with profiling.span("composite", "scene"):
+                self._update_content()
+            self._dirty = []
+        if overlay is None:
+            return self._content
+
+        frame = (0, 0) + self.size
+        key = id(overlay) if overlay_key is None else overlay_key
+        view = self._views.get(key)
+        if view is None or view[2] is not overlay:
+            view = (None, [frame], overlay)
+        canvas, dirty, _ = view
+        with profiling.span("overlay", "effect"):
+            for rect in _merge(dirty):
+                rect = _intersect(rect, frame)
+                if rect == frame:
+                    canvas = Image.alpha_composite(self._content, overlay)
+                elif rect:
+                    region = self._content.crop(rect)
+                    region.alpha_composite(overlay, source=rect)
+                    canvas.paste(region, rect[:2])
+
+        self._views[key] = (canvas, [], overlay)
+        self._views.move_to_end(key)
+        if len(self._views) > MAX_VIEWS:
+            self._views.popitem(last=False)
+        return canvas
+
+    def render_into(self, buffer, overlay=None):
+        """Composite the whole frame into a preallocated RGB buffer, in place
+
+        The memory-lean path (see neko_render.memory): no persistent canvas,
+        overlay views or snapshots, just the background, the cached tiles and
+        the overlay pasted straight into buffer. Same pixels as render(),
+        minus the alpha channel, at the cost of recompositing every frame.
+        """
+        with profiling.span("composite", "scene", lean=True):
+            buffer.paste(self.background)
+            for node in self.nodes:
+                tile = node.tile(self.layout) if node.visible else None
+                if tile is not None:
+                    img, pos = tile
+                    buffer.paste(img, pos, img)
+        if overlay is not None:
+            with profiling.span("overlay", "effect"):
+                buffer.paste(overlay, (0, 0), overlay)
+        return buffer
+
+    def draw(self, buffer=None, overlay=None):
+        """Paint the whole frame once into an RGB image (buffer, or a fresh one) and return it
+
+        For frames rendered once (stills): shape and text nodes paint
+        straight onto the frame and no tile, canvas or snapshot is kept.
+        Same pixels as render_into(), within rounding.
+        """
+        with profiling.span("composite", "scene", once=True):
+            if buffer is None:
+                buffer = self.background.convert('RGB')
+            else:
+                buffer.paste(self.background)
+            for node in self.nodes:
+                if node.visible:
+                    node.draw_into(buffer, self.layout)
+        if overlay is not None:
+            with profiling.span("overlay", "effect"):
+                buffer.paste(overlay, (0, 0), overlay)
+        return buffer
+
+
+def _merge(rects):
+    """Merge overlapping dirty rects so no pixel is composited twice"""
+    merged = []
+    for rect in rects:
+        grown = True
+        while grown:
+            grown = False
+            for other in merged:
+                if _intersect(rect, other):
+                    merged.remove(other)
+                    rect = _union(rect, other)
+                    grown = True
+                    break
+        merged.append(rect)
+    return merged
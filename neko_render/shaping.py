@@ -0,0 +1,191 @@
+"""
+🔡 Text shaping: color-emoji fallback, Raqm layout and cached glyph runs
+Text fonts (LiberationSans, DejaVuSans) have no emoji, so a string is split
+into text and emoji runs and the emoji runs are drawn with a color emoji
+font when one is installed (scaled from its bitmap strike to the text
+size). Fonts use Raqm (HarfBuzz shaping, bidi, ligatures) when Pillow was
+built with it, Pillow's basic layout otherwise.
+
+Each shaped and rasterized string is cached per (text, font, anchor): the
+font object carries its file and size, and the fill color is applied when
+the run is blitted, so one raster serves every color. Repeated strings
+(the deck's personality row, "Nyaa~!") are one bitmap draw after the
+first.
+
+Without an emoji font, text renders exactly as ImageDraw.text draws it.
+"""
+
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, features
+
+# Color emoji fonts, first match wins; $NEKO_EMOJI_FONT overrides
+EMOJI_FONTS = (
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    "C:/Windows/Fonts/seguiemj.ttf",
+)
+EMOJI_ENV = "NEKO_EMOJI_FONT"
+# Bitmap emoji fonts only load at their strike sizes (Noto: 109, Apple: 160...)
+EMOJI_STRIKES = (109, 160, 136, 96, 64)
+
+# Code points that take emoji presentation by default outside the 1F000 planes
+EMOJI_SYMBOLS = frozenset([
+    0x231A, 0x231B, 0x23E9, 0x23EA, 0x23EB, 0x23EC, 0x23F0, 0x23F3, 0x25FD, 0x25FE, 0x2614, 0x2615,
+    *range(0x2648, 0x2654), 0x267F, 0x2693, 0x26A1, 0x26AA, 0x26AB, 0x26BD, 0x26BE, 0x26C4, 0x26C5,
+    0x26CE, 0x26D4, 0x26EA, 0x26F2, 0x26F3, 0x26F5, 0x26FA, 0x26FD, 0x2705, 0x270A, 0x270B, 0x2728,
+    0x274C, 0x274E, 0x2753, 0x2754, 0x2755, 0x2757, 0x2795, 0x2796, 0x2797, 0x27B0, 0x27BF,
+    0x2B1B, 0x2B1C, 0x2B50, 0x2B55,
+])
+ZWJ = '\u200d'
+VS16 = '\ufe0f'
+KEYCAP = '\u20e3'
+
+# mask: L coverage of the text glyphs (drawn in the fill color); emoji: RGBA
+# color glyphs or None; offset: top-left relative to the anchor point
+Run = namedtuple('Run', ['mask', 'emoji', 'offset'])
+
+
+@lru_cache(maxsize=None)
+def layout_engine():
+    """Raqm when Pillow has it, else the basic layout"""
+    return ImageFont.Layout.RAQM if features.check('raqm') else ImageFont.Layout.BASIC
+
+
+@lru_cache(maxsize=None)
+def emoji_font():
+    """The color emoji font at its bitmap strike size, or None when none is installed"""
+    paths = [os.environ[EMOJI_ENV]] if os.environ.get(EMOJI_ENV) else EMOJI_FONTS
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for size in EMOJI_STRIKES:
+            try:
+                return ImageFont.truetype(path, size, layout_engine=layout_engine())
+            except OSError:
+                continue
+    return None
+
+
+def signature():
+    """What shaping depends on besides the fonts, for render-cache keys"""
+    font = emoji_font()
+    return ('raqm' if layout_engine() == ImageFont.Layout.RAQM else 'basic',
+            font.path if font else None)
+
+
+def is_emoji(char):
+    code = ord(char)
+    return 0x1F000 <= code <= 0x1FAFF or code in EMOJI_SYMBOLS
+
+
+def _joins(char):
+    """Characters that belong to the emoji before them (ZWJ sequences, VS16, keycaps, tags)"""
+    return char in (ZWJ, VS16, KEYCAP) or 0xE0020 <= ord(char) <= 0xE007F
+
+
+def split_runs(text):
+    """[(is_emoji, chunk)]: maximal runs of plain text and of emoji sequences"""
+    runs = []
+    previous = ''
+    for i, char in enumerate(text):
+        following = text[i + 1:i + 2]
+        joined = bool(runs) and runs[-1][0] and (_joins(char) or previous == ZWJ)
+        emoji = is_emoji(char) or following == VS16 or joined
+        if runs and runs[-1][0] == emoji:
+            runs[-1] = (emoji, runs[-1][1] + char)
+        else:
+            runs.append((emoji, char))
+        previous = char
+    return runs
+
+
+def _glyphs(text, font, anchor=None):
+    """(L mask, offset) of text, exactly as ImageDraw.text rasterizes it"""
+    left, top, right, bottom = font.getbbox(text, anchor=anchor)
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255, anchor=anchor)
+    return mask, (left, top)
+
+
+def _emoji(chunk, size):
+    """(RGBA image, offset from the baseline origin, advance) of an emoji sequence at size px"""
+    font = emoji_font()
+    scale = size / font.size
+    left, top, right, bottom = font.getbbox(chunk, anchor='ls')
+    img = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((-left, -top), chunk, font=font, anchor='ls', embedded_color=True)
+    width, height = max(1, round(img.width * scale)), max(1, round(img.height * scale))
+    return (img.resize((width, height), Image.LANCZOS), (round(left * scale), round(top * scale)),
+            font.getlength(chunk) * scale)
+
+
+def _mixed_run(runs, font, anchor):
+    """Text and emoji pieces laid out along one baseline, then moved to the anchor"""
+    pieces = []
+    x = 0.0
+    for emoji, chunk in runs:
+        if emoji:
+            img, (left, top), advance = _emoji(chunk, font.size)
+        else:
+            img, (left, top) = _glyphs(chunk, font, 'ls')
+            advance = font.getlength(chunk)
+        pieces.append((emoji, img, (round(x) + left, top)))
+        x += advance
+
+    x0 = min(pos[0] for _, _, pos in pieces)
+    y0 = min(pos[1] for _, _, pos in pieces)
+    x1 = max(pos[0] + img.width for _, img, pos in pieces)
+    y1 = max(pos[1] + img.height for _, img, pos in pieces)
+    coverage = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    layer = Image.new('RGBA', (x1 - x0, y1 - y0), (0, 0, 0, 0))
+    for emoji, img, (px, py) in pieces:
+        if emoji:
+            layer.alpha_composite(img, (px - x0, py - y0))
+        else:
+            region = coverage[py - y0:py - y0 + img.height, px - x0:px - x0 + img.width]
+            np.maximum(region, np.asarray(img), out=region)
+
+    # Anchor point in baseline coordinates, as Pillow defines the anchors
+    horizontal, vertical = anchor or 'la'
+    ascent, descent = font.getmetrics()
+    ax = {'l': 0, 'm': x / 2, 'r': x}[horizontal]
+    ay = {'a': -ascent, 't': y0, 'm': (descent - ascent) / 2, 's': 0, 'b': y1, 'd': descent}[vertical]
+    return Run(Image.fromarray(coverage, 'L'), layer, (round(x0 - ax), round(y0 - ay)))
+
+
+@lru_cache(maxsize=1024)
+def shaped_run(text, font, anchor=None):
+    """Shape and rasterize a single line of text once per (text, font, anchor)"""
+    runs = split_runs(text)
+    if emoji_font() is None or not any(emoji for emoji, _ in runs):
+        mask, offset = _glyphs(text, font, anchor)
+        return Run(mask, None, offset)
+    return _mixed_run(runs, font, anchor)
+
+
+def silhouette(run):
+    """L coverage of the whole run, emoji included (what an outline goes around)"""
+    if run.emoji is None:
+        return run.mask
+    return Image.fromarray(np.maximum(np.asarray(run.mask), np.asarray(run.emoji.getchannel('A'))), 'L')
+
+
+def draw_text(img, xy, text, font, fill, anchor=None):
+    """ImageDraw.text() through the run cache, with color emoji"""
+    draw = ImageDraw.Draw(img)
+    if '\n' in text:
+        draw.text(xy, text, font=font, fill=fill, anchor=anchor)
+        return
+    run = shaped_run(text, font, anchor)
+    if not (run.mask.width and run.mask.height):
+        return
+    x, y = xy[0] + run.offset[0], xy[1] + run.offset[1]
+    draw.bitmap((x, y), run.mask, fill=fill)
+    if run.emoji:
+        img.paste(run.emoji, (x, y), run.emoji)
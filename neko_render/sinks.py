@@ -0,0 +1,218 @@
+"""
+🎬 Frame sinks: where rendered frames go
+FileSink writes one file per unique frame (PNG by default, or any format
+of neko_render.writer) plus an ffconcat file carrying the hold durations
+and a VFR timestamp file; a repeat of the previous frame only lengthens
+its hold. FfmpegSink pipes raw RGB buffers straight into an ffmpeg
+subprocess, so no PNG is encoded, written or decoded again; it sends
+every frame it is given (repeats are folded by the caller).
+
+Both take the per-frame hold durations (seconds) up front, in write order.
+close() finishes the output; abort() stops it on an error path.
+"""
+
+import contextlib
+import os
+import shutil
+import subprocess
+
+from PIL import Image
+
+from neko_render import holds, profiling
+from neko_render.writer import FrameWriter
+
+# ffmpeg raw input pixel formats and the Image mode each takes
+PIX_FMTS = {'rgb24': 'RGB', 'rgba': 'RGBA'}
+
+
+class FileSink:
+    """Save each unique frame through a FrameWriter and describe timing in frames.ffconcat
+
+    write() only queues the encode, so the next frame renders while the
+    writer's threads compress this one; close() waits for them. A frame
+    identical to the one before it is not saved again: it lengthens the
+    previous hold (see neko_render.holds).
+    """
+
+    def __init__(self, out_dir, durations, writer=None):
+        self.out_dir = out_dir
+        self.durations = list(durations)
+        self.writer = writer or FrameWriter()
+        self.timeline = holds.HoldTimeline()
+        # Files encoded by other processes (pool workers) and the time they took
+        self.encoded = 0
+        self.encode_seconds = 0.0
+        os.makedirs(out_dir, exist_ok=True)
+
+    @property
+    def paths(self):
+        return self.timeline.paths
+
+    def frame_path(self, name):
+        return os.path.join(self.out_dir, f"frame_{name}{self.writer.ext}")
+
+    def _duration(self):
+        if self.timeline.frames >= len(self.durations):
+            raise ValueError(f"more frames than durations ({len(self.durations)})")
+        return self.durations[self.timeline.frames]
+
+    def add_file(self, path, encode_seconds=None):
+        """Register a frame file that was already saved (e.g. by a pool worker)
+
+        A file with the same bytes as the previous frame's is deleted and
+        held instead.
+        """
+        seconds = self._duration()
+        if encode_seconds is not None:
+            self.encoded += 1
+            self.encode_seconds += encode_seconds
+        last = self.timeline.last
+        # Only worker files (no digest) are on disk for sure; ours may still be encoding
+        if last is not None and last.digest is None and path != last.path and holds.same_file(path, last.path):
+            os.remove(path)
+            path = last.path
+        self.timeline.add(path, seconds)
+
+    def write(self, name, img):
+        seconds = self._duration()
+        digest = holds.image_digest(img)
+        last = self.timeline.last
+        if last is not None and digest == last.digest:
+            self.timeline.add(last.path, seconds)
+            return
+        self.timeline.add(self.writer.save(img, self.frame_path(name), name), seconds, digest)
+
+    def write_file(self, name, png_path):
+        """Write an already-encoded PNG (e.g. a render-cache hit); copied as is when the writer allows"""
+        path = self.frame_path(name)
+        if not self.writer.copies_png:
+            with Image.open(png_path) as img:
+                self.write(name, img)
+            return
+        with profiling.span("copy", "io", frame=name):
+            shutil.copyfile(png_path, path)
+        self.add_file(path)
+
+    def close(self):
+        """Wait for the writer, write the timing files and return a summary"""
+        self.writer.close()
+        timing = []
+        if self.writer.format.concat:
+            timing.append(self.timeline.write_concat(os.path.join(self.out_dir, "frames.ffconcat")))
+        timing.append(self.timeline.write_timestamps(os.path.join(self.out_dir, "frames.timestamps.txt")))
+        encoded = self.encoded + self.writer.frames
+        encode_seconds = self.encode_seconds + self.writer.encode_seconds
+        return {'sink': 'png', 'format': self.writer.describe(), 'frames': len(self.paths),
+                'timeline_frames': self.timeline.frames, 'seconds': round(self.timeline.seconds, 3),
+                'bytes_written': sum(os.path.getsize(path) for path in self.paths),
+                'encoded': encoded, 'encode_seconds': round(encode_seconds, 3),
+                'encode_fps': round(encoded / encode_seconds, 1) if encode_seconds else 0.0,
+                'outputs': self.paths + timing, 'timing': timing}
+
+    def abort(self):
+        """Stop on an error: wait for queued encodes, write no timing files"""
+        self.writer.close()
+
+
+# The png sink name predates the other frame formats
+PngSink = FileSink
+
+
+class FfmpegSink:
+    """Stream raw RGB frames into ffmpeg's stdin, one write per entry of durations
+
+    Repeats are not folded here: the setpts timing is fixed when ffmpeg
+    starts, so hold folding happens upstream. Callers pass each still
+    once with its full hold (stills, decks); the animated timeline sends
+    every frame at 1/fps.
+
+    pix_fmt is the raw input layout: rgb24, or rgba for frames that come
+    straight from a shared-memory ring (see write_bytes).
+    """
+
+    def __init__(self, output_path, size, durations, fps=30, codec="libx264",
+                 preset="veryfast", ffmpeg=None, pix_fmt="rgb24"):
+        self.output_path = output_path
+        self.size = tuple(size)
+        self.pix_fmt = pix_fmt
+        self.mode = PIX_FMTS[pix_fmt]
+        self.durations = list(durations)
+        self.frames = 0
+        self.bytes_piped = 0
+        self._last = None
+
+        ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg not found on PATH (use the png sink instead)")
+
+        width, height = self.size
+        cmd = [ffmpeg, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}",
+               "-i", "pipe:0"]
+        # setpts places every frame at its cumulative start time. close()
+        # resends the last frame at the total duration so fps holds it.
+        if len(set(self.durations)) == 1:
+            terms = f"N*{self.durations[0]}"
+        else:
+            terms = "+".join(f"gte(N,{i + 1})*{d}" for i, d in enumerate(self.durations))
+        filters = ["settb=1/90000", f"setpts='({terms})/TB'", f"fps={fps}"]
+        cmd += ["-vf", ",".join(filters), "-c:v", codec, "-preset", preset, "-pix_fmt", "yuv420p",
+                output_path]
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, name, img):
+        if img.size != self.size:
+            raise ValueError(f"frame {name} is {img.size}, sink expects {self.size}")
+        if img.mode != self.mode:
+            img = img.convert(self.mode)
+        self.write_bytes(name, img.tobytes())
+
+    def write_bytes(self, name, data):
+        """Pipe one frame already in pix_fmt (bytes or a memoryview, e.g. a ring slot: not copied)
+
+        The last frame is resent on close(), so its buffer must stay valid until then.
+        """
+        with profiling.span("pipe", "io", frame=name):
+            self.proc.stdin.write(data)
+        self._last = data
+        self.frames += 1
+        self.bytes_piped += len(data)
+
+    def write_file(self, name, png_path):
+        with Image.open(png_path) as img:
+            self.write(name, img)
+
+    def close(self):
+        """Finish the encode and return a summary"""
+        if self._last is not None:
+            self.proc.stdin.write(self._last)
+            self.bytes_piped += len(self._last)
+            self._last = None
+        self.proc.stdin.close()
+        stderr = self.proc.stderr.read().decode(errors="replace")
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed ({self.proc.returncode}): {stderr.strip()}")
+        return {'sink': 'ffmpeg', 'frames': self.frames,
+                'bytes_written': os.path.getsize(self.output_path),
+                'bytes_piped': self.bytes_piped, 'outputs': [self.output_path]}
+
+    def abort(self):
+        """Stop on an error: kill ffmpeg if it still runs and close its pipes (safe after close())"""
+        if self.proc.poll() is None:
+            self.proc.kill()
+        for pipe in (self.proc.stdin, self.proc.stderr):
+            with contextlib.suppress(OSError):
+                pipe.close()
+        self.proc.wait()
+        self._last = None
+
+
+def open_sink(kind, out_dir, size, durations, fps=30, video_name="video.mp4", writer=None, pix_fmt="rgb24"):
+    """Create a sink by name ('png' for frame files via writer, or 'ffmpeg' fed pix_fmt frames)"""
+    if kind == "png":
+        return FileSink(out_dir, durations, writer)
+    if kind == "ffmpeg":
+        return FfmpegSink(os.path.join(out_dir, video_name), size, durations, fps, pix_fmt=pix_fmt)
+    raise ValueError(f"unknown sink: {kind}")
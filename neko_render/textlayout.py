@@ -0,0 +1,105 @@
+"""
+📐 Text layout: measure, wrap and shrink-to-fit, memoized
+Lines are measured with font.getbbox and broken greedily at spaces (a
+word wider than the box is split between characters). fit() picks the
+largest font size, down to a minimum, at which a text fits a box, wrapping
+it or, for code, only shrinking it. Everything is in design units (see
+neko_render.layout): a deck is laid out once and drawn at any resolution.
+
+Every result is cached per (text, font path, size, width[, height]), so
+the personality names and taglines that recur across decks are measured
+once per process and a deck's layout is a handful of cache hits.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from neko_render import fonts
+
+# Baseline-to-baseline distance, in font sizes (the deck's 60 px lines at 48 px)
+LINE_SPACING = 1.25
+
+# lines: the text's lines at size; step: distance between their tops;
+# fits: False when even min_size overflows the box (the lines are still broken to width)
+Block = namedtuple('Block', ['lines', 'size', 'step', 'fits'])
+
+
+def line_step(size):
+    return round(size * LINE_SPACING)
+
+
+def block_height(block):
+    """Top of the first line to the bottom of the last, in design units"""
+    return block.step * (len(block.lines) - 1) + block.size if block.lines else 0
+
+
+@lru_cache(maxsize=4096)
+def measure(text, path, size):
+    """(width, height) of one line's ink box at size"""
+    left, top, right, bottom = fonts.get_font(size, path).getbbox(text)
+    return right - left, bottom - top
+
+
+def text_width(text, path, size):
+    return measure(text, path, size)[0]
+
+
+def _split_word(word, path, size, width):
+    """Break a word wider than width between characters"""
+    pieces, piece = [], ""
+    for char in word:
+        if piece and text_width(piece + char, path, size) > width:
+            pieces.append(piece)
+            piece = char
+        else:
+            piece += char
+    return pieces + [piece]
+
+
+@lru_cache(maxsize=2048)
+def wrap(text, path, size, width):
+    """Greedy word wrap of one paragraph: a tuple of lines at most width wide"""
+    lines, line = [], ""
+    for word in text.split(" "):
+        candidate = f"{line} {word}" if line else word
+        if text_width(candidate, path, size) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        line = word
+        if text_width(word, path, size) > width:
+            *full, line = _split_word(word, path, size, width)
+            lines += full
+    return tuple(lines + [line])
+
+
+def _lines(paragraphs, path, size, width, wrap_words):
+    if wrap_words:
+        return tuple(line for paragraph in paragraphs for line in wrap(paragraph, path, size, width))
+    return paragraphs
+
+
+@lru_cache(maxsize=1024)
+def fit(text, path, size, width, height=None, min_size=None, wrap_words=True):
+    """Block of text ('\\n' separates paragraphs) at the largest size <= size fitting width x height
+
+    Sizes step down about 5% at a time to min_size (default half of size).
+    With wrap_words=False (code) lines are only shrunk, never rewrapped,
+    until min_size, where over-long lines are broken after all.
+    """
+    paragraphs = tuple(text.split("\n"))
+    min_size = min_size or max(1, size // 2)
+    current = size
+    while True:
+        lines = _lines(paragraphs, path, current, width, wrap_words)
+        block = Block(lines, current, line_step(current), True)
+        wide = any(text_width(line, path, current) > width for line in lines)
+        if not wide and (height is None or block_height(block) <= height):
+            return block
+        if current <= min_size:
+            break
+        current = max(min_size, current - max(1, current // 20))
+    lines = _lines(paragraphs, path, current, width, True)
+    block = Block(lines, current, line_step(current), True)
+    return block._replace(fits=height is None or block_height(block) <= height)
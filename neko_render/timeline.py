@@ -0,0 +1,132 @@
+"""
+🎞️ Timeline mode: scenes rendered at N fps instead of one still each
+A scene's graph (see neko_render.scene) is built once; every frame updates
+the animated nodes for time t, recomposites only their dirty regions, then
+composites the scrolling scan lines above them and applies the per-frame
+VHS glitch to a copy (or, in lean mode, to the worker's reused frame buffer).
+Scenes render at any neko_render.layout.Layout; the scan-line spacing,
+scroll speed and glitch scale with it.
+"""
+
+import time
+
+from neko_render import effects, layers, memory, parallel, profiling, seeding
+
+# Scan lines scroll down this many pixels per second
+SCAN_SCROLL_SPEED = 60
+
+
+def frame_rng(seed, scene_index, frame_index, kind="python"):
+    """Per-frame FrameRandom, independent of render order"""
+    return seeding.FrameRandom(seeding.derive_seed(seed, scene_index, frame_index), kind)
+
+
+class AnimatedScene:
+    """Scene graph built once + per-frame animate(graph, t, rng) and post-effects
+
+    animate changes nodes through graph.update() / set_background(), so a
+    frame only pays for the regions that changed. prepare(graph), if
+    given, runs once after the build to warm caches (e.g. a pool of static
+    screens or one tile per pulse step) before the first frame. The
+    graph is built once per (seed, rng kind) in design units and laid out
+    per output Layout; another seed or kind rebuilds it.
+    """
+
+    def __init__(self, name, build, animate=None, scan_lines=False, glitch=0, prepare=None):
+        self.name = name
+        self.build = build
+        self.animate = animate
+        self.prepare = prepare
+        self.scan_lines = scan_lines
+        self.glitch = glitch
+        self._built = None
+        self._built_for = None
+        self._graphs = {}
+
+    def graph(self, seed=0, kind="python", layout=None):
+        if self._built is None or self._built_for != (seed, kind):
+            self.release()
+            # Builders pick random details (matrix rain, lightning) from their own stream
+            self._built = self.build(seeding.FrameRandom(seed, kind))
+            self._built_for = (seed, kind)
+        graph = self._graphs.get(layout)
+        if graph is None:
+            graph = self._graphs[layout] = self._built.at(layout)
+            if self.prepare:
+                self.prepare(graph)
+        return graph
+
+    def release(self):
+        """Drop the graphs with their canvases and snapshots"""
+        self._built = None
+        self._built_for = None
+        self._graphs = {}
+
+    def render(self, t, rng, seed=0, layout=None, into=None):
+        """One frame at time t; rng is the frame's FrameRandom, seed the scene's build seed
+
+        into, an Image of the frame's size (e.g. a shared-memory ring slot),
+        receives the frame instead of a fresh copy.
+        """
+        graph = self.graph(seed, rng.kind, layout)
+        if self.animate:
+            self.animate(graph, t, rng)
+        overlay = None
+        if self.scan_lines:
+            # One canvas per scroll phase (spacing 4 -> 4 canvases), each kept up to date
+            phase = int(t * SCAN_SCROLL_SPEED * graph.layout.scale)
+            overlay = layers.scaled_scan_lines(graph.layout, phase=phase)
+        if memory.lean():
+            # Straight into the reused RGB buffer: no per-phase canvases, no copy
+            img = graph.render_into(memory.frame_buffer(graph.size) if into is None else into, overlay)
+        elif into is not None:
+            img = into
+            img.paste(graph.render(overlay))
+        else:
+            img = graph.render(overlay).copy()
+        if self.glitch:
+            effects.vhs_glitch(img, self.glitch, rng, scale=graph.layout.scale)
+        return img
+
+
+def frame_count(duration, fps):
+    return int(round(duration * fps))
+
+
+def render_scene_frames(scene, scene_index, duration, fps, seed=0, rng_kind="python", layout=None):
+    """Yield (frame_index, image, seconds) for every frame of one scene (at layout, default native)"""
+    try:
+        for k in range(frame_count(duration, fps)):
+            start = time.perf_counter()
+            with profiling.span(scene.name, "frame", frame=k):
+                img = scene.render(k / fps, frame_rng(seed, scene_index, k, rng_kind),
+                                   seed=parallel.frame_seed(seed, scene_index), layout=layout)
+            yield k, img, time.perf_counter() - start
+    finally:
+        scene.release()
+
+
+# (scene, seed, rng kind, layout) a worker keeps built between chunks
+_warm = None
+
+
+def render_chunk(scene, scene_index, start, targets, fps, seed=0, rng_kind="python", layout=None):
+    """Render frames start, start + 1, ... of one scene into the target Images; returns seconds per frame
+
+    For frames split across tasks (e.g. into ring slots): the scene stays
+    built for the process's next chunk and is released when a chunk of
+    another scene, seed, rng kind or layout comes.
+    """
+    global _warm
+    warm = (scene, seed, rng_kind, layout)
+    if _warm is not None and _warm != warm:
+        _warm[0].release()
+    _warm = warm
+    times = []
+    for k, target in enumerate(targets, start):
+        begin = time.perf_counter()
+        with profiling.span(scene.name, "frame", frame=k):
+            scene.render(k / fps, frame_rng(seed, scene_index, k, rng_kind),
+                         seed=parallel.frame_seed(seed, scene_index), layout=layout, into=target)
+        times.append(time.perf_counter() - begin)
+    return times
@@ -0,0 +1,277 @@
+"""
+🖼️ Frame writer: configurable lossless formats, encoded on a background pool
+png  - zlib; compress_level 0-9 (Pillow's default is 6) and optional optimize
+ppm  - uncompressed RGB with a 15-byte header, the fastest to write
+raw  - headerless rgb24, for `cat frame_*.rgb | ffmpeg -f rawvideo ...`
+qoi  - Quite OK Image format, encoded here with NumPy (see encode_qoi)
+
+Frames are converted to a private RGB copy on the calling thread (the
+video has no alpha, and the caller may reuse its buffer), then encoded and
+written on a thread pool so encoding overlaps rendering the next frame.
+zlib and file I/O release the GIL, so PNG gains the most. With a size,
+frames are resampled to it on the same threads (Lanczos, which releases
+the GIL too), so one render serves any output dimensions.
+"""
+
+import io
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from neko_render import profiling
+
+# concat: ffmpeg's concat demuxer can read the files (raw needs -f rawvideo)
+FrameFormat = namedtuple('FrameFormat', ['name', 'ext', 'concat'])
+FORMATS = {
+    'png': FrameFormat('png', '.png', True),
+    'ppm': FrameFormat('ppm', '.ppm', True),
+    'raw': FrameFormat('raw', '.rgb', False),
+    'qoi': FrameFormat('qoi', '.qoi', True),
+}
+DEFAULT_COMPRESS_LEVEL = 6
+# How render-cache entries are encoded (RGB PNG at this level, no optimize):
+# a writer with the same settings can copy them byte for byte
+CACHE_COMPRESS_LEVEL = DEFAULT_COMPRESS_LEVEL
+DEFAULT_THREADS = 2
+# Frames queued per thread before save() blocks (each is a full RGB copy)
+QUEUE_PER_THREAD = 2
+
+QOI_OP_RGB = 0xFE
+QOI_OP_DIFF = 0x40
+QOI_OP_LUMA = 0x80
+QOI_OP_RUN = 0xC0
+QOI_MAX_RUN = 62
+QOI_END = b"\x00" * 7 + b"\x01"
+QOI_STRIP_ROWS = 256
+
+
+def _qoi_ops(px, prev):
+    """QOI op bytes for a run of RGB pixels (N, 3) that follows pixel prev"""
+    # Channel deltas to the previous pixel in uint8: the decoder adds them
+    # back modulo 256, so every range check can run on wrapped bytes too.
+    d = np.empty_like(px)
+    np.subtract(px[:1], prev, out=d[:1])
+    np.subtract(px[1:], px[:-1], out=d[1:])
+    dr, dg, db = d[:, 0], d[:, 1], d[:, 2]
+    same = (dr | dg | db) == 0
+    # DIFF: every delta in -2..1, stored + 2
+    r2, g2, b2 = dr + np.uint8(2), dg + np.uint8(2), db + np.uint8(2)
+    small = (r2 | g2 | b2) < 4
+    # LUMA: green delta in -32..31, red/blue minus green in -8..7
+    g32 = dg + np.uint8(32)
+    rg8, bg8 = dr - dg + np.uint8(8), db - dg + np.uint8(8)
+    luma = (g32 < 64) & ((rg8 | bg8) < 16) & ~small
+    rgb = ~small & ~luma
+    small &= ~same
+
+    # Runs of pixels equal to their predecessor, cut into chunks of <= 62
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], same, [False])).view(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    chunks = -(-(ends - starts) // QOI_MAX_RUN)
+    first = np.repeat(np.cumsum(chunks) - chunks, chunks)
+    heads = np.repeat(starts, chunks) + QOI_MAX_RUN * (np.arange(len(first)) - first)
+    run_len = np.minimum(np.repeat(ends, chunks) - heads, QOI_MAX_RUN)
+
+    sizes = rgb * np.uint8(4)
+    sizes[small] = 1
+    sizes[luma] = 2
+    sizes[heads] = 1
+    offsets = np.cumsum(sizes, dtype=np.int64) - sizes
+    out = np.empty(int(offsets[-1] + sizes[-1]), dtype=np.uint8)
+
+    out[offsets[heads]] = QOI_OP_RUN | (run_len - 1)
+    at = offsets[small]
+    out[at] = QOI_OP_DIFF | (r2[small] << 4) | (g2[small] << 2) | b2[small]
+    at = offsets[luma]
+    out[at] = QOI_OP_LUMA | g32[luma]
+    out[at + 1] = (rg8[luma] << 4) | bg8[luma]
+    at = offsets[rgb]
+    out[at] = QOI_OP_RGB
+    for c in range(3):
+        out[at + 1 + c] = px[rgb, c]
+    return out.tobytes()
+
+
+def encode_qoi(img):
+    """QOI bytes for an RGB image, built with array ops instead of a pixel loop
+
+    Every op except INDEX depends only on the previous pixel, so the
+    encoder emits RUN, DIFF, LUMA and RGB ops (never INDEX). Any QOI
+    decoder reads the result; without INDEX it is somewhat larger than a
+    reference encoder's output, and several times faster than Pillow's.
+    Rows go through in strips to bound the temporaries; a run crossing a
+    strip edge just becomes two RUN ops.
+    """
+    width, height = img.size
+    px = np.asarray(img.convert('RGB') if img.mode != 'RGB' else img).reshape(-1, 3)
+    parts = [b"qoif" + struct.pack(">IIBB", width, height, 3, 0)]
+    prev = np.zeros(3, dtype=np.uint8)  # the spec's initial pixel is (0, 0, 0, 255)
+    step = QOI_STRIP_ROWS * width
+    for start in range(0, len(px), step):
+        strip = px[start:start + step]
+        parts.append(_qoi_ops(strip, prev))
+        prev = strip[-1]
+    parts.append(QOI_END)
+    return b"".join(parts)
+
+
+def encode_frame(img, fmt='png', compress_level=DEFAULT_COMPRESS_LEVEL, optimize=False, size=None):
+    """One frame encoded in memory (e.g. to send over a socket), resampled to size if given"""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown frame format: {fmt}")
+    img = img.convert('RGB')
+    if size and img.size != tuple(size):
+        img = img.resize(tuple(size), Image.LANCZOS)
+    if fmt == 'raw':
+        return img.tobytes()
+    if fmt == 'qoi':
+        return encode_qoi(img)
+    buffer = io.BytesIO()
+    if fmt == 'png':
+        img.save(buffer, 'PNG', compress_level=compress_level, optimize=optimize)
+    else:
+        img.save(buffer, 'PPM')
+    return buffer.getvalue()
+
+
+def write_frame(img, path, fmt='png', compress_level=DEFAULT_COMPRESS_LEVEL, optimize=False):
+    """Encode one RGB frame to path in the given format; returns bytes written"""
+    if fmt == 'png':
+        img.save(path, 'PNG', compress_level=compress_level, optimize=optimize)
+    elif fmt == 'ppm':
+        img.save(path, 'PPM')
+    elif fmt == 'raw':
+        with open(path, "wb") as f:
+            f.write(img.tobytes())
+    elif fmt == 'qoi':
+        with open(path, "wb") as f:
+            f.write(encode_qoi(img))
+    else:
+        raise ValueError(f"unknown frame format: {fmt}")
+    return os.path.getsize(path)
+
+
+class FrameWriter:
+    """Save frames in one format, encoding on `threads` background threads
+
+    save() returns as soon as the frame is queued, unless QUEUE_PER_THREAD
+    frames per thread are already waiting: then it waits for the oldest,
+    so a fast renderer cannot pile up frame copies. flush() waits for every
+    queued frame (and re-raises the first encode error). threads=0 encodes
+    on the calling thread. size=(width, height) resamples every frame
+    that is not already that size.
+    """
+
+    def __init__(self, fmt='png', compress_level=DEFAULT_COMPRESS_LEVEL, optimize=False,
+                 threads=DEFAULT_THREADS, size=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown frame format: {fmt}")
+        self.format = FORMATS[fmt]
+        self.compress_level = compress_level
+        self.optimize = optimize
+        self.threads = threads
+        self.size = tuple(size) if size else None
+        self.frames = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="frame-writer") if threads else None
+
+    @property
+    def ext(self):
+        return self.format.ext
+
+    @property
+    def copies_png(self):
+        """True if a render-cache entry can be copied as is: it is exactly what this writer would write"""
+        return (self.format.name == 'png' and self.size is None
+                and self.compress_level == CACHE_COMPRESS_LEVEL and not self.optimize)
+
+    def describe(self):
+        scale = f" at {self.size[0]}x{self.size[1]}" if self.size else ""
+        if self.format.name != 'png':
+            return self.format.name + scale
+        return f"png (level {self.compress_level}{', optimize' if self.optimize else ''}){scale}"
+
+    def _write(self, img, path, name):
+        start = time.perf_counter()
+        if self.size and img.size != self.size:
+            with profiling.span("resize", "io", frame=name):
+                img = img.resize(self.size, Image.LANCZOS)
+        with profiling.span("save", "io", frame=name, format=self.format.name):
+            size = write_frame(img, path, self.format.name, self.compress_level, self.optimize)
+        with self._lock:
+            self.frames += 1
+            self.bytes_written += size
+            self.encode_seconds += time.perf_counter() - start
+        return path
+
+    def save(self, img, path, name=None):
+        """Queue img to be written to path; returns path"""
+        # A private RGB copy: the caller may draw on or reuse img right away
+        img = img.convert('RGB')
+        if self._pool is None:
+            return self._write(img, path, name)
+        while len(self._pending) >= self.threads * QUEUE_PER_THREAD:
+            self._pending.pop(0).result()
+        self._pending.append(self._pool.submit(self._write, img, path, name))
+        return path
+
+    def flush(self):
+        """Wait until every queued frame is on disk"""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+@lru_cache(maxsize=None)
+def shared(**options):
+    """This process's FrameWriter for the given options (pool workers keep theirs across tasks)"""
+    return FrameWriter(**options)
+
+
+def add_arguments(parser):
+    """--format / --png-level / --png-optimize / --writer-threads, shared by both generators"""
+    parser.add_argument("--format", choices=sorted(FORMATS), default="png",
+                        help="frame file format for the png sink (ppm/raw: uncompressed, qoi: fast lossless)")
+    parser.add_argument("--png-level", type=int, default=DEFAULT_COMPRESS_LEVEL, choices=range(10),
+                        metavar="0-9", help=f"PNG zlib level (default {DEFAULT_COMPRESS_LEVEL}; 1 is ~2x faster)")
+    parser.add_argument("--png-optimize", action="store_true",
+                        help="extra PNG size pass (several times slower)")
+    parser.add_argument("--writer-threads", type=int, default=DEFAULT_THREADS,
+                        help="background encode threads per process (0 = encode inline)")
+
+
+def options(args):
+    """FrameWriter keyword arguments from parsed args (picklable, for pool workers)"""
+    return {'fmt': args.format, 'compress_level': args.png_level, 'optimize': args.png_optimize,
+            'threads': args.writer_threads}
+
+
+def report(summary):
+    """Print a file sink's per-format throughput and disk usage"""
+    if 'encode_fps' not in summary:
+        return
+    encoded = summary.get('encoded')
+    if encoded == 0:
+        rate = "none encoded (copied from the render cache)"
+    elif encoded is not None and encoded < summary['frames']:
+        rate = f"{encoded} encoded at {summary['encode_fps']:.1f} frames/s, the rest copied"
+    else:
+        rate = f"{summary['encode_fps']:.1f} frames/s encode"
+    print(f"🖼️  {summary['format']}: {summary['frames']} frames, {rate}, "
+          f"{summary['bytes_written'] / (1024 * 1024):.1f} MB on disk")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+📦 Batch renderer: many decks and TV shorts in one warm worker pool
+
+Reads a JSON manifest of jobs and renders them all through a single
+process pool, so fonts, text masks, glyph atlases and the layer cache are
+loaded once per worker and stay warm from one job to the next:
+
+    {
+      "defaults": {"format": "png", "seed": 0},
+      "jobs": [
+        {"kind": "deck", "spec": "decks/mcp-six-personalities.json",
+         "out": "out/deck-en", "language": "en"},
+        {"kind": "deck", "spec": "decks/mcp-six-personalities.{language}.json",
+         "out": "out/deck-es", "language": "es", "resolution": "720p"},
+        {"kind": "tv", "out": "out/short", "animate": true, "fps": 30, "seed": 7}
+      ]
+    }
+
+Job keys (each falls back to "defaults", then to the generator's default):
+kind      - "deck" (MCP slide deck) or "tv" (NEKO-ARC TV short)
+spec      - deck spec path ("{language}" is replaced by the job's language)
+            or an inline spec {"name", "frames": [...]}
+out       - output directory (frames + frames.ffconcat)
+language  - deck language tag (default "en"); TV short text is English only
+resolution - "720p", "4k", "WxH"... of the generator's aspect: the frames
+            are laid out at that size (see neko_render.layout)
+size      - [width, height] of the written frames, any aspect: the frames
+            are resampled to it when written
+format, png_level, png_optimize - frame file format (see neko_render.writer)
+seed, rng, animate, fps         - TV short options (see generate_tv_short_frames)
+
+Relative paths are resolved against the manifest's directory. Every job is
+split into frame/scene tasks and the biggest tasks are submitted first, so
+a long animated job does not leave the pool idle at the end of the batch.
+
+Usage: python3 render_batch.py MANIFEST [-j N] [--lean] [--no-cache] [--profile]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+import generate_mcp_frames as mcp
+import generate_tv_short_frames as tv
+from neko_render import cache as render_cache
+from neko_render import glyphs, memory, parallel, profiling, seeding, sinks, timeline, writer
+from neko_render.layout import Layout
+
+KINDS = ("deck", "tv")
+WRITER_KEYS = {'format': 'fmt', 'png_level': 'compress_level', 'png_optimize': 'optimize'}
+
+Job = namedtuple('Job', ['name', 'kind', 'out', 'durations', 'writer_options', 'tasks'])
+# cost: frames the task renders, used to submit the biggest tasks first
+Task = namedtuple('Task', ['job', 'position', 'kind', 'args', 'cost'])
+
+
+def resolve(path, base):
+    return path if os.path.isabs(path) else os.path.join(base, path)
+
+
+def job_writer_options(job, threads):
+    """writer.FrameWriter keyword arguments for a manifest job (hashable, for writer.shared)"""
+    options = {WRITER_KEYS[key]: job[key] for key in WRITER_KEYS if key in job}
+    if job.get('size'):
+        options['size'] = tuple(job['size'])
+    options['threads'] = threads
+    return options
+
+
+def job_out(job, base):
+    """Output directory, or None (the render service returns frames instead of saving them)"""
+    return resolve(job['out'], base) if job.get('out') else None
+
+
+def job_layout(index, job, design):
+    try:
+        return Layout.parse(design, str(job.get('resolution', 'native')))
+    except ValueError as e:
+        raise ValueError(f"job {index + 1}: {e}") from None
+
+
+def deck_job(index, job, base, cache_dir, force, options):
+    layout = job_layout(index, job, mcp.DESIGN.design)
+    language = job.get('language', 'en')
+    spec = job.get('spec', mcp.DEFAULT_SPEC)
+    if not isinstance(spec, dict):
+        spec = mcp.load_spec(resolve(spec.format(language=language), base))
+    out = job_out(job, base)
+    frames = spec["frames"]
+    durations = [frame.get("duration", spec.get("frame_duration", mcp.DEFAULT_FRAME_DURATION))
+                 for frame in frames]
+    tasks = [Task(index, i, 'deck', (num, frame, out, cache_dir, force, options, layout), 1)
+             for i, (num, frame) in enumerate(enumerate(frames, start=1))]
+    name = f"{os.path.basename(out or '-')}: {spec.get('name', 'deck')} [{language}] {layout.name}"
+    return Job(name, 'deck', out, durations, options, tasks)
+
+
+def tv_job(index, job, base, cache_dir, force, options):
+    layout = job_layout(index, job, tv.DESIGN.design)
+    language = job.get('language', 'en')
+    if language != 'en':
+        # The scene builders draw their English text directly
+        raise ValueError(f"job {index + 1}: the TV short has no '{language}' text (only 'en')")
+    out = job_out(job, base)
+    seed = job.get('seed', 0)
+    rng_kind = job.get('rng', 'python')
+    if rng_kind not in seeding.KINDS:
+        raise ValueError(f"job {index + 1}: unknown rng kind: {rng_kind}")
+    if job.get('animate'):
+        if out is None:
+            raise ValueError(f"job {index + 1}: an animated TV short needs 'out'")
+        fps = job.get('fps', tv.VIDEO_FPS)
+        per_scene = timeline.frame_count(tv.FRAME_DURATION, fps)
+        durations = [1 / fps] * (per_scene * len(tv.ANIMATED_SCENES))
+        tasks = [Task(index, i, 'tv-animated', (i, seed, fps, out, options, rng_kind, layout), per_scene)
+                 for i in range(len(tv.ANIMATED_SCENES))]
+        name = f"tv short (animated, {fps} fps)"
+    else:
+        durations = [tv.FRAME_DURATION] * len(tv.FRAMES)
+        tasks = [Task(index, i, 'tv', (i, parallel.frame_seed(seed, i), out, cache_dir, force, options,
+                                      rng_kind, layout), 1)
+                 for i in range(len(tv.FRAMES))]
+        name = "tv short (stills)"
+    return Job(f"{os.path.basename(out or '-')}: {name} seed {seed} {layout.name}", 'tv', out, durations, options, tasks)
+
+
+def load_manifest(path, cache_dir=None, force=False, writer_threads=writer.DEFAULT_THREADS):
+    """Jobs of a manifest, each with its tasks; raises ValueError on a bad job"""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for index, entry in enumerate(manifest["jobs"]):
+        job = {**defaults, **entry}
+        if 'out' not in job:
+            raise ValueError(f"job {index + 1}: missing 'out'")
+        jobs.append(make_job(index, job, base, cache_dir, force, writer_threads))
+    return jobs
+
+
+def make_job(index, job, base, cache_dir=None, force=False, writer_threads=writer.DEFAULT_THREADS):
+    """Job (with its tasks) for one manifest entry; raises ValueError on a bad entry"""
+    if job.get('kind') not in KINDS:
+        raise ValueError(f"job {index + 1}: kind must be one of {', '.join(KINDS)}")
+    options = job_writer_options(job, writer_threads)
+    make = deck_job if job['kind'] == 'deck' else tv_job
+    return make(index, job, base, cache_dir, force, options)
+
+
+def warm():
+    """Pool initializer: load what every job shares before the first task arrives"""
+    with profiling.span("warm", "batch"):
+        for role in mcp.FONT_SPECS:
+            mcp.get_font(role)
+        tv.scan_lines()
+        glyphs.atlas(cell=tv.RAIN_CELL)
+
+
+def render_task(kind, args):
+    """Run one task (inside a pool worker); returns (paths, seconds, cache hits, encode seconds)"""
+    if kind == 'tv-animated':
+        paths, times, encode_seconds = tv.render_animated_scene(*args)
+        return paths, sum(times), 0, encode_seconds
+    render = mcp.render_deck_frame if kind == 'deck' else tv.render_frame
+    path, elapsed, hit, encode_seconds = render(*args)
+    return [path], elapsed, int(hit), encode_seconds
+
+
+def schedule(jobs):
+    """Every task of every job, biggest first (ties keep manifest order)"""
+    tasks = [task for job in jobs for task in job.tasks]
+    return sorted(tasks, key=lambda task: -task.cost)
+
+
+def run(jobs, jobs_count=1):
+    """Render every job over one pool; returns (per-job stats, wall seconds, peak RSS per result)"""
+    file_sinks = [sinks.FileSink(job.out, job.durations, writer.FrameWriter(**{**job.writer_options,
+                                                                                'threads': 0}))
+                  for job in jobs]
+    results = [[None] * len(job.tasks) for job in jobs]
+    remaining = [len(job.tasks) for job in jobs]
+    stats = [{'frames': 0, 'render_seconds': 0.0, 'hits': 0, 'failed': 0, 'finished': None}
+             for _ in jobs]
+    peaks = []
+    order = schedule(jobs)
+    start = time.perf_counter()
+    for task, result in zip(order, parallel.iter_ordered(render_task, [(t.kind, t.args) for t in order],
+                                                         jobs_count, initializer=warm)):
+        job, stat = jobs[task.job], stats[task.job]
+        if result.error:
+            stat['failed'] += 1
+            print(f"❌ Failed: {job.name} task {task.position + 1}\n{result.error}")
+        else:
+            results[task.job][task.position] = result.value
+            peaks.append(result.peak_rss_mb)
+        remaining[task.job] -= 1
+        if remaining[task.job]:
+            continue
+
+        # Last task of the job: register its frames in order and write the concat list
+        sink = file_sinks[task.job]
+        for value in results[task.job]:
+            if value is None:
+                continue
+            paths, seconds, hits, encode_seconds = value
+            for path in paths:
+                sink.add_file(path, encode_seconds / len(paths))
+            stat['render_seconds'] += seconds
+            stat['hits'] += hits
+        stat['summary'] = sink.close()
+        # Rendered frames; the sink may store fewer (repeats fold into holds)
+        stat['frames'] = stat['summary']['timeline_frames']
+        stat['finished'] = time.perf_counter() - start
+        print(f"{'🙀' if stat['failed'] else '✅'} {job.name}: {stat['frames']} frames "
+              f"({stat['finished']:.2f}s into the batch)")
+    return stats, time.perf_counter() - start, peaks
+
+
+def report(jobs, stats, wall, jobs_count):
+    """End-of-run table: frames and throughput per job and for the whole batch"""
+    total = sum(stat['frames'] for stat in stats)
+    print(f"\n📊 Batch: {len(jobs)} job(s), {total} frames in {wall:.2f}s over {jobs_count} worker(s)")
+    print(f"   {'job':<44} {'frames':>6} {'cached':>6} {'render f/s':>10} {'encode f/s':>10}")
+    for job, stat in zip(jobs, stats):
+        render_fps = stat['frames'] / stat['render_seconds'] if stat['render_seconds'] else 0.0
+        encode_fps = stat.get('summary', {}).get('encode_fps', 0.0)
+        print(f"   {job.name[:44]:<44} {stat['frames']:>6} {stat['hits']:>6} "
+              f"{render_fps:>10.1f} {encode_fps:>10.1f}")
+    print(f"🚀 Throughput: {total / wall if wall else 0.0:.1f} frames/s "
+          f"({total / wall / jobs_count if wall else 0.0:.1f} per worker)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a manifest of decks and TV shorts in one warm pool")
+    parser.add_argument("manifest", help="batch manifest (JSON)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--writer-threads", type=int, default=writer.DEFAULT_THREADS,
+                        help="background encode threads per worker (0 = encode inline)")
+    render_cache.add_arguments(parser)
+    memory.add_arguments(parser)
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable(args.profile)
+    if args.lean:
+        memory.enable_lean()
+    jobs_count = args.jobs or parallel.default_jobs()
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    try:
+        jobs = load_manifest(args.manifest, cache_dir, args.force, args.writer_threads)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"🙀 Bad manifest {args.manifest}: {e}")
+        return 2
+
+    tasks = sum(len(job.tasks) for job in jobs)
+    print(f"📦 Batch: {len(jobs)} job(s), {tasks} task(s) over {jobs_count} worker(s)")
+    try:
+        stats, wall, peaks = run(jobs, jobs_count)
+        if cache_dir:
+            render_cache.RenderCache(cache_dir, args.cache_size * 1024 * 1024).evict()
+        report(jobs, stats, wall, jobs_count)
+        tv.report_rss(peaks)
+    finally:
+        profiling.report()
+    failed = sum(stat['failed'] for stat in stats)
+    if failed:
+        print(f"🙀 {failed} task(s) failed")
+        return 1
+    print("Nyaa~! Batch done! 🐾")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
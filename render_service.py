@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+🛰️ Render service: decks and TV shorts on demand from one warm worker pool
+
+A long-running local server (HTTP over TCP or a Unix socket) that queues
+render jobs and runs their frames on a process pool. The workers keep
+fonts, text masks, glyph atlases and the layer cache warm between
+requests, so a frame costs its render time, not a process start.
+
+A job is one render_batch manifest entry, plus:
+timeout - seconds the job may run before it is cancelled (default --timeout)
+stream  - false: reply 202 with the job id at once instead of streaming events
+"spec" may be an inline deck ({"name", "frames": [...]}). Without "out" the
+frames are not saved: they come back base64-encoded in the job's format in
+the event stream (stills only; animated TV shorts need "out").
+
+    POST   /jobs      queue a job and stream its NDJSON events until it ends
+                      (429 when the queue is full: retry later)
+    GET    /jobs/ID   job state and its events so far
+    DELETE /jobs/ID   cancel a queued or running job
+    GET    /health    queue depth, running jobs and busy workers
+
+Events: queued, started, frame (per task, in completion order), then one of
+done, failed, cancelled or timeout. A client that hangs up on a streamed
+job cancels it. A frame already running in a worker cannot be interrupted:
+a cancelled or timed-out job drops its result, and the worker slot frees
+when it finishes.
+
+Usage: python3 render_service.py [--port 8765 | --socket PATH] [-j N] [--max-queue N]
+
+    curl -N localhost:8765/jobs -d '{"kind": "tv", "out": "/tmp/short", "resolution": "720p"}'
+"""
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+import render_batch
+from neko_render import cache as render_cache
+from neko_render import memory, parallel, profiling, sinks, writer
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 300
+# Largest request body (inline deck specs)
+MAX_BODY = 4 * 1024 * 1024
+FINISHED = ('done', 'failed', 'cancelled', 'timeout')
+STATUS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+          405: 'Method Not Allowed', 413: 'Payload Too Large', 429: 'Too Many Requests'}
+
+
+def render_task(kind, args, options=None):
+    """Pool task: render_batch.render_task, encoding the frames in memory for jobs without "out"
+
+    options are the job's writer options; returns (paths or encoded frames,
+    seconds, cache hits, encode seconds).
+    """
+    value = render_batch.render_task(kind, args)
+    if options is None:
+        return value
+    frames, seconds, hits, _ = value
+    start = time.perf_counter()
+    data = [writer.encode_frame(img, **options) for img in frames]
+    return data, seconds, hits, time.perf_counter() - start
+
+
+class ServiceJob:
+    """One queued job: its render_batch.Job, state and the events streamed so far"""
+
+    def __init__(self, job_id, job, timeout, inline):
+        self.id = job_id
+        self.job = job
+        self.timeout = timeout
+        # Writer options the frames are encoded with in the worker, or None to save them
+        self.inline = inline
+        self.state = 'queued'
+        self.events = []
+        self.changed = asyncio.Condition()
+        self.task = None
+
+    @property
+    def finished(self):
+        return self.state in FINISHED
+
+    async def emit(self, event, **fields):
+        self.events.append({'event': event, 'id': self.id, **fields})
+        async with self.changed:
+            self.changed.notify_all()
+
+    async def finish(self, state, **fields):
+        self.state = state
+        await self.emit(state, **fields)
+
+    async def stream(self):
+        """Yield every event, waiting for new ones until the job has finished"""
+        sent = 0
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: len(self.events) > sent)
+            while sent < len(self.events):
+                sent += 1
+                yield self.events[sent - 1]
+            if self.finished:
+                return
+
+    def describe(self):
+        return {'id': self.id, 'name': self.job.name, 'state': self.state, 'events': self.events}
+
+
+class RenderService:
+    """Bounded job queue in front of a warm process pool
+
+    At most `workers` frames are in the pool at once (the others wait for a
+    slot here, where they can still be cancelled) and at most `max_active`
+    jobs share them; up to `max_queue` more jobs wait their turn.
+    """
+
+    def __init__(self, workers, max_queue=16, max_active=None, timeout=DEFAULT_TIMEOUT,
+                 cache_dir=None, force=False, writer_threads=writer.DEFAULT_THREADS, keep=32,
+                 cache_bytes=render_cache.DEFAULT_MAX_BYTES):
+        self.workers = workers
+        self.max_active = max_active or workers
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.force = force
+        self.cache_bytes = cache_bytes
+        self.evicting = asyncio.Lock()
+        self.writer_threads = writer_threads
+        self.keep = keep
+        self.pool = self.start_pool()
+        self.queue = asyncio.Queue(max_queue)
+        self.slots = asyncio.Semaphore(workers)
+        self.jobs = OrderedDict()
+        self.ids = itertools.count(1)
+        self.running = 0
+        self.in_flight = 0
+        self.runners = [asyncio.create_task(self.runner()) for _ in range(self.max_active)]
+
+    def start_pool(self):
+        # Workers start on demand, while clients are connected: fork them from a clean
+        # server process, or they would inherit (and hold open) the client sockets
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                   initializer=render_batch.warm)
+
+    def submit(self, entry, base):
+        """Queue a job entry; raises ValueError (bad job) or asyncio.QueueFull"""
+        if not isinstance(entry, dict):
+            raise ValueError("a job is a JSON object")
+        if self.queue.full():
+            raise asyncio.QueueFull
+        job_id = next(self.ids)
+        job = render_batch.make_job(job_id - 1, entry, base, self.cache_dir, self.force, self.writer_threads)
+        inline = None
+        if job.out is None:
+            inline = {key: value for key, value in job.writer_options.items() if key != 'threads'}
+        service_job = ServiceJob(str(job_id), job, float(entry.get('timeout', self.timeout)), inline)
+        self.queue.put_nowait(service_job)
+        self.jobs[service_job.id] = service_job
+        # Forget the oldest finished jobs
+        for old in [old for old in self.jobs.values() if old.finished][:max(0, len(self.jobs) - self.keep)]:
+            del self.jobs[old.id]
+        service_job.events.append({'event': 'queued', 'id': service_job.id, 'name': job.name,
+                                   'tasks': len(job.tasks), 'position': self.queue.qsize()})
+        return service_job
+
+    async def cancel(self, service_job):
+        if service_job.finished:
+            return
+        if service_job.task:
+            service_job.task.cancel()
+        else:
+            # Still queued: the runner skips it
+            await service_job.finish('cancelled')
+
+    async def runner(self):
+        while True:
+            service_job = await self.queue.get()
+            if service_job.finished:
+                continue
+            self.running += 1
+            service_job.task = asyncio.create_task(self.run(service_job))
+            try:
+                await asyncio.wait([service_job.task])
+            finally:
+                self.running -= 1
+
+    async def run(self, service_job):
+        service_job.state = 'running'
+        await service_job.emit('started')
+        start = time.perf_counter()
+        try:
+            fields = await asyncio.wait_for(self.render(service_job), service_job.timeout)
+        except asyncio.TimeoutError:
+            await service_job.finish('timeout', seconds=service_job.timeout)
+        except asyncio.CancelledError:
+            await service_job.finish('cancelled')
+        except Exception as e:
+            await service_job.finish('failed', error=f"{type(e).__name__}: {e}")
+        else:
+            state = 'failed' if fields['failed'] else 'done'
+            await service_job.finish(state, seconds=round(time.perf_counter() - start, 3), **fields)
+        finally:
+            await self.evict_cache()
+
+    async def evict_cache(self):
+        """Trim the render cache to its limit once a job is over, off the event loop"""
+        if not self.cache_dir or self.evicting.locked():
+            return
+        async with self.evicting:
+            cache = render_cache.RenderCache(self.cache_dir, self.cache_bytes)
+            await asyncio.get_running_loop().run_in_executor(None, cache.evict)
+
+    async def render(self, service_job):
+        """Run every task of the job, emitting a frame event as each one completes"""
+        job = service_job.job
+        sink = None
+        if job.out:
+            sink = sinks.FileSink(job.out, job.durations, writer.FrameWriter(**{**job.writer_options,
+                                                                                'threads': 0}))
+        results = [None] * len(job.tasks)
+        failed = 0
+        pending = [asyncio.ensure_future(self.render_task(task, service_job.inline)) for task in job.tasks]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                task, value, error = await next_done
+                if error:
+                    failed += 1
+                    await service_job.emit('frame', task=task.position, error=error)
+                    continue
+                results[task.position] = value
+                frames, seconds, hits, encode_seconds = value
+                fields = {'seconds': round(seconds, 3), 'cached': hits}
+                if sink:
+                    fields['paths'] = frames
+                else:
+                    fields['format'] = service_job.inline.get('fmt', 'png')
+                    fields['frames'] = [base64.b64encode(data).decode('ascii') for data in frames]
+                await service_job.emit('frame', task=task.position, **fields)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        summary = {'frames': sum(len(value[0]) for value in results if value)}
+        if sink:
+            # Register the frames in order and write the concat list
+            for value in results:
+                if value:
+                    paths, _, _, encode_seconds = value
+                    for path in paths:
+                        sink.add_file(path, encode_seconds / len(paths))
+            summary = sink.close()
+        return {'frames': summary['frames'], 'failed': failed}
+
+    async def render_task(self, task, inline):
+        """Run one task in the pool once a worker slot is free; returns (task, value, error)"""
+        await self.slots.acquire()
+        pool = self.pool
+        try:
+            future = asyncio.wrap_future(parallel.submit(pool, render_task, (task.kind, task.args, inline)))
+        except BaseException:
+            self.slots.release()
+            raise
+        self.in_flight += 1
+        # The slot stays taken until the worker is done, even if this job is cancelled
+        future.add_done_callback(self.release)
+        try:
+            value, error, events, _ = await asyncio.shield(future)
+        except BrokenExecutor:
+            # A worker died (e.g. killed by the OOM killer): start a fresh pool for later tasks
+            if self.pool is pool:
+                print("🙀 Worker pool broke; restarting it")
+                self.pool = self.start_pool()
+            return task, None, "worker process died"
+        profiling.merge(events)
+        return task, value, error
+
+    def release(self, _future):
+        self.in_flight -= 1
+        self.slots.release()
+
+    def health(self):
+        return {'queued': self.queue.qsize(), 'max_queue': self.queue.maxsize, 'running': self.running,
+                'workers': self.workers, 'busy_workers': self.in_flight, 'jobs': len(self.jobs)}
+
+    async def close(self):
+        for runner in self.runners:
+            runner.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def read_request(reader):
+    """(method, path, headers, body) of one HTTP/1.1 request"""
+    line = await reader.readline()
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise ValueError("bad request line")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY:
+        raise OverflowError
+    body = await reader.readexactly(length) if length else b''
+    return method, path.split('?')[0], headers, body
+
+
+def head(status, content_type='application/json', length=None, extra=()):
+    lines = [f"HTTP/1.1 {status} {STATUS[status]}", f"Content-Type: {content_type}",
+             "Connection: close", *extra]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+async def respond(writer_stream, status, payload, extra=()):
+    body = json.dumps(payload).encode()
+    writer_stream.write(head(status, length=len(body), extra=extra) + body)
+    await writer_stream.drain()
+
+
+class Server:
+    """HTTP front end of a RenderService (one request per connection)"""
+
+    def __init__(self, service, base):
+        self.service = service
+        # Relative "spec" and "out" paths resolve against the server's directory
+        self.base = base
+
+    async def handle(self, reader, writer_stream):
+        try:
+            try:
+                method, path, _, body = await read_request(reader)
+            except OverflowError:
+                return await respond(writer_stream, 413, {'error': f"body over {MAX_BODY} bytes"})
+            except (ValueError, asyncio.IncompleteReadError):
+                return await respond(writer_stream, 400, {'error': "malformed request"})
+            await self.route(method, path, body, writer_stream)
+        except ConnectionError:
+            pass
+        finally:
+            writer_stream.close()
+
+    async def route(self, method, path, body, writer_stream):
+        service = self.service
+        if path == '/health':
+            return await respond(writer_stream, 200, service.health())
+        if path == '/jobs' and method == 'POST':
+            return await self.post_job(body, writer_stream)
+        if path.startswith('/jobs/'):
+            service_job = service.jobs.get(path[len('/jobs/'):])
+            if service_job is None:
+                return await respond(writer_stream, 404, {'error': "no such job"})
+            if method == 'GET':
+                return await respond(writer_stream, 200, service_job.describe())
+            if method == 'DELETE':
+                await service.cancel(service_job)
+                return await respond(writer_stream, 200, {'id': service_job.id, 'state': service_job.state})
+            return await respond(writer_stream, 405, {'error': f"{method} not allowed"})
+        return await respond(writer_stream, 404, {'error': f"no route for {method} {path}"})
+
+    async def post_job(self, body, writer_stream):
+        try:
+            entry = json.loads(body or b'null')
+            service_job = self.service.submit(entry, self.base)
+        except asyncio.QueueFull:
+            return await respond(writer_stream, 429, {'error': "queue full"}, extra=["Retry-After: 1"])
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            return await respond(writer_stream, 400, {'error': f"bad job: {e}"})
+        if not entry.get('stream', True):
+            return await respond(writer_stream, 202, {'id': service_job.id, 'state': service_job.state})
+
+        writer_stream.write(head(200, 'application/x-ndjson', extra=[f"X-Job-Id: {service_job.id}"]))
+        try:
+            async for event in service_job.stream():
+                writer_stream.write(json.dumps(event).encode() + b"\n")
+                # Backpressure: a slow reader holds the stream, not the render pool
+                await writer_stream.drain()
+        except ConnectionError:
+            print(f"🙀 Client left job {service_job.id}; cancelling it")
+            await self.service.cancel(service_job)
+
+
+async def serve(args):
+    service = RenderService(args.jobs or parallel.default_jobs(), args.max_queue, args.max_active,
+                            args.timeout, None if args.no_cache else args.cache_dir, args.force,
+                            args.writer_threads, cache_bytes=args.cache_size * 1024 * 1024)
+    server = Server(service, os.getcwd())
+    if args.socket:
+        listener = await asyncio.start_unix_server(server.handle, path=args.socket)
+        where = args.socket
+    else:
+        listener = await asyncio.start_server(server.handle, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"🛰️ Render service on {where}: {service.workers} worker(s), "
+          f"queue of {args.max_queue}, {service.max_active} job(s) at once")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve deck and TV-short renders from one warm pool")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--max-queue", type=int, default=16,
+                        help="jobs that may wait for the pool before new ones get a 429")
+    parser.add_argument("--max-active", type=int, default=0,
+                        help="jobs rendering at once (0 = one per worker)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="default seconds a job may run")
+    parser.add_argument("--writer-threads", type=int, default=writer.DEFAULT_THREADS,
+                        help="background encode threads per worker (0 = encode inline)")
+    render_cache.add_arguments(parser)
+    memory.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.lean:
+        memory.enable_lean()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\nNyaa~! Render service stopped 🐾")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())